@@ -1,4 +1,7 @@
-from eu4th.gui import main
+import multiprocessing
+
+from eu4th import cli
 
 if __name__ == "__main__":
-    main.run()
+    multiprocessing.freeze_support()  # Worker processes of the frozen executable must not start the GUI
+    cli.main()
@@ -0,0 +1,155 @@
+import enum
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import typing as t
+
+from .file_utils import parse_translation_table, write_translation_table
+from .locking import atomic_replace
+from .models import LocFile, LocLine, TranslationData
+
+_MANIFEST_FILENAME = "manifest.json"
+_MERGED_FILENAME = "merged.tsv"
+_BASE_FILENAME = "base.tsv"
+_PARSED_DIRNAME = "parsed"
+
+
+class ReloadStage(enum.StrEnum):
+    SCAN = "scan"
+    PARSE = "parse"
+    MERGE = "merge"
+
+
+class ReloadCheckpoint:
+    """Persists the intermediate results of a reload, so an interrupted run can resume
+
+    A checkpoint belongs to one set of reload arguments (the run key).
+    Opening it with a different run key discards the stale results.
+    The checkpoint is cleared once the final table has been written.
+    """
+
+    def __init__(self, directory: pathlib.Path, run_key: str):
+        self.directory = directory
+        self.run_key = run_key
+        self._manifest = self._load_manifest()
+        if self._manifest.get("run_key") != run_key:
+            if self._manifest:
+                logging.info(f"Discarding checkpoint of a different reload in {str(directory)!r}")
+            self.clear()
+            self._manifest = {"run_key": run_key, "completed_stages": {}}
+        elif self._manifest["completed_stages"]:
+            logging.info(f"Resuming reload after stages: {', '.join(self._manifest['completed_stages'])}")
+
+    # Stages
+
+    def is_done(self, stage: ReloadStage) -> bool:
+        return stage in self._manifest["completed_stages"]
+
+    def mark_done(self, stage: ReloadStage, **details):
+        self._manifest["completed_stages"][stage] = details
+        self._save_manifest()
+
+    def stage_details(self, stage: ReloadStage) -> dict:
+        return self._manifest["completed_stages"][stage]
+
+    def invalidate(self, stage: ReloadStage):
+        if self._manifest["completed_stages"].pop(stage, None) is not None:
+            logging.info(f"Invalidated checkpoint stage {stage!r}")
+            self._save_manifest()
+
+    def clear(self):
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+
+    # Parse stage, one checkpoint per file version
+
+    def has_parsed(self, filepath: pathlib.Path, stat: os.stat_result | None) -> bool:
+        return stat is not None and self._parsed_path(filepath, stat).exists()
+
+    def save_parsed(self, filepath: pathlib.Path, stat: os.stat_result, locfile: LocFile | None):
+        self._write_json(
+            self._parsed_path(filepath, stat),
+            {
+                "language": locfile.language if locfile else None,
+                "lines": [[line.identifier, line.text] for line in locfile.lines] if locfile else [],
+                "problem": locfile.problem if locfile else None,
+            },
+        )
+
+    def load_parsed(self, filepath: pathlib.Path, stat: os.stat_result) -> LocFile | None:
+        content = self._read_json(self._parsed_path(filepath, stat))
+        if content["language"] is None:
+            return None
+        return LocFile(
+            sourcefile=filepath,
+            language=content["language"],
+            lines=[LocLine(identifier=identifier, text=text) for identifier, text in content["lines"]],
+            problem=content.get("problem"),
+        )
+
+    def iter_parsed(self, file_stats: t.Iterable[tuple[pathlib.Path, os.stat_result]]) -> t.Iterator[LocFile]:
+        for filepath, stat in file_stats:
+            locfile = self.load_parsed(filepath, stat)
+            if locfile is not None:
+                yield locfile
+
+    # Merge stage
+
+    def save_merged(self, translation_data: TranslationData, base_data: TranslationData):
+        write_translation_table(outpath=self.directory / _MERGED_FILENAME, translation_data=translation_data)
+        # The translations as loaded, to merge with concurrent edits when writing
+        write_translation_table(outpath=self.directory / _BASE_FILENAME, translation_data=base_data)
+
+    def load_merged(self) -> tuple[TranslationData, TranslationData]:
+        return (
+            parse_translation_table(filepath=self.directory / _MERGED_FILENAME),
+            parse_translation_table(filepath=self.directory / _BASE_FILENAME),
+        )
+
+    # Helpers
+
+    def _parsed_path(self, filepath: pathlib.Path, stat: os.stat_result) -> pathlib.Path:
+        # Include the file stats in the name, so a modified file is parsed again
+        name = hashlib.sha1(json.dumps([str(filepath), _stat_key(stat)]).encode("utf-8")).hexdigest()
+        return self.directory / _PARSED_DIRNAME / f"{name}.json"
+
+    def _load_manifest(self) -> dict:
+        try:
+            return self._read_json(self.directory / _MANIFEST_FILENAME)
+        except (IOError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self):
+        self._write_json(self.directory / _MANIFEST_FILENAME, self._manifest)
+
+    @staticmethod
+    def _read_json(path: pathlib.Path):
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    @staticmethod
+    def _write_json(path: pathlib.Path, content):
+        # Write to a temporary file first, so an interruption never leaves a truncated checkpoint
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_replace(path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(content, fh)
+
+
+def make_run_key(*args) -> str:
+    return hashlib.sha1(json.dumps([str(arg) for arg in args]).encode("utf-8")).hexdigest()
+
+
+def file_stat_key(filepath: pathlib.Path) -> list[int] | None:
+    return _stat_key(filepath.stat()) if filepath.exists() else None
+
+
+def files_stat_key(file_stats: dict[pathlib.Path, os.stat_result | None]) -> str:
+    """Changes when a file is added, removed or modified"""
+    return make_run_key(*([str(fp), _stat_key(stat) if stat else None] for fp, stat in sorted(file_stats.items())))
+
+
+def _stat_key(stat: os.stat_result) -> list[int]:
+    return [stat.st_size, stat.st_mtime_ns]
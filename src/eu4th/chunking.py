@@ -0,0 +1,176 @@
+import collections
+import concurrent.futures
+import enum
+import json
+import logging
+import pathlib
+import re
+
+from .file_utils import parse_translation_table, write_translation_table
+from .locking import atomic_replace
+from .models import LocId, TranslationData
+
+_MANIFEST_FILENAME = "manifest.json"
+_BASE_FILENAME = ".base.tsv"
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w-]+")  # No dots, a chunk may not be named like the base table
+_PART_SEPARATOR = "+"  # Never in a cleaned name, so parts can not collide with other groups
+_DUPLICATE_SEPARATOR = "~"
+_MAX_REPORTED_PROBLEMS = 10
+
+
+class ChunkStrategy(enum.StrEnum):
+    SOURCE = "source"  # One chunk per reference file
+    PREFIX = "prefix"  # One chunk per identifier prefix, up to the first underscore
+    ROWS = "rows"  # Fixed number of rows per chunk
+
+
+def split_translation_data(
+    translation_data: TranslationData,
+    strategy: ChunkStrategy,
+    rows_per_chunk: int,
+) -> dict[str, list[LocId]]:
+    """Group the identifiers into named chunks, larger groups are split further to at most `rows_per_chunk` rows"""
+    groups: dict[str, list[LocId]] = collections.defaultdict(list)
+    for locid in sorted(translation_data.entries):
+        if strategy == ChunkStrategy.SOURCE:
+            name = pathlib.Path(translation_data.entries[locid].source).stem or "unknown"
+        elif strategy == ChunkStrategy.PREFIX:
+            name = locid.split("_", 1)[0].lower() or "unknown"
+        else:
+            name = "rows"
+        groups[_UNSAFE_FILENAME_CHARS_RE.sub("_", name)].append(locid)
+    chunks = {}
+    used_names: set[str] = set()
+    for name, locids in groups.items():
+        nr_parts = -(-len(locids) // rows_per_chunk)
+        for part in range(nr_parts):
+            part_name = name if nr_parts == 1 else f"{name}{_PART_SEPARATOR}{part + 1:0{len(str(nr_parts))}d}"
+            # Filenames differing only in case are the same file on Windows
+            unique_name, duplicate_nr = part_name, 1
+            while unique_name.casefold() in used_names:
+                duplicate_nr += 1
+                unique_name = f"{part_name}{_DUPLICATE_SEPARATOR}{duplicate_nr}"
+            used_names.add(unique_name.casefold())
+            chunks[unique_name] = locids[part * rows_per_chunk : (part + 1) * rows_per_chunk]
+    return chunks
+
+
+def has_chunk_tables(chunk_dir: pathlib.Path) -> bool:
+    return (chunk_dir / _MANIFEST_FILENAME).exists()
+
+
+def write_chunk_tables(
+    chunk_dir: pathlib.Path,
+    translation_data: TranslationData,
+    chunks: dict[str, list[LocId]],
+    table_format: str,
+):
+    """Write a table per chunk, with a manifest of the identifiers each one holds
+
+    A copy of the data as it was split is kept, to merge with edits made to the main table in the meantime.
+    """
+    chunked_locids = [locid for locids in chunks.values() for locid in locids]
+    if len(chunked_locids) != len(translation_data.entries) or set(chunked_locids) != translation_data.entries.keys():
+        raise RuntimeError("The chunks do not hold every identifier exactly once")
+    logging.info(f"Writing {len(chunks)} chunk tables to {str(chunk_dir)!r}")
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    manifest_chunks = {}
+    for name, locids in chunks.items():
+        filename = f"{name}.{table_format}"
+        write_translation_table(
+            outpath=chunk_dir / filename,
+            translation_data=TranslationData(
+                reference_language=translation_data.reference_language,
+                translation_language=translation_data.translation_language,
+                entries={locid: translation_data.entries[locid] for locid in locids},
+            ),
+        )
+        manifest_chunks[filename] = locids
+    write_translation_table(outpath=chunk_dir / _BASE_FILENAME, translation_data=translation_data)
+    # The manifest is written last, so it only exists once all chunks do
+    manifest = {
+        "reference_language": translation_data.reference_language,
+        "translation_language": translation_data.translation_language,
+        "chunks": manifest_chunks,
+    }
+    with atomic_replace(chunk_dir / _MANIFEST_FILENAME) as tmp_path, open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+
+
+def read_chunk_tables(
+    chunk_dir: pathlib.Path,
+    max_workers: int | None = None,
+) -> tuple[TranslationData, TranslationData]:
+    """Read all chunk tables in parallel, and the data as it was split
+
+    Raises when identifiers were lost, duplicated or added compared to the manifest.
+    """
+    with open(chunk_dir / _MANIFEST_FILENAME, "r", encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    filenames = list(manifest["chunks"])
+    missing_files = [filename for filename in filenames if not (chunk_dir / filename).exists()]
+    if missing_files:
+        raise RuntimeError(f"Chunk tables are missing: {', '.join(repr(name) for name in missing_files)}")
+    logging.info(f"Reading {len(filenames)} chunk tables from {str(chunk_dir)!r}")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chunk_datas = list(executor.map(parse_translation_table, [chunk_dir / filename for filename in filenames]))
+    translation_data = TranslationData(
+        reference_language=manifest["reference_language"],
+        translation_language=manifest["translation_language"],
+    )
+    expected_in = {locid: filename for filename, locids in manifest["chunks"].items() for locid in locids}
+    problems = []
+    seen_in: dict[LocId, str] = {}
+    for filename, chunk_data in zip(filenames, chunk_datas):
+        if (chunk_data.reference_language, chunk_data.translation_language) != (
+            translation_data.reference_language,
+            translation_data.translation_language,
+        ):
+            problems.append(f"{filename!r} has the wrong languages in its header")
+        for locid, entry in chunk_data.entries.items():
+            if locid in seen_in:
+                problems.append(f"{locid!r} is in both {seen_in[locid]!r} and {filename!r}")
+            elif locid not in expected_in:
+                problems.append(f"{locid!r} in {filename!r} is not a known identifier")
+            seen_in[locid] = filename
+            translation_data.entries[locid] = entry
+    # Rows moved to another chunk are fine, as long as they are not lost
+    for locid in sorted(expected_in.keys() - seen_in.keys()):
+        problems.append(f"{locid!r} is missing from {expected_in[locid]!r}")
+    if problems:
+        shown = problems[:_MAX_REPORTED_PROBLEMS]
+        if len(problems) > len(shown):
+            shown.append(f"... and {len(problems) - len(shown)} more")
+        raise RuntimeError("Can not reassemble the chunk tables:\n" + "\n".join(shown))
+    base_data = parse_translation_table(filepath=chunk_dir / _BASE_FILENAME)
+    return translation_data, base_data
+
+
+def remove_chunk_tables(chunk_dir: pathlib.Path):
+    """Remove the chunk tables listed in the manifest, and the directory if nothing else is left in it
+
+    The manifest goes last. Chunk tables that can not be removed, like ones open in another application on Windows,
+    stay listed in it, so they are still known as split tables.
+    """
+    logging.info(f"Removing chunk tables from {str(chunk_dir)!r}")
+    with open(chunk_dir / _MANIFEST_FILENAME, "r", encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    remaining = {}
+    for filename, locids in manifest["chunks"].items():
+        try:
+            (chunk_dir / filename).unlink(missing_ok=True)
+        except OSError as e:
+            logging.warning(f"Can not remove chunk table {filename!r}: {e}")
+            remaining[filename] = locids
+    if remaining:
+        manifest["chunks"] = remaining
+        with atomic_replace(chunk_dir / _MANIFEST_FILENAME) as tmp_path, open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh)
+        raise RuntimeError(
+            f"Can not remove the split tables {', '.join(repr(name) for name in remaining)}, "
+            f"close them and reassemble again"
+        )
+    (chunk_dir / _BASE_FILENAME).unlink(missing_ok=True)
+    (chunk_dir / _MANIFEST_FILENAME).unlink()
+    if not any(chunk_dir.iterdir()):
+        chunk_dir.rmdir()
@@ -0,0 +1,195 @@
+import argparse
+import logging
+import pathlib
+import sys
+
+from .commands import (
+    benchmark_reference_loading,
+    describe_reference_changes,
+    describe_reference_history,
+    describe_run_trends,
+    estimate_translation_effort,
+    export_localisation_package,
+    rollback_references,
+)
+from .concurrent_io import DEFAULT_MAX_WORKERS
+from .defines import REFERENCE_CACHE_DIR
+from .file_utils import DEFAULT_MAX_LOCFILE_SIZE
+from .project import Project, load_project
+from .server import DEFAULT_PORT, serve
+
+
+def main(argv: list[str] | None = None):
+    """Run a command on a project from the command line, or start the GUI when no command is given"""
+    parser = argparse.ArgumentParser(prog="eu4th", description="Translation helper tool for Europa Universalis 4")
+    parser.add_argument("--debug", action="store_true", help="Log debug messages")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    effort_parser = subparsers.add_parser("effort", help="Estimate the remaining translation effort of a project")
+    effort_parser.add_argument("project_directory", type=pathlib.Path)
+    effort_parser.add_argument("--csv", type=pathlib.Path, help="Also export the estimate per source file to this file")
+
+    export_parser = subparsers.add_parser("export", help="Export the translations as a zip file for a mod")
+    export_parser.add_argument("project_directory", type=pathlib.Path)
+    export_parser.add_argument("outpath", type=pathlib.Path, help="Zip file to write")
+    export_parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=DEFAULT_MAX_LOCFILE_SIZE // 1024,
+        help="Split locfiles to stay below this size in KiB (default: %(default)s)",
+    )
+
+    changes_parser = subparsers.add_parser("changes", help="List the reference changes of a recorded version")
+    changes_parser.add_argument("project_directory", type=pathlib.Path)
+    changes_parser.add_argument("version", help="Version number or label")
+
+    history_parser = subparsers.add_parser("history", help="List the recorded references of an identifier")
+    history_parser.add_argument("project_directory", type=pathlib.Path)
+    history_parser.add_argument("identifier")
+
+    rollback_parser = subparsers.add_parser(
+        "rollback", help="Set the references in the translation table back to a recorded version"
+    )
+    rollback_parser.add_argument("project_directory", type=pathlib.Path)
+    rollback_parser.add_argument("version", help="Version number or label")
+
+    serve_parser = subparsers.add_parser("serve", help="Serve the known projects over HTTP/JSON on this machine")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: %(default)s)")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on (default: %(default)s)")
+    serve_parser.add_argument("--workers", type=int, default=4, help="Operations run at once (default: %(default)s)")
+
+    trends_parser = subparsers.add_parser("trends", help="Summarise the recorded runs of a project over time")
+    trends_parser.add_argument("project_directory", type=pathlib.Path)
+    trends_parser.add_argument("--last", type=int, default=10, help="Runs to list per operation (default: %(default)s)")
+
+    io_parser = subparsers.add_parser(
+        "iobench", help="Time loading the references of a project on a simulated high-latency filesystem"
+    )
+    io_parser.add_argument("project_directory", type=pathlib.Path)
+    io_parser.add_argument(
+        "--latency-ms", type=float, default=20.0, help="Delay of each listing, stat and read (default: %(default)s)"
+    )
+    io_parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, DEFAULT_MAX_WORKERS],
+        help="Numbers of requests in flight to compare (default: %(default)s)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        from .gui import main as gui_main  # Only load tkinter when it is needed
+
+        gui_main.run(debug=args.debug)
+        return
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING, format="%(levelname)s: %(message)s")
+    try:
+        if args.command == "effort":
+            _run_effort(project_directory=args.project_directory, csv_path=args.csv)
+        elif args.command == "export":
+            _run_export(
+                project_directory=args.project_directory,
+                outpath=args.outpath,
+                max_file_size=args.max_file_size * 1024,
+            )
+        elif args.command == "changes":
+            _run_changes(project_directory=args.project_directory, version_or_label=args.version)
+        elif args.command == "history":
+            _run_history(project_directory=args.project_directory, identifier=args.identifier)
+        elif args.command == "rollback":
+            _run_rollback(project_directory=args.project_directory, version_or_label=args.version)
+        elif args.command == "trends":
+            _run_trends(project_directory=args.project_directory, last=args.last)
+        elif args.command == "iobench":
+            _run_iobench(
+                project_directory=args.project_directory,
+                latency=args.latency_ms / 1000,
+                worker_counts=args.workers,
+            )
+        elif args.command == "serve":
+            serve(host=args.host, port=args.port, max_workers=args.workers)
+    except RuntimeError as e:
+        sys.exit(f"Error: {e}")
+
+
+def _run_effort(project_directory: pathlib.Path, csv_path: pathlib.Path | None):
+    project = _load_existing_project(project_directory=project_directory)
+    estimate = estimate_translation_effort(
+        translation_table=project.translations_table,
+        cache_path=project.effort_cache,
+        journal_path=project.reference_journal,
+        csv_path=csv_path,
+    )
+    print(estimate.describe())
+    print(f"{'Source file':<50} {'Missing':>9} {'Outdated':>9} {'Words':>9}")
+    for source, source_effort in sorted(estimate.by_source.items(), key=lambda item: -item[1].words_to_translate):
+        print(
+            f"{source or '<unknown>':<50} {source_effort.missing_rows:>9} {source_effort.outdated_rows:>9} "
+            f"{source_effort.words_to_translate:>9}"
+        )
+
+
+def _run_export(project_directory: pathlib.Path, outpath: pathlib.Path, max_file_size: int):
+    project = _load_existing_project(project_directory=project_directory)
+    print(
+        export_localisation_package(
+            translation_table=project.translations_table,
+            outpath=outpath,
+            file_stem=project.package_file_stem,
+            ref_dirs=project.reference_directories,
+            reference_language=project.reference_language,
+            reference_exclude_patterns=project.exclude_references,
+            max_file_size=max_file_size,
+            layer_cache_dir=REFERENCE_CACHE_DIR,
+            chunk_dir=project.chunk_directory,
+        )
+    )
+
+
+def _run_changes(project_directory: pathlib.Path, version_or_label: str):
+    project = _load_existing_project(project_directory=project_directory)
+    print(describe_reference_changes(journal_path=project.reference_journal, version_or_label=version_or_label))
+
+
+def _run_history(project_directory: pathlib.Path, identifier: str):
+    project = _load_existing_project(project_directory=project_directory)
+    print(describe_reference_history(journal_path=project.reference_journal, identifier=identifier))
+
+
+def _run_rollback(project_directory: pathlib.Path, version_or_label: str):
+    project = _load_existing_project(project_directory=project_directory)
+    print(
+        rollback_references(
+            translation_table=project.translations_table,
+            journal_path=project.reference_journal,
+            version_or_label=version_or_label,
+            summary_path=project.summary_index,
+            run_log_path=project.run_log,
+        )
+    )
+
+
+def _run_trends(project_directory: pathlib.Path, last: int):
+    project = _load_existing_project(project_directory=project_directory)
+    print(describe_run_trends(run_log_path=project.run_log, last=last))
+
+
+def _run_iobench(project_directory: pathlib.Path, latency: float, worker_counts: list[int]):
+    project = _load_existing_project(project_directory=project_directory)
+    timings = benchmark_reference_loading(
+        ref_dirs=project.reference_directories,
+        reference_language=project.reference_language,
+        reference_exclude_patterns=project.exclude_references,
+        latency=latency,
+        worker_counts=worker_counts,
+    )
+    print(f"Loading the references with {latency * 1000:g}ms latency per request:")
+    for max_workers, seconds in timings.items():
+        print(f"{max_workers:>4} in flight: {seconds:8.2f}s")
+
+
+def _load_existing_project(project_directory: pathlib.Path) -> Project:
+    if not project_directory.is_dir():
+        raise RuntimeError(f"Not a project directory: {str(project_directory)!r}")
+    return load_project(project_directory=project_directory)
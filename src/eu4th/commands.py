@@ -1,45 +1,431 @@
+import dataclasses
 import logging
+import os
 import pathlib
 import re
+import time
 
+from .checkpoint import ReloadCheckpoint, ReloadStage, file_stat_key, files_stat_key, make_run_key
+from .chunking import (
+    ChunkStrategy,
+    has_chunk_tables,
+    read_chunk_tables,
+    remove_chunk_tables,
+    split_translation_data,
+    write_chunk_tables,
+)
+from .concurrent_io import DEFAULT_MAX_WORKERS, scan_files, simulate_latency, stat_files
+from .effort import EffortEstimate, estimate_effort, write_effort_csv
 from .file_utils import (
+    DEFAULT_MAX_LOCFILE_SIZE,
+    ReloadStats,
+    copy_translation_data,
     get_localisation_from_translations,
+    iter_locfiles,
+    locfile_precedence_key,
+    merge_concurrent_edits,
     merge_latest_references_into_translations,
+    merge_localisations,
+    overlay_localisation,
     parse_localisation_from_locfiles,
-    parse_translations_from_excel,
+    parse_translation_table,
+    write_conflict_report,
+    write_localisation_package,
     write_localisation_to_locfile,
-    write_translations_to_excel,
+    write_translation_table,
+)
+from .glossary import check_glossary, load_glossary, write_glossary_report
+from .journal import (
+    find_version,
+    get_identifier_history,
+    get_references_at,
+    get_version_changes,
+    list_versions,
+    record_reference_snapshot,
 )
-from .models import TranslationData, TranslationEntry, TranslationStatus
+from .locking import file_lock, staging_path
+from .machine_translation import HttpTranslationBackend, prefill_translations
+from .models import LocalisationData, LocId, TranslationData, TranslationEntry, TranslationStatus
+from .reference_cache import load_cached_layer, reference_layer_fingerprint, save_cached_layer
+from .run_log import StageTimer, append_run_record, describe_trends, load_run_records, make_run_record
+from .search_index import SearchIndex, apply_edits
+from .summary import TranslationSummary, compute_summary, save_summary
+
+_MAX_REPORTED_QUARANTINED = 10
+_MIN_LOCFILE_SIZE = 1024
 
 
 def reload_localisation_to_tsv(
-    ref_dir: pathlib.Path,
+    ref_dirs: list[pathlib.Path],
     reference_language: str,
     translation_language: str,
     reference_exclude_patterns: list[str],
     translation_table: pathlib.Path,
     existing_translations_dir: pathlib.Path | None = None,
+    checkpoint_dir: pathlib.Path | None = None,
+    journal_path: pathlib.Path | None = None,
+    version_label: str | None = None,
+    conflict_report_path: pathlib.Path | None = None,
+    layer_cache_dir: pathlib.Path | None = None,
+    summary_path: pathlib.Path | None = None,
+    glossary_path: pathlib.Path | None = None,
+    glossary_report_path: pathlib.Path | None = None,
+    run_log_path: pathlib.Path | None = None,
 ):
-    # Get reference localisations
+    if not ref_dirs:
+        raise RuntimeError("At least one reference directory is required")
+    timer = StageTimer()
+    checkpoint = None
+    if checkpoint_dir is not None:
+        checkpoint = ReloadCheckpoint(
+            directory=checkpoint_dir,
+            run_key=make_run_key(
+                ref_dirs,
+                reference_language,
+                translation_language,
+                reference_exclude_patterns,
+                translation_table,
+                existing_translations_dir,
+            ),
+        )
+    # The references are always scanned again, files may have been added, removed or modified since
+    with timer.stage("scan"):
+        layer_files = _scan_reference_layers(
+            ref_dirs=ref_dirs,
+            reference_exclude_patterns=reference_exclude_patterns,
+            checkpoint=checkpoint,
+        )
+    nr_files = sum(len(ref_files) for ref_files in layer_files)
+    resumed = False
+    if checkpoint is not None and checkpoint.is_done(ReloadStage.MERGE):
+        merge_details = checkpoint.stage_details(ReloadStage.MERGE)
+        # Stale merge results would overwrite edits to the table, or miss changes to the references
+        if merge_details["table_stat"] != file_stat_key(translation_table):
+            logging.info("Translation table changed since the interrupted reload, merging again")
+            checkpoint.invalidate(ReloadStage.MERGE)
+        elif merge_details.get("references_key") != checkpoint.stage_details(ReloadStage.SCAN)["references_key"]:
+            logging.info("Reference files changed since the interrupted reload, merging again")
+            checkpoint.invalidate(ReloadStage.MERGE)
+    if checkpoint is not None and checkpoint.is_done(ReloadStage.MERGE):
+        translation_data, base_data = checkpoint.load_merged()
+        base_stat = merge_details["table_stat"]
+        nr_references = merge_details["references"]
+        nr_conflicts = merge_details["conflicts"]
+        quarantined = merge_details["quarantined"]
+        stats = ReloadStats(**merge_details["stats"])
+        resumed = True
+    else:
+        with timer.stage("parse"):
+            ref_locdata = _parse_reference_layers(
+                ref_dirs=ref_dirs,
+                layer_files=layer_files,
+                reference_language=reference_language,
+                reference_exclude_patterns=reference_exclude_patterns,
+                checkpoint=checkpoint,
+                layer_cache_dir=layer_cache_dir,
+            )
+        if journal_path is not None:
+            with timer.stage("journal"):
+                record_reference_snapshot(journal_path=journal_path, locdata=ref_locdata, label=version_label)
+        if conflict_report_path is not None:
+            write_conflict_report(outpath=conflict_report_path, locdata=ref_locdata)
+        nr_conflicts = len(ref_locdata.overridden)
+        quarantined = {str(filepath): problem for filepath, problem in sorted(ref_locdata.quarantined.items())}
+        base_stat = file_stat_key(translation_table)
+        with timer.stage("merge"):
+            translation_data, base_data, stats = _merge_reference_files(
+                ref_locdata=ref_locdata,
+                reference_language=reference_language,
+                translation_language=translation_language,
+                translation_table=translation_table,
+                existing_translations_dir=existing_translations_dir,
+            )
+        nr_references = len(ref_locdata.entries)
+        del ref_locdata  # Release the references before writing, only the merged data is needed further
+        if checkpoint is not None:
+            checkpoint.save_merged(translation_data=translation_data, base_data=base_data)
+            checkpoint.mark_done(
+                ReloadStage.MERGE,
+                files=nr_files,
+                references=nr_references,
+                conflicts=nr_conflicts,
+                quarantined=quarantined,
+                stats=dataclasses.asdict(stats),
+                table_stat=base_stat,
+                references_key=checkpoint.stage_details(ReloadStage.SCAN)["references_key"],
+            )
+    # Update translation table
+    with timer.stage("write"):
+        translation_data, merge_info, _ = _write_translation_table_safely(
+            translation_table=translation_table,
+            translation_data=translation_data,
+            base_data=base_data,
+            base_stat=base_stat,
+        )
+    if checkpoint is not None:
+        checkpoint.clear()
+    summary = None
+    if summary_path is not None or run_log_path is not None:
+        summary = _summary_stage(translation_data=translation_data, summary_path=summary_path, timer=timer)
+    info = "Resumed the interrupted reload from its merged results\n" if resumed else ""
+    info += f"Loaded {nr_references} references: "
+    if stats.all > 0:
+        info += _describe_reload_stats(stats=stats)
+    else:
+        info += "no changes"
+    info += merge_info
+    if nr_conflicts > 0:
+        info += f"\n{nr_conflicts} identifiers have multiple definitions"
+        if conflict_report_path is not None:
+            info += f", see {conflict_report_path.name!r}"
+    if quarantined:
+        info += f"\nSkipped {len(quarantined)} unreadable reference files, fix their encoding and load again:"
+        for filepath, problem in list(quarantined.items())[:_MAX_REPORTED_QUARANTINED]:
+            info += f"\n- {filepath}: {problem}"
+        if len(quarantined) > _MAX_REPORTED_QUARANTINED:
+            info += f"\n- ... and {len(quarantined) - _MAX_REPORTED_QUARANTINED} more, see the log"
+    with timer.stage("glossary"):
+        info += _check_glossary_stage(
+            translation_data=translation_data,
+            glossary_path=glossary_path,
+            glossary_report_path=glossary_report_path,
+        )
+    if run_log_path is not None:
+        append_run_record(
+            log_path=run_log_path,
+            record=make_run_record(
+                operation="reload",
+                timer=timer,
+                counts={
+                    "reference_files": nr_files,
+                    "references": nr_references,
+                    "conflicts": nr_conflicts,
+                    "quarantined": len(quarantined),
+                    **dataclasses.asdict(stats),
+                },
+                translation_table=translation_table,
+                table_rows=len(translation_data.entries),
+                status_counts=summary.overall,
+            ),
+        )
+    logging.info(info)
+    return info
+
+
+def _describe_reload_stats(stats: ReloadStats) -> str:
+    info = (
+        f"{stats.new} new, {stats.changed} changed, {stats.deleted} deleted "
+        f"- {stats.outdated_translations} translations became outdated"
+    )
+    if stats.restored_translations > 0:
+        info += f", {stats.restored_translations} outdated translations match their reference again"
+    return info
+
+
+def _summary_stage(
+    translation_data: TranslationData,
+    summary_path: pathlib.Path | None,
+    timer: StageTimer,
+) -> TranslationSummary:
+    with timer.stage("summary"):
+        summary = compute_summary(translation_data=translation_data)
+        if summary_path is not None:
+            save_summary(summary_path=summary_path, summary=summary)
+    return summary
+
+
+def benchmark_reference_loading(
+    ref_dirs: list[pathlib.Path],
+    reference_language: str,
+    reference_exclude_patterns: list[str],
+    latency: float,
+    worker_counts: list[int],
+) -> dict[int, float]:
+    """Time scanning and parsing the references without caches, for each number of concurrent requests
+
+    Every directory listing, stat and read is delayed by `latency` seconds, to show the reload on a network share.
+    """
+    timings = {}
+    with simulate_latency(seconds=latency):
+        for max_workers in worker_counts:
+            start = time.perf_counter()
+            layer_files = _scan_reference_layers(
+                ref_dirs=ref_dirs,
+                reference_exclude_patterns=reference_exclude_patterns,
+                checkpoint=None,
+                max_workers=max_workers,
+            )
+            ref_locdata = _parse_reference_layers(
+                ref_dirs=ref_dirs,
+                layer_files=layer_files,
+                reference_language=reference_language,
+                reference_exclude_patterns=reference_exclude_patterns,
+                checkpoint=None,
+                layer_cache_dir=None,
+                max_workers=max_workers,
+            )
+            timings[max_workers] = time.perf_counter() - start
+            logging.info(
+                f"Loaded {len(ref_locdata.entries)} references from {sum(len(fps) for fps in layer_files)} files "
+                f"with {max_workers} requests in flight in {timings[max_workers]:.2f}s"
+            )
+    return timings
+
+
+def _check_glossary_stage(
+    translation_data: TranslationData,
+    glossary_path: pathlib.Path | None,
+    glossary_report_path: pathlib.Path | None,
+) -> str:
+    if glossary_path is None or not glossary_path.exists():
+        return ""
+    glossary = load_glossary(glossary_path=glossary_path)
+    violations = check_glossary(translation_data=translation_data, glossary=glossary)
+    if glossary_report_path is not None:
+        write_glossary_report(outpath=glossary_report_path, violations=violations)
+    if not violations:
+        return f"\nAll translations follow the glossary of {len(glossary)} terms"
+    info = f"\n{len(violations)} glossary terms are not translated as required"
+    if glossary_report_path is not None:
+        info += f", see {glossary_report_path.name!r}"
+    return info
+
+
+def _scan_reference_layers(
+    ref_dirs: list[pathlib.Path],
+    reference_exclude_patterns: list[str],
+    checkpoint: ReloadCheckpoint | None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[list[pathlib.Path]]:
+    layer_files = [
+        _scan_reference_files(
+            ref_dir=ref_dir,
+            reference_exclude_patterns=reference_exclude_patterns,
+            max_workers=max_workers,
+        )
+        for ref_dir in ref_dirs
+    ]
+    if checkpoint is not None:
+        file_stats = stat_files(
+            filepaths=[fp for ref_files in layer_files for fp in ref_files],
+            max_workers=max_workers,
+        )
+        checkpoint.mark_done(
+            ReloadStage.SCAN,
+            files=sum(len(ref_files) for ref_files in layer_files),
+            references_key=files_stat_key(file_stats),
+        )
+    return layer_files
+
+
+def _scan_reference_files(
+    ref_dir: pathlib.Path,
+    reference_exclude_patterns: list[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[pathlib.Path]:
+    if not ref_dir.is_dir():
+        raise RuntimeError(f"Not a valid reference directory: {str(ref_dir)!r}")
     exclude_patterns_re = [re.compile(raw) for raw in reference_exclude_patterns]
-    ref_files = [
-        fp
-        for fp in ref_dir.rglob("*")
-        if fp.is_file()
-        and fp.name.endswith(".yml")
-        and not any(pattern.match(str(fp)) for pattern in exclude_patterns_re)
+    return sorted(
+        (
+            fp
+            for fp in scan_files(directory=ref_dir, suffix=".yml", max_workers=max_workers)
+            if not any(pattern.match(str(fp)) for pattern in exclude_patterns_re)
+        ),
+        key=locfile_precedence_key,
+    )
+
+
+def _parse_reference_layers(
+    ref_dirs: list[pathlib.Path],
+    layer_files: list[list[pathlib.Path]],
+    reference_language: str,
+    reference_exclude_patterns: list[str],
+    checkpoint: ReloadCheckpoint | None,
+    layer_cache_dir: pathlib.Path | None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> LocalisationData:
+    ref_locdata = LocalisationData(language=reference_language)
+    for ref_dir, ref_files in zip(ref_dirs, layer_files):
+        # Stat all files of the layer at once, for both the layer cache and the parse checkpoints
+        file_stats = stat_files(filepaths=ref_files, max_workers=max_workers)
+        layer_locdata = None
+        if layer_cache_dir is not None:
+            fingerprint = reference_layer_fingerprint(
+                layer_directory=ref_dir,
+                file_stats=file_stats,
+                language=reference_language,
+                exclude_patterns=reference_exclude_patterns,
+            )
+            layer_locdata = load_cached_layer(
+                cache_dir=layer_cache_dir,
+                fingerprint=fingerprint,
+                layer_directory=ref_dir,
+            )
+        if layer_locdata is None:
+            layer_locdata = _parse_reference_files(
+                file_stats=file_stats,
+                reference_language=reference_language,
+                checkpoint=checkpoint,
+                max_workers=max_workers,
+            )
+            if layer_cache_dir is not None:
+                save_cached_layer(
+                    cache_dir=layer_cache_dir,
+                    fingerprint=fingerprint,
+                    layer_directory=ref_dir,
+                    locdata=layer_locdata,
+                )
+        overlay_localisation(base=ref_locdata, layer=layer_locdata)
+        del layer_locdata
+    if checkpoint is not None:
+        checkpoint.mark_done(ReloadStage.PARSE, files=sum(len(ref_files) for ref_files in layer_files))
+    return ref_locdata
+
+
+def _parse_reference_files(
+    file_stats: dict[pathlib.Path, os.stat_result | None],
+    reference_language: str,
+    checkpoint: ReloadCheckpoint | None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> LocalisationData:
+    if checkpoint is None:
+        return parse_localisation_from_locfiles(
+            filepaths=[fp for fp, stat in file_stats.items() if stat is not None],
+            language=reference_language,
+            max_workers=max_workers,
+        )
+    # Persist each parsed file as soon as it is done, and only keep the merged result in memory
+    remaining_files = [
+        fp for fp, stat in file_stats.items() if stat is not None and not checkpoint.has_parsed(fp, stat)
     ]
-    ref_locdata = parse_localisation_from_locfiles(
-        filepaths=ref_files,
+    if remaining_files:
+        logging.info(f"Parsing {len(remaining_files)} of {len(file_stats)} reference files")
+        locfiles = iter_locfiles(filepaths=remaining_files, language=reference_language, max_workers=max_workers)
+        for filepath, locfile in locfiles:
+            checkpoint.save_parsed(filepath=filepath, stat=file_stats[filepath], locfile=locfile)
+    return merge_localisations(
+        locfiles=checkpoint.iter_parsed(
+            file_stats=((fp, stat) for fp, stat in file_stats.items() if checkpoint.has_parsed(fp, stat))
+        ),
         language=reference_language,
     )
+
+
+def _merge_reference_files(
+    ref_locdata: LocalisationData,
+    reference_language: str,
+    translation_language: str,
+    translation_table: pathlib.Path,
+    existing_translations_dir: pathlib.Path | None,
+) -> tuple[TranslationData, TranslationData, ReloadStats]:
     # Get translation data
     if existing_translations_dir is not None:
         if not existing_translations_dir.is_dir():
             raise RuntimeError(f"Not a valid directory for existing translations: {str(existing_translations_dir)!r}")
         logging.debug(f"Loading translations from existing directory: {str(existing_translations_dir)!r}")
-        transl_files = [fp for fp in existing_translations_dir.rglob("*") if fp.is_file() and fp.name.endswith(".yml")]
+        base_data = TranslationData(reference_language=reference_language, translation_language=translation_language)
+        transl_files = scan_files(directory=existing_translations_dir, suffix=".yml")
         existing_translations_locdata = parse_localisation_from_locfiles(
             filepaths=transl_files,
             language=translation_language,
@@ -58,7 +444,7 @@ def reload_localisation_to_tsv(
         )
     elif translation_table.exists():
         logging.debug(f"Loading translations from existing table: {str(translation_table)!r}")
-        translation_data = parse_translations_from_excel(filepath=translation_table)
+        translation_data = base_data = parse_translation_table(filepath=translation_table)
         if translation_data.reference_language != reference_language:
             raise RuntimeError(
                 f"Reference language does not match: {reference_language!r} "
@@ -71,48 +457,455 @@ def reload_localisation_to_tsv(
             )
     else:
         logging.debug("No existing translations to start from")
-        translation_data = TranslationData(
+        translation_data = base_data = TranslationData(
             reference_language=reference_language,
             translation_language=translation_language,
         )
-    # Update translation data with references
+    # Update translation data with references, which leaves the base data untouched
     translation_data, stats = merge_latest_references_into_translations(
         known_translations=translation_data,
         latest_locdata=ref_locdata,
     )
-    # Update TSV file
-    write_translations_to_excel(
-        outpath=translation_table,
+    return translation_data, base_data, stats
+
+
+def _write_translation_table_safely(
+    translation_table: pathlib.Path,
+    translation_data: TranslationData,
+    base_data: TranslationData,
+    base_stat: list[int] | None,
+) -> tuple[TranslationData, str, list[int]]:
+    """Write the table, first merging in the edits others saved since it was loaded as the base data
+
+    The table is written next to it first. The lock is only held to check that nobody saved the table in the
+    meantime and to move the new table in place, otherwise their edits are merged in and it is written again.
+    Returns the written data, a description of the merged edits and the stat key of the written table.
+    """
+    staged_path = staging_path(translation_table)
+    conflicts: set[LocId] = set()
+    merged = False
+    try:
+        while True:
+            write_translation_table(outpath=staged_path, translation_data=translation_data)
+            with file_lock(translation_table):
+                if file_stat_key(translation_table) == base_stat:
+                    # Replacing keeps the size and modification time of the written file
+                    written_stat = file_stat_key(staged_path)
+                    os.replace(staged_path, translation_table)
+                    break
+            logging.info(f"Translation table changed since it was loaded, merging: {str(translation_table)!r}")
+            base_stat = file_stat_key(translation_table)
+            their_data = parse_translation_table(filepath=translation_table)
+            translation_data, new_conflicts = merge_concurrent_edits(
+                base=base_data,
+                ours=translation_data,
+                theirs=their_data,
+            )
+            base_data = their_data
+            conflicts.update(new_conflicts)
+            merged = True
+    finally:
+        staged_path.unlink(missing_ok=True)
+    info = ""
+    if merged:
+        info = "\nMerged edits saved to the table in the meantime"
+        if conflicts:
+            info += f", kept this version of {len(conflicts)} rows edited on both sides"
+    return translation_data, info, written_stat
+
+
+def flush_to_localisation(
+    translation_table: pathlib.Path,
+    translation_outfile: pathlib.Path,
+    summary_path: pathlib.Path | None = None,
+    glossary_path: pathlib.Path | None = None,
+    glossary_report_path: pathlib.Path | None = None,
+    chunk_dir: pathlib.Path | None = None,
+    verify_output: bool = True,
+    translation_data: TranslationData | None = None,
+    run_log_path: pathlib.Path | None = None,
+):
+    """Write the translations of the table to the output locfile
+
+    `translation_data` is the already parsed table, to skip parsing it again.
+    """
+    timer = StageTimer()
+    if not translation_table.exists():
+        raise RuntimeError(
+            f"The translation table does not yet exist, load localisation first (path {str(translation_table)!r})"
+        )
+    if not translation_outfile.parent.exists():
+        raise RuntimeError(f"Parent directory of output file must exist: {str(translation_outfile.parent)!r}")
+    info = ""
+    if translation_data is None:
+        with timer.stage("parse"):
+            translation_data = parse_translation_table(filepath=translation_table)
+    if chunk_dir is not None and has_chunk_tables(chunk_dir=chunk_dir):
+        # Translators may still be working on the split tables, so they are only read
+        with timer.stage("split tables"):
+            translation_data, chunk_info = _merge_chunk_tables(translation_data=translation_data, chunk_dir=chunk_dir)
+        info += f"Included {chunk_info}\n"
+    summary = None
+    if summary_path is not None or run_log_path is not None:
+        summary = _summary_stage(translation_data=translation_data, summary_path=summary_path, timer=timer)
+    with timer.stage("write"):
+        locdata = get_localisation_from_translations(translation_data=translation_data)
+        written = write_localisation_to_locfile(
+            outfile=translation_outfile,
+            locdata=locdata,
+            verify=verify_output,
+        )
+    info += f"Flushed {written} translations"
+    with timer.stage("glossary"):
+        info += _check_glossary_stage(
+            translation_data=translation_data,
+            glossary_path=glossary_path,
+            glossary_report_path=glossary_report_path,
+        )
+    if run_log_path is not None:
+        append_run_record(
+            log_path=run_log_path,
+            record=make_run_record(
+                operation="flush",
+                timer=timer,
+                counts={"written": written},
+                translation_table=translation_table,
+                table_rows=len(translation_data.entries),
+                status_counts=summary.overall,
+            ),
+        )
+    logging.info(info)
+    return info
+
+
+def describe_run_trends(run_log_path: pathlib.Path, last: int = 10) -> str:
+    return describe_trends(records=load_run_records(log_path=run_log_path), last=last)
+
+
+def export_localisation_package(
+    translation_table: pathlib.Path,
+    outpath: pathlib.Path,
+    file_stem: str,
+    ref_dirs: list[pathlib.Path],
+    reference_language: str,
+    reference_exclude_patterns: list[str],
+    max_file_size: int = DEFAULT_MAX_LOCFILE_SIZE,
+    layer_cache_dir: pathlib.Path | None = None,
+    chunk_dir: pathlib.Path | None = None,
+):
+    """Export the translations as a zip file with the localisation folder of a mod
+
+    With several reference directories, the first one is the base game: translations of the identifiers it defines
+    go to the replace folder, so they override the base game instead of conflicting with it.
+    """
+    if not translation_table.exists():
+        raise RuntimeError(
+            f"The translation table does not yet exist, load localisation first (path {str(translation_table)!r})"
+        )
+    if max_file_size < _MIN_LOCFILE_SIZE:
+        raise RuntimeError(f"The maximum file size must be at least {_MIN_LOCFILE_SIZE} bytes")
+    if not outpath.parent.exists():
+        raise RuntimeError(f"Parent directory of output file must exist: {str(outpath.parent)!r}")
+    info = ""
+    translation_data = parse_translation_table(filepath=translation_table)
+    if chunk_dir is not None and has_chunk_tables(chunk_dir=chunk_dir):
+        # Translators may still be working on the split tables, so they are only read
+        translation_data, chunk_info = _merge_chunk_tables(translation_data=translation_data, chunk_dir=chunk_dir)
+        info += f"Included {chunk_info}\n"
+    replace_identifiers = set()
+    if len(ref_dirs) > 1:
+        base_dirs = ref_dirs[:1]
+        base_locdata = _parse_reference_layers(
+            ref_dirs=base_dirs,
+            layer_files=_scan_reference_layers(
+                ref_dirs=base_dirs,
+                reference_exclude_patterns=reference_exclude_patterns,
+                checkpoint=None,
+            ),
+            reference_language=reference_language,
+            reference_exclude_patterns=reference_exclude_patterns,
+            checkpoint=None,
+            layer_cache_dir=layer_cache_dir,
+        )
+        replace_identifiers = base_locdata.entries.keys()
+    stats = write_localisation_package(
+        outpath=outpath,
         translation_data=translation_data,
+        file_stem=file_stem,
+        replace_identifiers=replace_identifiers,
+        max_file_size=max_file_size,
     )
-    info = f"Loaded {len(ref_locdata.entries)} references: "
-    if stats.all > 0:
-        info += (
-            f"{stats.new} new, {stats.changed} changed, {stats.deleted} deleted "
-            f"- {stats.outdated_translations} translations became outdated"
+    info += f"Exported {stats.written} translations in {len(stats.files)} files to {outpath.name!r}"
+    if stats.replaced > 0:
+        info += f", {stats.replaced} of which override the base game from the replace folder"
+    logging.info(info)
+    return info
+
+
+def split_translation_table(
+    translation_table: pathlib.Path,
+    chunk_dir: pathlib.Path,
+    strategy: ChunkStrategy,
+    rows_per_chunk: int = 2000,
+):
+    if not translation_table.exists():
+        raise RuntimeError(
+            f"The translation table does not yet exist, load localisation first (path {str(translation_table)!r})"
         )
-    else:
-        info += "no changes"
+    if has_chunk_tables(chunk_dir=chunk_dir):
+        raise RuntimeError(f"The translation table is already split, reassemble it first (path {str(chunk_dir)!r})")
+    if rows_per_chunk < 1:
+        raise RuntimeError(f"The number of rows per chunk must be positive, got {rows_per_chunk}")
+    translation_data = parse_translation_table(filepath=translation_table)
+    chunks = split_translation_data(
+        translation_data=translation_data,
+        strategy=strategy,
+        rows_per_chunk=rows_per_chunk,
+    )
+    write_chunk_tables(
+        chunk_dir=chunk_dir,
+        translation_data=translation_data,
+        chunks=chunks,
+        table_format=translation_table.suffix.removeprefix("."),
+    )
+    info = (
+        f"Split {len(translation_data.entries)} rows by {strategy.value} "
+        f"into {len(chunks)} tables in {str(chunk_dir)!r}"
+    )
     logging.info(info)
     return info
 
 
-def flush_to_localisation(
+def reassemble_translation_table(
     translation_table: pathlib.Path,
-    translation_outfile: pathlib.Path,
+    chunk_dir: pathlib.Path,
+    summary_path: pathlib.Path | None = None,
+):
+    if not has_chunk_tables(chunk_dir=chunk_dir):
+        raise RuntimeError(f"There are no split tables to reassemble (path {str(chunk_dir)!r})")
+    base_stat = file_stat_key(translation_table)
+    main_data = parse_translation_table(filepath=translation_table)
+    translation_data, chunk_info = _merge_chunk_tables(translation_data=main_data, chunk_dir=chunk_dir)
+    translation_data, merge_info, _ = _write_translation_table_safely(
+        translation_table=translation_table,
+        translation_data=translation_data,
+        base_data=main_data,
+        base_stat=base_stat,
+    )
+    remove_chunk_tables(chunk_dir=chunk_dir)
+    if summary_path is not None:
+        save_summary(summary_path=summary_path, summary=compute_summary(translation_data=translation_data))
+    info = f"Reassembled {chunk_info}{merge_info}"
+    logging.info(info)
+    return info
+
+
+def _merge_chunk_tables(translation_data: TranslationData, chunk_dir: pathlib.Path) -> tuple[TranslationData, str]:
+    """Merge the edits made to the split tables into the data of the main table"""
+    chunk_data, base_data = read_chunk_tables(chunk_dir=chunk_dir)
+    # The main table may have been reloaded since the split, so its references are the most recent
+    translation_data, conflicts = merge_concurrent_edits(base=base_data, ours=translation_data, theirs=chunk_data)
+    info = f"{len(chunk_data.entries)} rows from the split tables"
+    if conflicts:
+        info += f", kept the main table's version of {len(conflicts)} rows that were also edited there"
+    return translation_data, info
+
+
+def convert_translation_table(
+    source_table: pathlib.Path,
+    target_table: pathlib.Path,
+):
+    if not source_table.exists():
+        raise RuntimeError(f"The translation table to convert does not exist: {str(source_table)!r}")
+    if target_table.exists():
+        raise RuntimeError(f"Will not overwrite existing translation table: {str(target_table)!r}")
+    translation_data = parse_translation_table(filepath=source_table)
+    write_translation_table(
+        outpath=target_table,
+        translation_data=translation_data,
+    )
+    info = f"Converted {len(translation_data.entries)} rows to {target_table.name!r}"
+    logging.info(info)
+    return info
+
+
+def estimate_translation_effort(
+    translation_table: pathlib.Path,
+    cache_path: pathlib.Path | None = None,
+    journal_path: pathlib.Path | None = None,
+    csv_path: pathlib.Path | None = None,
+) -> EffortEstimate:
+    if not translation_table.exists():
+        raise RuntimeError(
+            f"The translation table does not yet exist, load localisation first (path {str(translation_table)!r})"
+        )
+    translation_data = parse_translation_table(filepath=translation_table)
+    # The journal knows what the references changed from in the latest reload
+    previous_references = {}
+    if journal_path is not None and journal_path.exists():
+        versions = list_versions(journal_path=journal_path)
+        if versions:
+            previous_references = {
+                change.identifier: change.previous
+                for change in get_version_changes(journal_path=journal_path, version=versions[-1].version)
+                if change.previous is not None and change.current is not None
+            }
+    estimate = estimate_effort(
+        translation_data=translation_data,
+        previous_references=previous_references,
+        cache_path=cache_path,
+    )
+    if csv_path is not None:
+        write_effort_csv(outpath=csv_path, estimate=estimate)
+    return estimate
+
+
+def describe_reference_changes(
+    journal_path: pathlib.Path,
+    version_or_label: str,
+) -> str:
+    version = find_version(journal_path=journal_path, version_or_label=version_or_label)
+    changes = get_version_changes(journal_path=journal_path, version=version.version)
+    lines = [f"Reference version {version.version} ({version.label or 'unlabeled'}, {version.created}):"]
+    for change in changes:
+        if change.previous is None:
+            lines.append(f"+ {change.identifier}: {change.current!r}")
+        elif change.current is None:
+            lines.append(f"- {change.identifier}: {change.previous!r}")
+        else:
+            lines.append(f"~ {change.identifier}: {change.previous!r} -> {change.current!r}")
+    return "\n".join(lines)
+
+
+def describe_reference_history(
+    journal_path: pathlib.Path,
+    identifier: str,
+) -> str:
+    history = get_identifier_history(journal_path=journal_path, identifier=identifier)
+    if not history:
+        return f"No reference history for {identifier!r}"
+    lines = [f"Reference history of {identifier!r}:"]
+    for entry in history:
+        text = repr(entry.text) if entry.text is not None else "<deleted>"
+        lines.append(f"{entry.version.version} ({entry.version.label or 'unlabeled'}, {entry.version.created}): {text}")
+    return "\n".join(lines)
+
+
+def rollback_references(
+    translation_table: pathlib.Path,
+    journal_path: pathlib.Path,
+    version_or_label: str,
+    summary_path: pathlib.Path | None = None,
+    run_log_path: pathlib.Path | None = None,
+) -> str:
+    timer = StageTimer()
+    if not translation_table.exists():
+        raise RuntimeError(f"The translation table does not yet exist (path {str(translation_table)!r})")
+    with timer.stage("journal"):
+        version = find_version(journal_path=journal_path, version_or_label=version_or_label)
+        ref_locdata = get_references_at(journal_path=journal_path, version=version.version)
+    base_stat = file_stat_key(translation_table)
+    with timer.stage("merge"):
+        translation_data = base_data = parse_translation_table(filepath=translation_table)
+        if translation_data.reference_language != ref_locdata.language:
+            raise RuntimeError(
+                f"Reference language does not match: {ref_locdata.language!r} "
+                f"versus {translation_data.reference_language!r} in existing data"
+            )
+        translation_data, stats = merge_latest_references_into_translations(
+            known_translations=translation_data,
+            latest_locdata=ref_locdata,
+        )
+    with timer.stage("write"):
+        translation_data, merge_info, _ = _write_translation_table_safely(
+            translation_table=translation_table,
+            translation_data=translation_data,
+            base_data=base_data,
+            base_stat=base_stat,
+        )
+    summary = None
+    if summary_path is not None or run_log_path is not None:
+        summary = _summary_stage(translation_data=translation_data, summary_path=summary_path, timer=timer)
+    info = f"Rolled back references to version {version.version}: {_describe_reload_stats(stats=stats)}{merge_info}"
+    if run_log_path is not None:
+        append_run_record(
+            log_path=run_log_path,
+            record=make_run_record(
+                operation="rollback",
+                timer=timer,
+                counts={"references": len(ref_locdata.entries), **dataclasses.asdict(stats)},
+                translation_table=translation_table,
+                table_rows=len(translation_data.entries),
+                status_counts=summary.overall,
+            ),
+        )
+    logging.info(info)
+    return info
+
+
+def prefill_machine_translations(
+    translation_table: pathlib.Path,
+    backend_url: str,
+    cache_path: pathlib.Path,
+    summary_path: pathlib.Path | None = None,
 ):
     if not translation_table.exists():
         raise RuntimeError(
             f"The translation table does not yet exist, load localisation first (path {str(translation_table)!r})"
         )
-    if not translation_outfile.parent.exists():
-        raise RuntimeError(f"Parent directory of output file must exist: {str(translation_outfile.parent)!r}")
-    translation_data = parse_translations_from_excel(filepath=translation_table)
-    locdata = get_localisation_from_translations(translation_data=translation_data)
-    written = write_localisation_to_locfile(
-        outfile=translation_outfile,
-        locdata=locdata,
+    base_stat = file_stat_key(translation_table)
+    translation_data = parse_translation_table(filepath=translation_table)
+    base_data = copy_translation_data(translation_data=translation_data)
+    prefilled = prefill_translations(
+        translation_data=translation_data,
+        backend=HttpTranslationBackend(url=backend_url),
+        cache_path=cache_path,
+    )
+    merge_info = ""
+    if prefilled > 0:
+        # Requests to the backend can take long, others may have saved edits in the meantime
+        translation_data, merge_info, _ = _write_translation_table_safely(
+            translation_table=translation_table,
+            translation_data=translation_data,
+            base_data=base_data,
+            base_stat=base_stat,
+        )
+    if summary_path is not None:
+        save_summary(summary_path=summary_path, summary=compute_summary(translation_data=translation_data))
+    info = (
+        f"Pre-filled {prefilled} missing translations, "
+        f"marked as {TranslationStatus.MACHINE.value!r} for review{merge_info}"
+    )
+    logging.info(info)
+    return info
+
+
+def save_table_edits(
+    index: SearchIndex,
+    translation_table: pathlib.Path,
+    summary_path: pathlib.Path | None = None,
+):
+    edits = index.pending_edits()
+    if not edits:
+        return "No edits to save"
+    # Edits are applied to the table as it is now, edits saved by others while writing are merged in
+    base_stat = file_stat_key(translation_table)
+    index_was_current = index.table_stat == str(base_stat)
+    base_data = parse_translation_table(filepath=translation_table)
+    translation_data = copy_translation_data(translation_data=base_data)
+    applied = apply_edits(translation_data=translation_data, edits=edits)
+    translation_data, merge_info, written_stat = _write_translation_table_safely(
+        translation_table=translation_table,
+        translation_data=translation_data,
+        base_data=base_data,
+        base_stat=base_stat,
     )
-    info = f"Flushed {written} translations"
+    index.clear_edits()
+    if index_was_current and not merge_info:
+        # The index already holds the edits, so it matches the written table without a rebuild
+        index.set_table_stat(str(written_stat))
+    if summary_path is not None:
+        save_summary(summary_path=summary_path, summary=compute_summary(translation_data=translation_data))
+    info = f"Saved {applied} edited translations" + merge_info
     logging.info(info)
     return info
@@ -0,0 +1,107 @@
+import collections
+import concurrent.futures
+import contextlib
+import os
+import pathlib
+import time
+import typing as t
+
+DEFAULT_MAX_WORKERS = 32  # Requests in flight, each one mostly waits on the (network) filesystem
+
+_simulated_latency = 0.0
+
+
+@contextlib.contextmanager
+def simulate_latency(seconds: float) -> t.Iterator[None]:
+    """Delay every directory listing, stat and read by `seconds`, like a filesystem on a distant network share"""
+    global _simulated_latency
+    previous, _simulated_latency = _simulated_latency, seconds
+    try:
+        yield
+    finally:
+        _simulated_latency = previous
+
+
+def scan_files(
+    directory: pathlib.Path,
+    suffix: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[pathlib.Path]:
+    """All files ending in `suffix` below `directory`, listing the subdirectories concurrently
+
+    The file type comes with the directory listing, so files are not stat-ed one by one. The order is arbitrary.
+    Symlinked directories are not followed, like the recursive glob this replaces, so a link loop ends.
+    """
+    filepaths = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_list_directory, directory)}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                subdirectories, files = future.result()
+                filepaths.extend(fp for fp in files if fp.name.endswith(suffix))
+                pending.update(executor.submit(_list_directory, subdirectory) for subdirectory in subdirectories)
+    return filepaths
+
+
+def stat_files(
+    filepaths: t.Iterable[pathlib.Path],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> dict[pathlib.Path, os.stat_result | None]:
+    """Stat the files concurrently, None for files that no longer exist"""
+    filepaths = list(filepaths)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(filepaths, executor.map(_stat, filepaths)))
+
+
+def read_files(
+    filepaths: t.Iterable[pathlib.Path],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> t.Iterator[tuple[pathlib.Path, bytes | None]]:
+    """Yield the content of the files in order, None for files that no longer exist
+
+    The next files are read ahead while the current one is processed, with at most twice `max_workers` in memory.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: collections.deque[tuple[pathlib.Path, concurrent.futures.Future]] = collections.deque()
+        for filepath in filepaths:
+            pending.append((filepath, executor.submit(_read_bytes, filepath)))
+            if len(pending) >= 2 * max_workers:
+                filepath, future = pending.popleft()
+                yield filepath, future.result()
+        while pending:
+            filepath, future = pending.popleft()
+            yield filepath, future.result()
+
+
+def _list_directory(directory: pathlib.Path) -> tuple[list[pathlib.Path], list[pathlib.Path]]:
+    _wait_for_latency()
+    subdirectories, files = [], []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(directory / entry.name)
+            elif entry.is_file():
+                files.append(directory / entry.name)
+    return subdirectories, files
+
+
+def _stat(filepath: pathlib.Path) -> os.stat_result | None:
+    _wait_for_latency()
+    try:
+        return filepath.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _read_bytes(filepath: pathlib.Path) -> bytes | None:
+    _wait_for_latency()
+    try:
+        return filepath.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _wait_for_latency():
+    if _simulated_latency > 0:
+        time.sleep(_simulated_latency)
@@ -2,5 +2,13 @@ import pathlib
 
 EU4TH_DIR = pathlib.Path.home() / ".eu4th"
 CONFIG_PATH = EU4TH_DIR / "config.json"
-TSV_FILEPATH = EU4TH_DIR / "translations.tsv"
 EXCEL_FILENAME = "translation_table.xlsx"
+TSV_FILENAME = "translation_table.tsv"
+CSV_FILENAME = "translation_table.csv"
+TABLE_FILENAMES = {
+    "xlsx": EXCEL_FILENAME,
+    "tsv": TSV_FILENAME,
+    "csv": CSV_FILENAME,
+}
+REFERENCE_CACHE_DIR = EU4TH_DIR / "reference_cache"
+MACHINE_TRANSLATION_CACHE = EU4TH_DIR / "machine_translation_cache.sqlite"
@@ -0,0 +1,141 @@
+import csv
+import dataclasses
+import hashlib
+import json
+import logging
+import pathlib
+
+from .locking import atomic_replace
+from .models import LocId, Text, TranslationData, TranslationStatus
+from .reference_diff import count_changed_words
+from .tokens import strip_tokens
+
+
+@dataclasses.dataclass
+class EntryEffort:
+    words: int
+    characters: int  # Without whitespace
+    changed_words: int  # Words of the reference that differ from the previous one, all words if it is unknown
+
+
+@dataclasses.dataclass
+class SourceEffort:
+    missing_rows: int = 0
+    missing_words: int = 0
+    missing_characters: int = 0
+    outdated_rows: int = 0
+    outdated_words: int = 0
+    outdated_characters: int = 0
+    outdated_changed_words: int = 0
+
+    @property
+    def words_to_translate(self) -> int:
+        return self.missing_words + self.outdated_changed_words
+
+    def add(self, status: TranslationStatus, effort: EntryEffort):
+        if status is TranslationStatus.MISSING:
+            self.missing_rows += 1
+            self.missing_words += effort.words
+            self.missing_characters += effort.characters
+        else:
+            self.outdated_rows += 1
+            self.outdated_words += effort.words
+            self.outdated_characters += effort.characters
+            self.outdated_changed_words += effort.changed_words
+
+
+@dataclasses.dataclass
+class EffortEstimate:
+    overall: SourceEffort = dataclasses.field(default_factory=SourceEffort)
+    by_source: dict[str, SourceEffort] = dataclasses.field(default_factory=dict)
+
+    def describe(self) -> str:
+        return (
+            f"{self.overall.words_to_translate} words to translate: "
+            f"{self.overall.missing_words} words in {self.overall.missing_rows} missing rows, "
+            f"{self.overall.outdated_changed_words} changed words in {self.overall.outdated_rows} outdated rows"
+        )
+
+
+def measure_entry(reference: Text, previous_reference: Text | None) -> EntryEffort:
+    words = strip_tokens(reference).split()
+    if previous_reference is None:
+        changed_words = len(words)
+    else:
+        changed_words = count_changed_words(previous=strip_tokens(previous_reference), current=" ".join(words))
+    return EntryEffort(
+        words=len(words),
+        characters=sum(len(word) for word in words),
+        changed_words=changed_words,
+    )
+
+
+def _entry_key(reference: Text, previous_reference: Text | None) -> str:
+    raw = json.dumps([reference, previous_reference], ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def estimate_effort(
+    translation_data: TranslationData,
+    previous_references: dict[LocId, Text],
+    cache_path: pathlib.Path | None = None,
+) -> EffortEstimate:
+    """Count the words and characters left to translate, per source file
+
+    Outdated rows with a known previous reference only count the words that changed.
+    The previous reference kept in the table is preferred, `previous_references` serves tables from before it was.
+    The counts of each row are cached by its texts, so only changed rows are measured again.
+    """
+    cache = _load_cache(cache_path) if cache_path is not None else {}
+    updated_cache = {}
+    measured = 0
+    estimate = EffortEstimate()
+    for locid, entry in translation_data.entries.items():
+        if entry.status not in (TranslationStatus.MISSING, TranslationStatus.OUTDATED) or not entry.reference:
+            continue
+        previous_reference = None
+        if entry.status is TranslationStatus.OUTDATED:
+            previous_reference = entry.previous_reference or previous_references.get(locid)
+        key = _entry_key(reference=entry.reference, previous_reference=previous_reference)
+        cached = cache.get(locid)
+        if cached is not None and cached[0] == key:
+            effort = EntryEffort(*cached[1:])
+        else:
+            effort = measure_entry(reference=entry.reference, previous_reference=previous_reference)
+            measured += 1
+        updated_cache[locid] = [key, effort.words, effort.characters, effort.changed_words]
+        estimate.overall.add(status=entry.status, effort=effort)
+        source_effort = estimate.by_source.get(entry.source)
+        if source_effort is None:
+            source_effort = estimate.by_source[entry.source] = SourceEffort()
+        source_effort.add(status=entry.status, effort=effort)
+    logging.info(f"Measured {measured} of {len(updated_cache)} rows to translate, the others were cached")
+    if cache_path is not None and (measured > 0 or len(updated_cache) != len(cache)):
+        with atomic_replace(cache_path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(updated_cache, fh)
+    return estimate
+
+
+def _load_cache(cache_path: pathlib.Path) -> dict[LocId, list]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+    except (IOError, json.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable effort cache {str(cache_path)!r}: {e}")
+        return {}
+
+
+def write_effort_csv(
+    outpath: pathlib.Path,
+    estimate: EffortEstimate,
+):
+    logging.info(f"Writing effort estimate of {len(estimate.by_source)} source files to {str(outpath)!r}")
+    fields = [field.name for field in dataclasses.fields(SourceEffort)]
+    with atomic_replace(outpath) as tmp_path, open(tmp_path, "w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.writer(fh, dialect="excel")
+        writer.writerow(["source", *fields, "words_to_translate"])
+        for source, source_effort in sorted(estimate.by_source.items(), key=lambda item: -item[1].words_to_translate):
+            writer.writerow([source, *dataclasses.astuple(source_effort), source_effort.words_to_translate])
+        writer.writerow(["<total>", *dataclasses.astuple(estimate.overall), estimate.overall.words_to_translate])
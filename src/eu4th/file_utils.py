@@ -1,7 +1,11 @@
+import codecs
+import csv
 import dataclasses
 import logging
 import pathlib
 import re
+import typing as t
+import zipfile
 
 import openpyxl
 import openpyxl.cell
@@ -9,10 +13,33 @@ import openpyxl.styles.numbers
 import openpyxl.worksheet
 import openpyxl.worksheet.worksheet
 
-from .models import LocalisationData, LocFile, LocLine, Text, TranslationData, TranslationEntry, TranslationStatus
+from .concurrent_io import DEFAULT_MAX_WORKERS, read_files
+from .locking import atomic_replace
+from .models import (
+    LocalisationData,
+    LocFile,
+    LocId,
+    LocLine,
+    Text,
+    TranslationData,
+    TranslationEntry,
+    TranslationStatus,
+)
 
 _LOC_LANG_RE = re.compile(r"^l_([a-z]+):$")
 _LOC_SEPARATOR_RE = re.compile(r":[0-9]")
+_UTF8_MULTIBYTE_RE = re.compile(rb"[\xc2-\xdf][\x80-\xbf]|[\xe0-\xef][\x80-\xbf]{2}|[\xf0-\xf4][\x80-\xbf]{3}")
+_REPLACE_DIRNAME = "replace"
+_LOCALISATION_DIRNAME = "localisation"
+_TABLE_COLUMN_COUNT = 6
+# Statuses that can not be derived from the translation, and so are written to the table
+_EXPLICIT_STATUSES = (TranslationStatus.OUTDATED, TranslationStatus.MACHINE)
+_MAX_REPORTED_PROBLEMS = 10
+DEFAULT_MAX_LOCFILE_SIZE = 2 * 1024 * 1024
+_CSV_DIALECTS = {
+    ".tsv": "excel-tab",
+    ".csv": "excel",
+}
 
 
 @dataclasses.dataclass
@@ -22,53 +49,113 @@ class ReloadStats:
     deleted: int
 
     outdated_translations: int
+    restored_translations: int = 0  # Outdated translations whose reference changed back to what they were made for
 
     @property
     def all(self) -> int:
         return self.new + self.changed + self.deleted
 
 
+@dataclasses.dataclass
+class PackageStats:
+    written: int = 0
+    replaced: int = 0  # Written to the replace folder, as they override identifiers of the base game
+    files: list[str] = dataclasses.field(default_factory=list)
+
+
 def _load_loc_from_file(
     filepath: pathlib.Path,
+    raw: bytes,
     language: str,
 ) -> LocFile | None:
     logging.info(f"Parsing locfile {str(filepath)!r}")
+    try:
+        content, encoding = _decode_locfile(raw=raw)
+    except ValueError as e:
+        logging.warning(f"Quarantined locfile {filepath.name!r}: {e}")
+        return LocFile(sourcefile=filepath, language=language, lines=[], problem=str(e))
+    if encoding != "utf-8-sig":
+        logging.warning(f"Locfile {filepath.name!r} is not UTF-8 with BOM, read it as {encoding!r}")
+    raw_lines = content.split("\n")
+    # Get the language
+    file_language_raw = raw_lines[0].strip()
+    file_language_match = _LOC_LANG_RE.match(file_language_raw)
+    if not file_language_match:
+        logging.warning(f"Could not find language from file {filepath.name!r}")
+        return None
+    file_language = file_language_match.group(1)
+    # Ignore unwanted languages
+    if file_language != language:
+        logging.info(f"Skipping {filepath.name!r}, wrong language ({file_language!r} instead of {language!r})")
+        return None
+    # Parse lines
     lines = []
-    with open(filepath, "r", encoding="utf-8-sig") as fh:
-        # Get the language
-        file_language_raw = fh.readline().strip()
-        file_language_match = _LOC_LANG_RE.match(file_language_raw)
-        if not file_language_match:
-            logging.warning(f"Could not find language from file {filepath.name!r}")
-            return None
-        file_language = file_language_match.group(1)
-        # Ignore unwanted languages
-        if file_language != language:
-            logging.info(f"Skipping {filepath.name!r}, wrong language ({file_language!r} instead of {language!r})")
-            return None
-        # Parse lines
-        for line_nr, line in enumerate(fh, start=2):
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            try:
-                identifier, text = _LOC_SEPARATOR_RE.split(line, maxsplit=1)
-            except ValueError:
-                logging.warning(f"Invalid entry in localisation file {filepath.name!r}, line {line_nr}")
-                continue
-            else:
-                text = text.strip().removeprefix('"').removesuffix('"').replace('\\"', '"')
-                lines.append(
-                    LocLine(
-                        identifier=identifier.strip(),
-                        text=text.strip(),
-                    )
-                )
+    for line_nr, line in enumerate(raw_lines[1:], start=2):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        locline = _parse_loc_line(line)
+        if locline is None:
+            logging.warning(f"Invalid entry in localisation file {filepath.name!r}, line {line_nr}")
+            continue
+        lines.append(locline)
     return LocFile(sourcefile=filepath, language=language, lines=lines)
 
 
-def _merge_localisations(
-    locfiles: list[LocFile],
+def _parse_loc_line(line: str) -> LocLine | None:
+    """Parse a stripped line that is not empty or a comment, None if it is not a valid entry"""
+    try:
+        identifier, text = _LOC_SEPARATOR_RE.split(line, maxsplit=1)
+    except ValueError:
+        return None
+    text = text.strip().removeprefix('"').removesuffix('"').replace('\\"', '"')
+    return LocLine(
+        identifier=identifier.strip(),
+        text=text.strip(),
+    )
+
+
+def _decode_locfile(raw: bytes) -> tuple[Text, str]:
+    """Decode the content of a locfile, returning the text and the encoding that was used
+
+    The game expects UTF-8 with BOM, but files without BOM, UTF-16 files and legacy cp1252 files are read as well.
+    Raises a ValueError for files that can not be decoded, like UTF-8 files with stray bytes.
+    """
+    encoding = "utf-8"
+    if raw.startswith(codecs.BOM_UTF8):
+        encoding = "utf-8-sig"
+        raw = raw[len(codecs.BOM_UTF8) :]
+    elif raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        try:
+            return raw.decode("utf-16"), "utf-16"
+        except UnicodeDecodeError as e:
+            raise ValueError("invalid utf-16") from e
+    try:
+        return raw.decode("utf-8"), encoding
+    except UnicodeDecodeError as e:
+        utf8_error = e
+    # Legacy files have no multibyte sequences, valid ones point at a UTF-8 file with stray bytes instead
+    if encoding == "utf-8" and not _UTF8_MULTIBYTE_RE.search(raw):
+        try:
+            return raw.decode("cp1252"), "cp1252"
+        except UnicodeDecodeError:
+            pass
+    line_nr = raw.count(b"\n", 0, utf8_error.start) + 1
+    bad_byte = raw[utf8_error.start : utf8_error.start + 1]
+    raise ValueError(f"invalid utf-8 on line {line_nr} (byte {bad_byte!r})") from utf8_error
+
+
+def locfile_precedence_key(filepath: pathlib.Path) -> tuple[int, str]:
+    """Sort key of locfiles, the first file defining an identifier wins
+
+    Files in a 'replace' folder override the base files, ties are broken by path to be independent of traversal order.
+    """
+    in_replace_dir = _REPLACE_DIRNAME in filepath.parent.parts
+    return (0 if in_replace_dir else 1, filepath.as_posix())
+
+
+def merge_localisations(
+    locfiles: t.Iterable[LocFile],
     language: str,
 ) -> LocalisationData:
     logging.info("Merging localisations")
@@ -76,31 +163,133 @@ def _merge_localisations(
     for locfile in locfiles:
         if locfile.language != locdata.language:
             continue
+        if locfile.problem is not None:
+            locdata.quarantined[locfile.sourcefile] = locfile.problem
+            continue
         for locline in locfile.lines:
-            if locline.identifier in locdata.entries:
-                logging.warning(f"Skipping duplicate definition of {locline.identifier!r}")
+            identifier = locline.identifier
+            current_source = locdata.sources.get(identifier)
+            if current_source is None:
+                locdata.entries[identifier] = locline.text
+                locdata.sources[identifier] = locfile.sourcefile
                 continue
-            locdata.entries[locline.identifier] = locline.text
+            # Resolve by precedence rather than by arrival order, so the result does not depend on parse order
+            overridden = locdata.overridden.setdefault(identifier, [])
+            if locfile_precedence_key(locfile.sourcefile) < locfile_precedence_key(current_source):
+                overridden.append(current_source)
+                locdata.entries[identifier] = locline.text
+                locdata.sources[identifier] = locfile.sourcefile
+            else:
+                overridden.append(locfile.sourcefile)
+    if locdata.overridden:
+        nr_replaced = sum(1 for identifier in locdata.overridden if _is_replace_override(locdata, identifier))
+        logging.warning(
+            f"Found {len(locdata.overridden)} identifiers with multiple definitions, "
+            f"{nr_replaced} of which are overridden from a {_REPLACE_DIRNAME!r} folder"
+        )
     return locdata
 
 
+def overlay_localisation(
+    base: LocalisationData,
+    layer: LocalisationData,
+):
+    """Apply the definitions of a higher reference layer on top of the base, in place"""
+    base.entries.update(layer.entries)
+    base.sources.update(layer.sources)
+    for identifier in layer.entries.keys() & base.overridden.keys():
+        del base.overridden[identifier]
+    base.overridden.update(layer.overridden)
+    base.quarantined.update(layer.quarantined)
+
+
+def _is_replace_override(locdata: LocalisationData, identifier: LocId) -> bool:
+    return _REPLACE_DIRNAME in locdata.sources[identifier].parent.parts and not any(
+        _REPLACE_DIRNAME in source.parent.parts for source in locdata.overridden[identifier]
+    )
+
+
+def write_conflict_report(
+    outpath: pathlib.Path,
+    locdata: LocalisationData,
+) -> int:
+    logging.info(f"Writing conflict report for {len(locdata.overridden)} identifiers to {str(outpath)!r}")
+    with atomic_replace(outpath) as tmp_path, open(tmp_path, "w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.writer(fh, dialect="excel-tab")
+        writer.writerow(["identifier", "resolution", "used_source", "ignored_sources"])
+        for identifier in sorted(locdata.overridden):
+            resolution = "replace" if _is_replace_override(locdata, identifier) else "duplicate"
+            writer.writerow(
+                [
+                    identifier,
+                    resolution,
+                    str(locdata.sources[identifier]),
+                    "; ".join(str(source) for source in sorted(locdata.overridden[identifier])),
+                ]
+            )
+    return len(locdata.overridden)
+
+
+def iter_locfiles(
+    filepaths: t.Iterable[pathlib.Path],
+    language: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> t.Iterator[tuple[pathlib.Path, LocFile | None]]:
+    # Read the next files while parsing, on a network share the reads wait far longer than the parsing takes
+    for filepath, raw in read_files(filepaths=filepaths, max_workers=max_workers):
+        if raw is None:
+            continue
+        yield filepath, _load_loc_from_file(filepath=filepath, raw=raw, language=language)
+
+
 def parse_localisation_from_locfiles(
     filepaths: list[pathlib.Path],
     language: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> LocalisationData:
-    locfiles = []
-    for filepath in filepaths:
-        if not filepath.exists():
-            continue
-        locfile = _load_loc_from_file(filepath=filepath, language=language)
-        if locfile is not None:
-            locfiles.append(locfile)
-    return _merge_localisations(
-        locfiles=locfiles,
+    filepaths = sorted(filepaths, key=locfile_precedence_key)
+    locfiles = iter_locfiles(filepaths=filepaths, language=language, max_workers=max_workers)
+    return merge_localisations(
+        locfiles=(locfile for _, locfile in locfiles if locfile),
         language=language,
     )
 
 
+def _table_header(translation_data: TranslationData) -> list[str]:
+    return [
+        "identifier",
+        "translation_status",
+        translation_data.translation_language,
+        translation_data.reference_language,
+        "source",
+        "previous_reference",
+    ]
+
+
+def _table_rows(translation_data: TranslationData) -> t.Iterator[list[str]]:
+    for locid in sorted(translation_data.entries.keys()):
+        entry = translation_data.entries[locid]
+        status = entry.status.value if entry.status in _EXPLICIT_STATUSES else ""
+        yield [locid, status, entry.translation, entry.reference, entry.source, entry.previous_reference]
+
+
+def _entry_from_row(row: t.Sequence) -> tuple[LocId, TranslationEntry]:
+    values = [str(v or "") for v in row[:_TABLE_COLUMN_COUNT]]  # Ensure all are strings
+    values += [""] * (_TABLE_COLUMN_COUNT - len(values))  # Editors may drop trailing empty cells
+    identifier, raw_status, translation, reference, source, previous_reference = values
+    status = TranslationStatus(
+        raw_status or (TranslationStatus.DONE.value if translation else TranslationStatus.MISSING.value)
+    )
+    return identifier, TranslationEntry(
+        reference=reference,
+        translation=translation,
+        status=status,
+        source=source,
+        # Clearing the outdated status marks the translation as updated, the previous reference is no longer needed
+        previous_reference=previous_reference if status is TranslationStatus.OUTDATED else "",
+    )
+
+
 def parse_translations_from_excel(filepath: pathlib.Path) -> TranslationData:
     logging.info(f"Parsing Excel {str(filepath)!r}")
     wb = openpyxl.load_workbook(filepath)
@@ -113,40 +302,241 @@ def parse_translations_from_excel(filepath: pathlib.Path) -> TranslationData:
         translation_language=translation_language,
     )
     # Read rows
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=4, values_only=True):
-        values = [str(v or "") for v in row]  # Ensure all are strings
-        identifier, raw_status, translation, reference = values
-        status = TranslationStatus(
-            raw_status or (TranslationStatus.DONE.value if translation else TranslationStatus.MISSING.value)
-        )
-        locdata.entries[identifier] = TranslationEntry(
-            reference=reference,
-            translation=translation,
-            status=status,
+    for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=_TABLE_COLUMN_COUNT, values_only=True):
+        identifier, entry = _entry_from_row(row)
+        locdata.entries[identifier] = entry
+    return locdata
+
+
+def parse_translations_from_csv(filepath: pathlib.Path) -> TranslationData:
+    logging.info(f"Parsing delimited table {str(filepath)!r}")
+    dialect = _CSV_DIALECTS[filepath.suffix.lower()]
+    # The 'utf-8-sig' codec strips a BOM if present, as added by Excel and by our own writer
+    with open(filepath, "r", encoding="utf-8-sig", newline="") as fh:
+        reader = csv.reader(fh, dialect=dialect)
+        # Read header
+        header = next(reader, None)
+        if header is None or len(header) < 4:  # Older tables have no source and previous reference columns
+            raise RuntimeError(f"Invalid or missing header in translation table {str(filepath)!r}")
+        locdata = TranslationData(
+            reference_language=header[3],
+            translation_language=header[2],
         )
+        # Read rows
+        for row in reader:
+            if not row or not row[0]:
+                continue
+            identifier, entry = _entry_from_row(row)
+            locdata.entries[identifier] = entry
     return locdata
 
 
+def parse_translation_table(filepath: pathlib.Path) -> TranslationData:
+    reader, _ = _get_table_format(filepath=filepath)
+    return reader(filepath)
+
+
 def write_localisation_to_locfile(
     outfile: pathlib.Path,
-    locdata: TranslationData,
+    locdata: LocalisationData,
+    verify: bool = True,
 ) -> int:
+    """Write the non-empty entries to a locfile
+
+    When verifying, the written file is parsed back before it replaces the existing one, and the flush fails if
+    any entry does not read back as it was written.
+    """
     logging.info(f"Writing localisation for language {locdata.language!r} to {str(outfile)!r}")
     written = 0
-    with open(outfile, "w", encoding="utf-8-sig") as fh:
-        fh.write(f"l_{locdata.language}:\n")
-        for identifier, text in locdata.entries.items():
-            if text:
-                text = text.replace('"', '\\"')
-                fh.write(f' {identifier}:0 "{text}"\n')
-                written += 1
+    with atomic_replace(outfile) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8-sig") as fh:
+            fh.write(f"l_{locdata.language}:\n")
+            for identifier, text in locdata.entries.items():
+                if text:
+                    fh.write(_format_loc_line(identifier=identifier, text=text))
+                    written += 1
+        if verify:
+            problems = verify_locfile(filepath=tmp_path, locdata=locdata)
+            if problems:
+                raise RuntimeError(
+                    "Not flushed, the written translations would not read back correctly:\n"
+                    + _describe_problems(problems)
+                )
     return written
 
 
+def write_localisation_package(
+    outpath: pathlib.Path,
+    translation_data: TranslationData,
+    file_stem: str,
+    replace_identifiers: t.Container[LocId],
+    max_file_size: int = DEFAULT_MAX_LOCFILE_SIZE,
+    verify: bool = True,
+) -> PackageStats:
+    """Write the translations to a zip file ready to drop into a mod, in a single pass over the entries
+
+    Translations of `replace_identifiers` go to the replace folder, so they override the base game.
+    Locfiles are split to stay below `max_file_size` bytes, unless a single entry is larger.
+    """
+    logging.info(f"Writing {translation_data.translation_language!r} localisation package to {str(outpath)!r}")
+    stats = PackageStats()
+    with atomic_replace(outpath) as tmp_path:
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+            packagers = {
+                is_replace: _LocfilePackager(
+                    zip_file=zip_file,
+                    directory=f"{_LOCALISATION_DIRNAME}/{_REPLACE_DIRNAME}" if is_replace else _LOCALISATION_DIRNAME,
+                    file_stem=file_stem,
+                    language=translation_data.translation_language,
+                    max_file_size=max_file_size,
+                    verify=verify,
+                )
+                for is_replace in (False, True)
+            }
+            for locid, entry in translation_data.entries.items():
+                if entry.translation:
+                    is_replace = locid in replace_identifiers
+                    packagers[is_replace].add(identifier=locid, text=entry.translation)
+                    stats.written += 1
+                    stats.replaced += is_replace
+            for packager in packagers.values():
+                packager.finish()
+                stats.files.extend(packager.files)
+        problems = [problem for packager in packagers.values() for problem in packager.problems]
+        if problems:
+            raise RuntimeError(
+                "Not exported, the written translations would not read back correctly:\n" + _describe_problems(problems)
+            )
+    return stats
+
+
+class _LocfilePackager:
+    """Collects the lines of one locfile at a time, and adds it to the zip file once the next line does not fit"""
+
+    def __init__(
+        self,
+        zip_file: zipfile.ZipFile,
+        directory: str,
+        file_stem: str,
+        language: str,
+        max_file_size: int,
+        verify: bool,
+    ):
+        self.files: list[str] = []
+        self.problems: list[str] = []
+        self._zip_file = zip_file
+        self._directory = directory
+        self._file_stem = file_stem
+        self._language = language
+        self._max_file_size = max_file_size
+        self._verify = verify
+        self._header = codecs.BOM_UTF8 + f"l_{language}:\n".encode("utf-8")
+        self._lines: list[bytes] = []
+        self._entries: dict[LocId, Text] = {}
+        self._size = len(self._header)
+
+    def add(self, identifier: LocId, text: Text):
+        line = _format_loc_line(identifier=identifier, text=text).encode("utf-8")
+        if self._lines and self._size + len(line) > self._max_file_size:
+            self._write_file(numbered=True)
+        if len(self._header) + len(line) > self._max_file_size:
+            logging.warning(f"Translation of {identifier!r} alone exceeds the maximum file size")
+        self._lines.append(line)
+        self._entries[identifier] = text
+        self._size += len(line)
+
+    def finish(self):
+        if self._lines:
+            # Only number the file if it is not the only one
+            self._write_file(numbered=bool(self.files))
+
+    def _write_file(self, numbered: bool):
+        part = f"_{len(self.files) + 1}" if numbered else ""
+        name = f"{self._directory}/{self._file_stem}{part}_l_{self._language}.yml"
+        content = self._header + b"".join(self._lines)
+        if self._verify:
+            problems = _verify_loc_lines(
+                lines=content.decode("utf-8-sig").split("\n"),
+                language=self._language,
+                entries=self._entries,
+            )
+            self.problems.extend(f"{name}: {problem}" for problem in problems)
+        self._zip_file.writestr(name, content)
+        self.files.append(name)
+        self._lines = []
+        self._entries = {}
+        self._size = len(self._header)
+
+
+def _format_loc_line(identifier: LocId, text: Text) -> str:
+    text = text.replace('"', '\\"')
+    return f' {identifier}:0 "{text}"\n'
+
+
+def _describe_problems(problems: list[str]) -> str:
+    shown = problems[:_MAX_REPORTED_PROBLEMS]
+    if len(problems) > len(shown):
+        shown.append(f"... and {len(problems) - len(shown)} more")
+    return "\n".join(shown)
+
+
+def verify_locfile(
+    filepath: pathlib.Path,
+    locdata: LocalisationData,
+) -> list[str]:
+    """Stream a written locfile back through the parser, and describe where it differs from the data written
+
+    Texts are compared as the parser reads them, so without surrounding whitespace.
+    """
+    with open(filepath, "r", encoding="utf-8-sig") as fh:
+        return _verify_loc_lines(lines=fh, language=locdata.language, entries=locdata.entries)
+
+
+def _verify_loc_lines(
+    lines: t.Iterable[str],
+    language: str,
+    entries: dict[LocId, Text],
+) -> list[str]:
+    problems = []
+    seen = set()
+    lines = iter(lines)
+    if next(lines, "").strip() != f"l_{language}:":
+        problems.append(f"Line 1: the language header is not 'l_{language}:'")
+    for line_nr, line in enumerate(lines, start=2):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        locline = _parse_loc_line(line)
+        if locline is None:
+            problems.append(f"Line {line_nr}: not an entry, does the translation above contain a line break?")
+            continue
+        identifier = locline.identifier
+        expected = entries.get(identifier)
+        if not expected:
+            problems.append(f"Line {line_nr}: unexpected identifier {identifier!r}")
+        elif identifier in seen:
+            problems.append(f"Line {line_nr}: {identifier!r} is written more than once")
+        elif locline.text != expected.strip():
+            problems.append(f"Line {line_nr}: {identifier!r} reads back as {locline.text!r}")
+        elif line.endswith('\\"') and _is_escaped_closing_quote(line):
+            problems.append(f"Line {line_nr}: {identifier!r} ends with a backslash, escaping the closing quote")
+        seen.add(identifier)
+    if len(seen) < sum(1 for text in entries.values() if text):
+        missing = sorted(locid for locid, text in entries.items() if text and locid not in seen)
+        problems.extend(f"{locid!r} is missing" for locid in missing)
+    return problems
+
+
+def _is_escaped_closing_quote(line: str) -> bool:
+    body = line[:-1]
+    return (len(body) - len(body.rstrip("\\"))) % 2 == 1
+
+
 def write_translations_to_excel(
     outpath: pathlib.Path,
     translation_data: TranslationData,
 ):
+    logging.info(f"Writing Excel {str(outpath)!r}")
     if outpath.exists():
         wb = openpyxl.load_workbook(outpath, data_only=True)
     else:
@@ -155,27 +545,60 @@ def write_translations_to_excel(
         del wb[sheetname]
     ws: openpyxl.worksheet.worksheet.Worksheet = wb.create_sheet(title="translations")
     # Create header row
-    for colnr, colname in enumerate(
-        [
-            "identifier",
-            "translation_status",
-            translation_data.translation_language,
-            translation_data.reference_language,
-        ],
-        start=1,
-    ):
+    for colnr, colname in enumerate(_table_header(translation_data=translation_data), start=1):
         ws.cell(row=1, column=colnr, value=colname)
     # Write translations
-    locids = sorted(translation_data.entries.keys())
-    for rownr, locid in enumerate(locids, start=2):
-        entry = translation_data.entries[locid]
-        status = entry.status.value if entry.status is TranslationStatus.OUTDATED else ""
-        values = [locid, status, entry.translation, entry.reference]
+    for rownr, values in enumerate(_table_rows(translation_data=translation_data), start=2):
         for colnr, value in enumerate(values, start=1):
             cell = ws.cell(row=rownr, column=colnr)
             cell.number_format = openpyxl.styles.numbers.FORMAT_TEXT
             cell.value = value
-    wb.save(outpath)
+    with atomic_replace(outpath) as tmp_path:
+        wb.save(tmp_path)
+
+
+def write_translations_to_csv(
+    outpath: pathlib.Path,
+    translation_data: TranslationData,
+):
+    logging.info(f"Writing delimited table {str(outpath)!r}")
+    dialect = _CSV_DIALECTS[outpath.suffix.lower()]
+    # Write with a BOM, so Excel recognises the file as UTF-8
+    with atomic_replace(outpath) as tmp_path, open(tmp_path, "w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.writer(fh, dialect=dialect)
+        writer.writerow(_table_header(translation_data=translation_data))
+        writer.writerows(_table_rows(translation_data=translation_data))
+
+
+def write_translation_table(
+    outpath: pathlib.Path,
+    translation_data: TranslationData,
+):
+    _, writer = _get_table_format(filepath=outpath)
+    writer(outpath, translation_data)
+
+
+_TABLE_FORMATS: dict[
+    str,
+    tuple[
+        t.Callable[[pathlib.Path], TranslationData],
+        t.Callable[[pathlib.Path, TranslationData], None],
+    ],
+] = {
+    ".xlsx": (parse_translations_from_excel, write_translations_to_excel),
+    ".tsv": (parse_translations_from_csv, write_translations_to_csv),
+    ".csv": (parse_translations_from_csv, write_translations_to_csv),
+}
+
+
+def _get_table_format(filepath: pathlib.Path):
+    try:
+        return _TABLE_FORMATS[filepath.suffix.lower()]
+    except KeyError as e:
+        raise RuntimeError(
+            f"Unsupported translation table format {filepath.suffix!r}, "
+            f"expected one of: {', '.join(_TABLE_FORMATS)}"
+        ) from e
 
 
 def merge_latest_references_into_translations(
@@ -195,11 +618,15 @@ def merge_latest_references_into_translations(
             current_status=current_entry.status,
             prev_reference=current_entry.reference,
             new_reference=latest_reference,
+            outdated_from=current_entry.previous_reference,
         )
+        latest_source = latest_locdata.sources.get(locid)
         updated_translations.entries[locid] = TranslationEntry(
             reference=latest_reference,
             translation=current_entry.translation,
             status=new_status,
+            source=latest_source.name if latest_source else current_entry.source,
+            previous_reference=_retained_previous_reference(new_status=new_status, entry=current_entry),
         )
         if locid not in latest_locdata.entries:
             stats.deleted += 1
@@ -211,7 +638,10 @@ def merge_latest_references_into_translations(
             stats.changed += 1
             logging.debug(f"Changed {locid!r}: {current_entry.reference!r} -> {latest_reference}")
         if new_status != current_entry.status:
-            stats.outdated_translations += 1
+            if new_status is TranslationStatus.OUTDATED:
+                stats.outdated_translations += 1
+            else:
+                stats.restored_translations += 1
     return updated_translations, stats
 
 
@@ -219,16 +649,85 @@ def _determine_status(
     current_status: TranslationStatus,
     prev_reference: Text,
     new_reference: Text,
+    outdated_from: Text,
 ) -> TranslationStatus:
+    # Machine translations stay to be reviewed, becoming outdated would let clearing the status mark them as done
     if current_status is TranslationStatus.DONE:
         if prev_reference == new_reference:
-            return TranslationStatus.DONE
+            return current_status
         else:
             return TranslationStatus.OUTDATED
+    elif current_status is TranslationStatus.OUTDATED and outdated_from and outdated_from == new_reference:
+        # The reference changed back to the one it was translated from, e.g. by a rollback
+        return TranslationStatus.DONE
     else:
         return current_status
 
 
+def _retained_previous_reference(new_status: TranslationStatus, entry: TranslationEntry) -> Text:
+    """The reference an outdated translation was made for, kept from when it first became outdated"""
+    if new_status is not TranslationStatus.OUTDATED:
+        return ""
+    if entry.status is TranslationStatus.OUTDATED:
+        return entry.previous_reference
+    return entry.reference
+
+
+def copy_translation_data(translation_data: TranslationData) -> TranslationData:
+    return TranslationData(
+        reference_language=translation_data.reference_language,
+        translation_language=translation_data.translation_language,
+        entries={locid: dataclasses.replace(entry) for locid, entry in translation_data.entries.items()},
+    )
+
+
+def merge_concurrent_edits(
+    base: TranslationData,
+    ours: TranslationData,
+    theirs: TranslationData,
+) -> tuple[TranslationData, list[LocId]]:
+    """Three-way merge of a table that someone else changed (theirs) since we loaded it (base)
+
+    Translations or statuses only they changed are taken over, with a status updated for our references.
+    When both sides changed a translation differently, ours is kept and the identifier is reported as a conflict.
+    """
+    merged = TranslationData(
+        reference_language=ours.reference_language,
+        translation_language=ours.translation_language,
+        entries=dict(ours.entries),
+    )
+    conflicts = []
+    empty_entry = TranslationEntry("", "", TranslationStatus.MISSING)
+    for locid, their_entry in theirs.entries.items():
+        base_entry = base.entries.get(locid, empty_entry)
+        our_entry = ours.entries.get(locid)
+        if our_entry is None:
+            if locid not in base.entries:
+                merged.entries[locid] = their_entry  # Added by them only
+            continue
+        if (their_entry.translation, their_entry.status) == (base_entry.translation, base_entry.status):
+            continue  # Nothing to take over
+        if our_entry.translation != base_entry.translation and our_entry.translation != their_entry.translation:
+            conflicts.append(locid)
+            continue
+        status = _determine_status(
+            current_status=their_entry.status,
+            prev_reference=their_entry.reference,
+            new_reference=our_entry.reference,
+            outdated_from=their_entry.previous_reference,
+        )
+        merged.entries[locid] = TranslationEntry(
+            reference=our_entry.reference,
+            translation=their_entry.translation,
+            status=status,
+            source=our_entry.source,
+            previous_reference=_retained_previous_reference(new_status=status, entry=their_entry),
+        )
+    if conflicts:
+        logging.warning(f"Kept our translation for {len(conflicts)} rows that were also edited concurrently")
+    return merged, conflicts
+
+
 def get_localisation_from_translations(translation_data: TranslationData) -> LocalisationData:
     locdata = LocalisationData(language=translation_data.translation_language)
     for locid, entry in translation_data.entries.items():
@@ -0,0 +1,128 @@
+import collections
+import csv
+import dataclasses
+import logging
+import pathlib
+
+from .locking import atomic_replace
+from .models import LocId, Text, TranslationData
+
+
+@dataclasses.dataclass
+class GlossaryViolation:
+    identifier: LocId
+    term: str
+    required_translation: str
+
+
+class TermMatcher:
+    """Aho-Corasick automaton, finding all glossary terms in a text in a single pass
+
+    Matching is case-insensitive and only matches whole words.
+    """
+
+    def __init__(self, terms: list[str]):
+        self.terms = [term.casefold() for term in terms]
+        # Each node has its transitions, its failure link and the indices of the terms ending in it
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]
+        for term_index, term in enumerate(self.terms):
+            node = 0
+            for char in term:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(term_index)
+        # Breadth-first, so the failure links of shallower nodes are known
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(char, 0)
+                self._output[next_node] += self._output[self._fail[next_node]]
+
+    def find(self, text: Text) -> set[int]:
+        """Indices of the terms occurring in the text"""
+        text = text.casefold()
+        found = set()
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for term_index in self._output[node]:
+                start = position - len(self.terms[term_index]) + 1
+                if _is_word_boundary(text, start - 1) and _is_word_boundary(text, position + 1):
+                    found.add(term_index)
+        return found
+
+
+def _is_word_boundary(text: Text, position: int) -> bool:
+    return position < 0 or position >= len(text) or not text[position].isalnum()
+
+
+def load_glossary(glossary_path: pathlib.Path) -> dict[str, str]:
+    """Read a glossary of terms and their required translations, from a two-column TSV file with a header"""
+    glossary = {}
+    with open(glossary_path, "r", encoding="utf-8-sig", newline="") as fh:
+        reader = csv.reader(fh, dialect="excel-tab")
+        next(reader, None)  # Skip the header
+        for line_nr, row in enumerate(reader, start=2):
+            if not row or not row[0].strip() or row[0].startswith("#"):
+                continue
+            if len(row) < 2 or not row[1].strip():
+                logging.warning(f"Ignoring glossary term without translation on line {line_nr}: {row[0]!r}")
+                continue
+            glossary[row[0].strip()] = row[1].strip()
+    return glossary
+
+
+def check_glossary(
+    translation_data: TranslationData,
+    glossary: dict[str, str],
+) -> list[GlossaryViolation]:
+    """Find translated rows whose reference contains a term, but whose translation lacks its required translation"""
+    terms = list(glossary)
+    matcher = TermMatcher(terms=terms)
+    required = [glossary[term].casefold() for term in terms]
+    violations = []
+    for locid in sorted(translation_data.entries):
+        entry = translation_data.entries[locid]
+        if not entry.translation or not entry.reference:
+            continue
+        found = matcher.find(entry.reference)
+        if not found:
+            continue
+        translation = entry.translation.casefold()
+        for term_index in sorted(found):
+            if required[term_index] not in translation:
+                violations.append(
+                    GlossaryViolation(
+                        identifier=locid,
+                        term=terms[term_index],
+                        required_translation=glossary[terms[term_index]],
+                    )
+                )
+    return violations
+
+
+def write_glossary_report(
+    outpath: pathlib.Path,
+    violations: list[GlossaryViolation],
+):
+    logging.info(f"Writing glossary report with {len(violations)} violations to {str(outpath)!r}")
+    with atomic_replace(outpath) as tmp_path, open(tmp_path, "w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.writer(fh, dialect="excel-tab")
+        writer.writerow(["identifier", "term", "required_translation"])
+        for violation in violations:
+            writer.writerow([violation.identifier, violation.term, violation.required_translation])
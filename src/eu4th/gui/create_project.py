@@ -1,4 +1,5 @@
 import logging
+import os
 import pathlib
 import tkinter as tk
 import traceback
@@ -6,8 +7,9 @@ from tkinter import messagebox, ttk
 from tkinter.filedialog import askdirectory
 
 from ..commands import reload_localisation_to_tsv
+from ..defines import REFERENCE_CACHE_DIR, TABLE_FILENAMES
 from ..project import Project, add_known_project, save_project
-from .gui_helpers import PlaceholderEntry
+from .gui_helpers import PlaceholderEntry, format_directory_list, parse_directory_list
 
 
 class CreateProject(tk.Toplevel):
@@ -44,7 +46,9 @@ class CreateProject(tk.Toplevel):
         )
         reference_language_entry.grid(row=2, column=1, sticky=(tk.W, tk.E))
 
-        ttk.Label(self, text="Reference text directory").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(self, text=f"Reference text directories (base first, '{os.pathsep}'-separated)").grid(
+            row=3, column=0, sticky=tk.W
+        )
         self.reference_directory = tk.StringVar()
         reference_directory_entry = ttk.Entry(self, width=60, textvariable=self.reference_directory)
         reference_directory_entry.grid(row=3, column=1, sticky=(tk.W, tk.E))
@@ -71,9 +75,16 @@ class CreateProject(tk.Toplevel):
         )
         select_exist_tr_dir_button.grid(row=5, column=2, sticky=tk.W)
 
+        ttk.Label(self, text="Translation table format").grid(row=6, column=0, sticky=tk.W)
+        self.table_format = tk.StringVar(value="xlsx")
+        table_format_combobox = ttk.Combobox(
+            self, state="readonly", values=list(TABLE_FILENAMES), textvariable=self.table_format
+        )
+        table_format_combobox.grid(row=6, column=1, sticky=tk.W)
+
         # Add save button
         save_config_button = ttk.Button(self, text="Finish", command=self._create_project)
-        save_config_button.grid(row=6, column=1, sticky=tk.W)
+        save_config_button.grid(row=7, column=1, sticky=tk.W)
 
         # Add padding to all widgets
         for child in self.winfo_children():
@@ -93,7 +104,12 @@ class CreateProject(tk.Toplevel):
 
     def _select_reference_directory(self):
         reference_directory = askdirectory(mustexist=True)
-        self.reference_directory.set(reference_directory)
+        if not reference_directory:
+            return
+        # Each selection adds a layer on top of the previous ones
+        reference_directories = parse_directory_list(self.reference_directory.get())
+        reference_directories.append(pathlib.Path(reference_directory))
+        self.reference_directory.set(format_directory_list(reference_directories))
 
     def _select_existing_translations(self):
         existing_translations = askdirectory(mustexist=True)
@@ -121,21 +137,32 @@ class CreateProject(tk.Toplevel):
         project = Project(
             project_name=self.project_name.get(),
             project_directory=pathlib.Path(self.project_directory.get()).resolve(),
-            reference_directory=pathlib.Path(self.reference_directory.get()).resolve(),
+            reference_directories=[
+                dirpath.resolve() for dirpath in parse_directory_list(self.reference_directory.get())
+            ],
             reference_language=self.reference_language.get(),
             translation_language=self.translation_language.get(),
             translation_outfile=translations_outfile,
+            table_format=self.table_format.get(),
         )
         save_project(project=project)
         add_known_project(project_directory=project.project_directory)
         try:
             reload_localisation_to_tsv(
-                ref_dir=project.reference_directory,
+                ref_dirs=project.reference_directories,
                 reference_language=project.reference_language,
                 translation_language=project.translation_language,
                 reference_exclude_patterns=project.exclude_references,
                 translation_table=project.translations_table,
+                checkpoint_dir=project.reload_checkpoint_dir,
+                journal_path=project.reference_journal,
+                conflict_report_path=project.conflict_report,
+                layer_cache_dir=REFERENCE_CACHE_DIR,
+                summary_path=project.summary_index,
+                glossary_path=project.glossary,
+                glossary_report_path=project.glossary_report,
                 existing_translations_dir=existing_translations_dir,
+                run_log_path=project.run_log,
             )
         finally:
             messagebox.showinfo(title="Done", message="Project created and data imported")
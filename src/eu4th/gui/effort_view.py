@@ -0,0 +1,87 @@
+import logging
+import pathlib
+import tkinter as tk
+import traceback
+from tkinter import messagebox, ttk
+from tkinter.filedialog import asksaveasfilename
+
+from ..commands import estimate_translation_effort
+from ..effort import EffortEstimate, write_effort_csv
+from ..project import Project
+
+_COLUMNS = {
+    "missing_rows": "Missing rows",
+    "missing_words": "Missing words",
+    "outdated_rows": "Outdated rows",
+    "outdated_changed_words": "Changed words",
+    "words_to_translate": "Words to translate",
+}
+
+
+class EffortView(tk.Toplevel):
+    """The words and characters left to translate, per source file"""
+
+    def __init__(self, master: tk.Tk, project: Project):
+        super().__init__()
+        self.title(f"Effort - {project.project_name}")
+        self.report_callback_exception = self._handle_exception
+        self.project = project
+        self._estimate: EffortEstimate = estimate_translation_effort(
+            translation_table=project.translations_table,
+            cache_path=project.effort_cache,
+            journal_path=project.reference_journal,
+        )
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        ttk.Label(self, text=self._estimate.describe()).grid(column=0, row=0, columnspan=2, sticky=tk.W)
+        sources_view = ttk.Treeview(self, height=20, columns=tuple(_COLUMNS))
+        sources_view.heading("#0", text="Source file")
+        for column, heading in _COLUMNS.items():
+            sources_view.heading(column, text=heading)
+            sources_view.column(column, width=110, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(self, command=sources_view.yview)
+        sources_view.configure(yscrollcommand=scrollbar.set)
+        sources_view.grid(column=0, row=1, sticky=(tk.N, tk.S, tk.W, tk.E))
+        scrollbar.grid(column=1, row=1, sticky=(tk.N, tk.S))
+        # Show the files with the most work remaining first
+        for source, source_effort in sorted(
+            self._estimate.by_source.items(), key=lambda item: -item[1].words_to_translate
+        ):
+            sources_view.insert(
+                parent="",
+                index="end",
+                text=source or "<unknown>",
+                values=tuple(getattr(source_effort, column) for column in _COLUMNS),
+            )
+        export_button = ttk.Button(self, text="Export CSV...", command=self._export_csv)
+        export_button.grid(column=0, row=2, sticky=tk.E)
+
+        for child in self.winfo_children():
+            child.grid_configure(padx=5, pady=5)
+
+        self.transient(master)
+        self.grab_set()
+        master.wait_window(self)
+
+    def _export_csv(self):
+        filename = asksaveasfilename(
+            parent=self,
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            initialdir=self.project.project_directory,
+            initialfile="effort.csv",
+        )
+        if not filename:
+            return
+        write_effort_csv(outpath=pathlib.Path(filename), estimate=self._estimate)
+        messagebox.showinfo(title="Done", message=f"Exported the estimate to {filename!r}")
+
+    def _handle_exception(self, exc, val, tb):
+        logging.exception(val)
+        if isinstance(val, RuntimeError):
+            message = str(val)
+        else:
+            message = traceback.format_exception(exc, val, tb)
+        messagebox.showerror(title="Error", message=message)
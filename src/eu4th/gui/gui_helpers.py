@@ -56,6 +56,14 @@ class PlaceholderEntry(tk.Entry):
             self._has_placeholder = False
 
 
+def format_directory_list(directories: list[pathlib.Path]) -> str:
+    return os.pathsep.join(str(dirpath) for dirpath in directories)
+
+
+def parse_directory_list(raw: str) -> list[pathlib.Path]:
+    return [pathlib.Path(part.strip()) for part in raw.split(os.pathsep) if part.strip()]
+
+
 def open_with_filetype_default(target: pathlib.Path):
     # Based on https://www.reddit.com/r/Tkinter/comments/1d66073/comment/l6vfitz
     if not os.path.exists(target):
@@ -3,11 +3,25 @@ import pathlib
 import tkinter as tk
 import traceback
 from tkinter import messagebox, ttk
+from tkinter.filedialog import asksaveasfilename
 
-from eu4th.commands import flush_to_localisation, reload_localisation_to_tsv
-from eu4th.gui.gui_helpers import open_with_filetype_default
+from eu4th.chunking import ChunkStrategy
+from eu4th.commands import (
+    convert_translation_table,
+    export_localisation_package,
+    flush_to_localisation,
+    prefill_machine_translations,
+    reassemble_translation_table,
+    reload_localisation_to_tsv,
+    split_translation_table,
+)
+from eu4th.defines import MACHINE_TRANSLATION_CACHE, REFERENCE_CACHE_DIR, TABLE_FILENAMES
+from eu4th.gui.effort_view import EffortView
+from eu4th.gui.gui_helpers import format_directory_list, open_with_filetype_default, parse_directory_list
+from eu4th.gui.table_browser import TableBrowser
 
 from ..project import Project, save_project
+from ..summary import load_summary
 
 
 class ProjectView(tk.Toplevel):
@@ -25,21 +39,22 @@ class ProjectView(tk.Toplevel):
         reference_language_entry = ttk.Label(self, width=60, text=self.project.reference_language)
         reference_language_entry.grid(column=1, row=0, sticky=(tk.W, tk.E))
 
-        ttk.Label(self, text="Reference directory").grid(column=0, row=1, sticky=tk.W)
-        self.reference_directory = tk.StringVar(value=str(project.reference_directory))
+        ttk.Label(self, text="Reference directories").grid(column=0, row=1, sticky=tk.W)
+        self.reference_directory = tk.StringVar(value=format_directory_list(project.reference_directories))
         reference_directory_entry = ttk.Entry(self, width=60, textvariable=self.reference_directory)
         reference_directory_entry.grid(column=1, row=1, sticky=(tk.W, tk.E))
         open_reference_directory_button = ttk.Button(
             self,
             text="Open...",
-            command=lambda: open_with_filetype_default(self.reference_directory.get()),
+            command=lambda: open_with_filetype_default(parse_directory_list(self.reference_directory.get())[-1]),
         )
         open_reference_directory_button.grid(column=2, row=1, sticky=tk.W)
         load_localisation_button = ttk.Button(self, text="Load localisations", command=self._load_localisation)
         load_localisation_button.grid(column=3, row=1, sticky=tk.W)
 
         ttk.Label(self, text="Translation table").grid(column=0, row=2, sticky=tk.W)
-        translations_table_entry = ttk.Label(self, text=str(self.project.translations_table))
+        self.translations_table = tk.StringVar(value=str(self.project.translations_table))
+        translations_table_entry = ttk.Label(self, textvariable=self.translations_table)
         translations_table_entry.grid(column=1, row=2, sticky=(tk.W, tk.E))
         open_translations_button = ttk.Button(
             self,
@@ -47,6 +62,17 @@ class ProjectView(tk.Toplevel):
             command=lambda: open_with_filetype_default(self.project.translations_table),
         )
         open_translations_button.grid(column=2, row=2, sticky=tk.W)
+        self.table_format = tk.StringVar(value=self.project.table_format)
+        table_format_combobox = ttk.Combobox(
+            self, state="readonly", width=6, values=list(TABLE_FILENAMES), textvariable=self.table_format
+        )
+        table_format_combobox.grid(column=3, row=2, sticky=tk.W)
+        browse_translations_button = ttk.Button(
+            self,
+            text="Browse...",
+            command=self._browse_translations,
+        )
+        browse_translations_button.grid(column=4, row=2, sticky=tk.W)
 
         ttk.Label(self, text="Translation language").grid(column=0, row=3, sticky=tk.W)
         translation_language_entry = ttk.Label(self, width=60, text=self.project.translation_language)
@@ -66,10 +92,58 @@ class ProjectView(tk.Toplevel):
         open_translation_outfile_button.grid(column=2, row=4, sticky=tk.W)
         flush_translations_button = ttk.Button(self, text="Flush translations", command=self._flush_translations)
         flush_translations_button.grid(column=3, row=4, sticky=tk.W)
+        export_package_button = ttk.Button(self, text="Export mod...", command=self._export_package)
+        export_package_button.grid(column=4, row=4, sticky=tk.W)
+
+        ttk.Label(self, text="Machine translation URL (optional)").grid(column=0, row=5, sticky=tk.W)
+        self.machine_translation_url = tk.StringVar(value=project.machine_translation_url or "")
+        machine_translation_url_entry = ttk.Entry(self, width=60, textvariable=self.machine_translation_url)
+        machine_translation_url_entry.grid(column=1, row=5, sticky=(tk.W, tk.E))
+        prefill_button = ttk.Button(self, text="Pre-fill missing", command=self._prefill_machine_translations)
+        prefill_button.grid(column=3, row=5, sticky=tk.W)
+
+        ttk.Label(self, text="Reference version label (optional)").grid(column=0, row=6, sticky=tk.W)
+        self.version_label = tk.StringVar()
+        version_label_entry = ttk.Entry(self, width=60, textvariable=self.version_label)
+        version_label_entry.grid(column=1, row=6, sticky=(tk.W, tk.E))
+
+        ttk.Label(self, text="Split table for translators by").grid(column=0, row=7, sticky=tk.W)
+        self.chunk_strategy = tk.StringVar(value=ChunkStrategy.SOURCE.value)
+        chunk_strategy_combobox = ttk.Combobox(
+            self,
+            state="readonly",
+            width=10,
+            values=[strategy.value for strategy in ChunkStrategy],
+            textvariable=self.chunk_strategy,
+        )
+        chunk_strategy_combobox.grid(column=1, row=7, sticky=tk.W)
+        split_button = ttk.Button(self, text="Split", command=self._split_translations)
+        split_button.grid(column=2, row=7, sticky=tk.W)
+        reassemble_button = ttk.Button(self, text="Reassemble", command=self._reassemble_translations)
+        reassemble_button.grid(column=3, row=7, sticky=tk.W)
 
         # Add the update config button
         update_config_button = ttk.Button(self, text="Save configuration changes", command=self._update_config)
-        update_config_button.grid(column=1, row=5, sticky=tk.W)
+        update_config_button.grid(column=1, row=8, sticky=tk.W)
+
+        # Add the progress overview, read from the summary index
+        ttk.Label(self, text="Progress").grid(column=0, row=9, sticky=tk.W)
+        self.progress = tk.StringVar()
+        progress_label = ttk.Label(self, textvariable=self.progress)
+        progress_label.grid(column=1, row=9, columnspan=3, sticky=(tk.W, tk.E))
+        effort_button = ttk.Button(self, text="Effort...", command=self._show_effort)
+        effort_button.grid(column=4, row=9, sticky=tk.W)
+        self._sources_view = ttk.Treeview(
+            self,
+            height=8,
+            columns=("done", "machine", "outdated", "missing", "words_remaining"),
+        )
+        self._sources_view.heading("#0", text="Source file")
+        for column in ("done", "machine", "outdated", "missing", "words_remaining"):
+            self._sources_view.heading(column, text=column.replace("_", " ").capitalize())
+            self._sources_view.column(column, width=90, anchor=tk.E)
+        self._sources_view.grid(column=0, row=10, columnspan=4, sticky=(tk.W, tk.E))
+        self._refresh_progress()
 
         # Add padding to all widgets
         for child in self.winfo_children():
@@ -84,19 +158,41 @@ class ProjectView(tk.Toplevel):
         master.wait_window(self)
 
     def _update_config(self):
-        self.project.reference_directory = pathlib.Path(self.reference_directory.get())
+        self.project.reference_directories = parse_directory_list(self.reference_directory.get())
         self.project.translation_outfile = pathlib.Path(self.translation_outfile.get())
+        self.project.machine_translation_url = self.machine_translation_url.get() or None
+        message = "Configuration saved"
+        if self.table_format.get() != self.project.table_format:
+            previous_table = self.project.translations_table
+            new_table = self.project.project_directory / TABLE_FILENAMES[self.table_format.get()]
+            if previous_table.exists():
+                message += "\n" + convert_translation_table(
+                    source_table=previous_table,
+                    target_table=new_table,
+                )
+            self.project.table_format = self.table_format.get()
+            self.translations_table.set(str(self.project.translations_table))
         save_project(project=self.project)
-        messagebox.showinfo(title="Done", message="Configuration saved")
+        messagebox.showinfo(title="Done", message=message)
 
     def _load_localisation(self):
         feedback = reload_localisation_to_tsv(
-            ref_dir=pathlib.Path(self.reference_directory.get()),
+            ref_dirs=parse_directory_list(self.reference_directory.get()),
             reference_language=self.project.reference_language,
             translation_language=self.project.translation_language,
             reference_exclude_patterns=self.project.exclude_references,
             translation_table=self.project.translations_table,
+            checkpoint_dir=self.project.reload_checkpoint_dir,
+            journal_path=self.project.reference_journal,
+            conflict_report_path=self.project.conflict_report,
+            layer_cache_dir=REFERENCE_CACHE_DIR,
+            version_label=self.version_label.get() or None,
+            summary_path=self.project.summary_index,
+            glossary_path=self.project.glossary,
+            glossary_report_path=self.project.glossary_report,
+            run_log_path=self.project.run_log,
         )
+        self._refresh_progress()
         messagebox.showinfo(title="Results", message=feedback)
 
     def _flush_translations(self):
@@ -105,9 +201,90 @@ class ProjectView(tk.Toplevel):
         feedback = flush_to_localisation(
             translation_table=self.project.translations_table,
             translation_outfile=pathlib.Path(self.translation_outfile.get()),
+            summary_path=self.project.summary_index,
+            glossary_path=self.project.glossary,
+            glossary_report_path=self.project.glossary_report,
+            chunk_dir=self.project.chunk_directory,
+            run_log_path=self.project.run_log,
         )
+        self._refresh_progress()
         messagebox.showinfo(title="Results", message=feedback)
 
+    def _export_package(self):
+        filename = asksaveasfilename(
+            parent=self,
+            defaultextension=".zip",
+            filetypes=[("Zip files", "*.zip")],
+            initialdir=self.project.project_directory,
+            initialfile=f"{self.project.package_file_stem}.zip",
+        )
+        if not filename:
+            return
+        feedback = export_localisation_package(
+            translation_table=self.project.translations_table,
+            outpath=pathlib.Path(filename),
+            file_stem=self.project.package_file_stem,
+            ref_dirs=self.project.reference_directories,
+            reference_language=self.project.reference_language,
+            reference_exclude_patterns=self.project.exclude_references,
+            layer_cache_dir=REFERENCE_CACHE_DIR,
+            chunk_dir=self.project.chunk_directory,
+        )
+        self._refresh_progress()
+        messagebox.showinfo(title="Results", message=feedback)
+
+    def _split_translations(self):
+        feedback = split_translation_table(
+            translation_table=self.project.translations_table,
+            chunk_dir=self.project.chunk_directory,
+            strategy=ChunkStrategy(self.chunk_strategy.get()),
+        )
+        messagebox.showinfo(title="Results", message=feedback)
+
+    def _reassemble_translations(self):
+        feedback = reassemble_translation_table(
+            translation_table=self.project.translations_table,
+            chunk_dir=self.project.chunk_directory,
+            summary_path=self.project.summary_index,
+        )
+        self._refresh_progress()
+        messagebox.showinfo(title="Results", message=feedback)
+
+    def _prefill_machine_translations(self):
+        if not self.machine_translation_url.get():
+            raise RuntimeError("Enter a machine translation URL first")
+        feedback = prefill_machine_translations(
+            translation_table=self.project.translations_table,
+            backend_url=self.machine_translation_url.get(),
+            cache_path=MACHINE_TRANSLATION_CACHE,
+            summary_path=self.project.summary_index,
+        )
+        self._refresh_progress()
+        messagebox.showinfo(title="Results", message=feedback)
+
+    def _browse_translations(self):
+        TableBrowser(master=self, project=self.project)
+        self._refresh_progress()
+
+    def _show_effort(self):
+        EffortView(master=self, project=self.project)
+
+    def _refresh_progress(self):
+        self._sources_view.delete(*self._sources_view.get_children())
+        summary = load_summary(summary_path=self.project.summary_index)
+        if summary is None:
+            self.progress.set("Unknown, load localisations or flush translations first")
+            return
+        self.progress.set(f"{summary.describe()} (as of {summary.updated})")
+        # Show the files with the most work remaining first
+        for source, counts in sorted(summary.by_source.items(), key=lambda item: -item[1].words_remaining):
+            self._sources_view.insert(
+                parent="",
+                index="end",
+                text=source or "<unknown>",
+                values=(counts.done, counts.machine, counts.outdated, counts.missing, counts.words_remaining),
+            )
+
     def _handle_exception(self, exc, val, tb):
         logging.exception(val)
         if isinstance(val, RuntimeError):
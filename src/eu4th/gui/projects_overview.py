@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 
 from ..project import load_known_projects, load_project, remove_known_project
+from ..summary import load_summary
 from .create_project import CreateProject
 from .import_project import ImportProject
 from .project_view import ProjectView
@@ -16,7 +17,9 @@ class ProjectsOverview(ttk.Frame):
 
         # Create the projects listbox
         scrollbar = ttk.Scrollbar(self)
-        self._listbox = ttk.Treeview(self, yscrollcommand=scrollbar.set, show="tree")
+        self._listbox = ttk.Treeview(self, yscrollcommand=scrollbar.set, columns=("progress",))
+        self._listbox.heading("#0", text="Project")
+        self._listbox.heading("progress", text="Progress")
         scrollbar.configure(command=self._listbox.yview)
         self._listbox.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
 
@@ -84,11 +87,13 @@ class ProjectsOverview(ttk.Frame):
         known_projects = load_known_projects()
         for project_directory in known_projects.project_directories:
             project = load_project(project_directory=project_directory)
+            summary = load_summary(summary_path=project.summary_index)
             self._listbox.insert(
                 parent="",
                 index="end",
                 id=project.project_directory,
                 text=project.project_name,
+                values=(summary.describe() if summary else "",),
             )
 
     def _create_new(self):
@@ -106,6 +111,7 @@ class ProjectsOverview(ttk.Frame):
         logging.debug(f"Selected item id: {selected_item_id!r}")
         project = load_project(project_directory=pathlib.Path(selected_item_id))
         ProjectView(master=self.master, project=project)
+        self._refresh_projects()
 
     def _remove_project(self):
         selected_item_id = self._listbox.focus()
@@ -0,0 +1,194 @@
+import logging
+import tkinter as tk
+import traceback
+from tkinter import messagebox, ttk
+
+from ..commands import save_table_edits
+from ..models import TranslationStatus
+from ..project import Project
+from ..reference_diff import format_word_diff
+from ..search_index import SearchIndex, open_search_index
+
+_VISIBLE_ROWS = 30
+_ALL_STATUSES = "all"
+
+
+class TableBrowser(tk.Toplevel):
+    """Browse, search and edit the translation table
+
+    Only the visible rows are materialised, the scrollbar moves a window over the search results.
+    """
+
+    def __init__(self, master: tk.Tk, project: Project):
+        super().__init__()
+        self.title(f"Translations - {project.project_name}")
+        self.report_callback_exception = self._handle_exception
+        self.protocol("WM_DELETE_WINDOW", self._close)
+        self.project = project
+        self._index: SearchIndex = open_search_index(
+            index_path=project.search_index,
+            translation_table=project.translations_table,
+        )
+        self._results: list[int] = []
+        self._offset = 0
+
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        # Create the search bar
+        ttk.Label(self, text="Search").grid(column=0, row=0, sticky=tk.W)
+        self.search_text = tk.StringVar()
+        self.search_text.trace_add("write", lambda x, y, z: self._search())
+        search_entry = ttk.Entry(self, width=60, textvariable=self.search_text)
+        search_entry.grid(column=1, row=0, sticky=(tk.W, tk.E))
+        self.status_filter = tk.StringVar(value=_ALL_STATUSES)
+        status_combobox = ttk.Combobox(
+            self,
+            state="readonly",
+            width=10,
+            values=[_ALL_STATUSES, *(status.value for status in TranslationStatus)],
+            textvariable=self.status_filter,
+        )
+        status_combobox.bind("<<ComboboxSelected>>", lambda event: self._search())
+        status_combobox.grid(column=2, row=0, sticky=tk.W)
+
+        # Create the rows view, with a scrollbar over the results instead of over the view
+        self._rows_view = ttk.Treeview(
+            self,
+            height=_VISIBLE_ROWS,
+            columns=("status", "translation", "reference", "changes"),
+        )
+        self._rows_view.heading("#0", text="Identifier")
+        self._rows_view.heading("status", text="Status")
+        self._rows_view.heading("translation", text=project.translation_language)
+        self._rows_view.heading("reference", text=project.reference_language)
+        self._rows_view.heading("changes", text="Reference changes")
+        self._rows_view.column("status", width=80, stretch=False)
+        self._rows_view.grid(column=0, row=1, columnspan=3, sticky=(tk.N, tk.S, tk.W, tk.E))
+        self._rows_view.bind("<Double-1>", lambda event: self._edit_selected())
+        self._rows_view.bind("<MouseWheel>", lambda event: self._scroll(-1 if event.delta > 0 else 1, "units"))
+        self._rows_view.bind("<Button-4>", lambda event: self._scroll(-1, "units"))
+        self._rows_view.bind("<Button-5>", lambda event: self._scroll(1, "units"))
+        self._scrollbar = ttk.Scrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.grid(column=3, row=1, sticky=(tk.N, tk.S))
+
+        # Add the status line and save button
+        self.result_info = tk.StringVar()
+        ttk.Label(self, textvariable=self.result_info).grid(column=0, row=2, columnspan=2, sticky=tk.W)
+        save_button = ttk.Button(self, text="Save edits to table", command=self._save_edits)
+        save_button.grid(column=2, row=2, sticky=tk.E)
+
+        for child in self.winfo_children():
+            child.grid_configure(padx=5, pady=5)
+
+        self._search()
+        search_entry.focus()
+        self.transient(master)
+        self.grab_set()
+        master.wait_window(self)
+
+    def _search(self):
+        statuses = None
+        if self.status_filter.get() != _ALL_STATUSES:
+            statuses = [TranslationStatus(self.status_filter.get())]
+        self._results = self._index.search(text=self.search_text.get(), statuses=statuses)
+        self._offset = 0
+        self._render()
+
+    def _render(self):
+        self._rows_view.delete(*self._rows_view.get_children())
+        visible = self._results[self._offset : self._offset + _VISIBLE_ROWS]
+        for identifier, entry in self._index.fetch(rowids=visible):
+            # Only outdated rows keep their previous reference, the diff is computed when the row is shown
+            changes = format_word_diff(entry.previous_reference, entry.reference) if entry.previous_reference else ""
+            self._rows_view.insert(
+                parent="",
+                index="end",
+                iid=identifier,
+                text=identifier,
+                values=(entry.status.value, entry.translation, entry.reference, changes),
+            )
+        total = len(self._results)
+        if total:
+            self._scrollbar.set(self._offset / total, min(1.0, (self._offset + _VISIBLE_ROWS) / total))
+        else:
+            self._scrollbar.set(0.0, 1.0)
+        pending = len(self._index.pending_edits())
+        self.result_info.set(f"{total} rows" + (f", {pending} unsaved edits" if pending else ""))
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str | None = None):
+        if action == "moveto":
+            self._set_offset(int(float(amount) * len(self._results)))
+        else:
+            self._scroll(int(amount), unit)
+
+    def _scroll(self, amount: int, unit: str):
+        step = _VISIBLE_ROWS if unit == "pages" else 1
+        self._set_offset(self._offset + amount * step)
+
+    def _set_offset(self, offset: int):
+        self._offset = max(0, min(offset, len(self._results) - _VISIBLE_ROWS))
+        self._render()
+
+    def _edit_selected(self):
+        identifier = self._rows_view.focus()
+        if not identifier:
+            return
+        status, translation, reference, changes = self._rows_view.item(identifier, "values")
+        editor = tk.Toplevel(self)
+        editor.title(identifier)
+        editor.columnconfigure(0, weight=1)
+        ttk.Label(editor, text=self.project.reference_language).grid(column=0, row=0, sticky=tk.W)
+        reference_text = tk.Text(editor, height=4, width=80, wrap=tk.WORD)
+        reference_text.insert("1.0", reference)
+        reference_text.configure(state=tk.DISABLED)
+        reference_text.grid(column=0, row=1, sticky=(tk.W, tk.E))
+        row = 2
+        if changes:
+            ttk.Label(editor, text="Changes since translated").grid(column=0, row=row, sticky=tk.W)
+            changes_text = tk.Text(editor, height=4, width=80, wrap=tk.WORD)
+            changes_text.insert("1.0", changes)
+            changes_text.configure(state=tk.DISABLED)
+            changes_text.grid(column=0, row=row + 1, sticky=(tk.W, tk.E))
+            row += 2
+        ttk.Label(editor, text=f"{self.project.translation_language} ({status})").grid(column=0, row=row, sticky=tk.W)
+        translation_text = tk.Text(editor, height=4, width=80, wrap=tk.WORD)
+        translation_text.insert("1.0", translation)
+        translation_text.grid(column=0, row=row + 1, sticky=(tk.W, tk.E))
+
+        def _apply():
+            self._index.edit_translation(identifier=identifier, translation=translation_text.get("1.0", "end-1c"))
+            editor.destroy()
+            self._render()
+
+        ttk.Button(editor, text="Apply", command=_apply).grid(column=0, row=row + 2, sticky=tk.E)
+        for child in editor.winfo_children():
+            child.grid_configure(padx=5, pady=5)
+        translation_text.focus()
+        editor.transient(self)
+        editor.grab_set()
+
+    def _save_edits(self):
+        feedback = save_table_edits(
+            index=self._index,
+            translation_table=self.project.translations_table,
+            summary_path=self.project.summary_index,
+        )
+        self._render()
+        messagebox.showinfo(title="Results", message=feedback, parent=self)
+
+    def _close(self):
+        if self._index.pending_edits() and messagebox.askyesno(
+            title="Unsaved edits", message="Save the edits to the translation table?", parent=self
+        ):
+            self._save_edits()
+        self._index.close()
+        self.destroy()
+
+    def _handle_exception(self, exc, val, tb):
+        logging.exception(val)
+        if isinstance(val, RuntimeError):
+            message = str(val)
+        else:
+            message = traceback.format_exception(exc, val, tb)
+        messagebox.showerror(title="Error", message=message)
@@ -0,0 +1,182 @@
+import contextlib
+import dataclasses
+import datetime
+import hashlib
+import logging
+import pathlib
+import sqlite3
+import typing as t
+
+from .models import LangId, LocalisationData, LocId, Text
+
+# Texts are stored once by content hash, each version only stores the identifiers that changed.
+# The 'head' table caches the latest hash per identifier, so recording a new version needs no replay.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    label TEXT,
+    language TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    identifier TEXT NOT NULL,
+    version INTEGER NOT NULL REFERENCES versions (version),
+    hash TEXT REFERENCES blobs (hash),
+    PRIMARY KEY (identifier, version)
+);
+CREATE INDEX IF NOT EXISTS changes_by_version ON changes (version);
+CREATE TABLE IF NOT EXISTS head (
+    identifier TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+"""
+
+
+@dataclasses.dataclass
+class JournalVersion:
+    version: int
+    label: str | None
+    language: LangId
+    created: str
+
+
+@dataclasses.dataclass
+class ReferenceChange:
+    identifier: LocId
+    previous: Text | None
+    current: Text | None
+
+
+@dataclasses.dataclass
+class HistoryEntry:
+    version: JournalVersion
+    text: Text | None  # None if the identifier was deleted in this version
+
+
+@contextlib.contextmanager
+def _open_journal(journal_path: pathlib.Path) -> t.Iterator[sqlite3.Connection]:
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(journal_path)
+    try:
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _text_hash(text: Text) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def record_reference_snapshot(
+    journal_path: pathlib.Path,
+    locdata: LocalisationData,
+    label: str | None = None,
+) -> JournalVersion | None:
+    """Append the references as a new version, storing only what changed since the previous one
+
+    Returns None without adding a version if nothing changed.
+    """
+    logging.info(f"Recording reference snapshot in journal {str(journal_path)!r}")
+    hashes = {locid: _text_hash(text) for locid, text in locdata.entries.items()}
+    with _open_journal(journal_path) as conn:
+        head = dict(conn.execute("SELECT identifier, hash FROM head"))
+        changed = [(locid, text_hash) for locid, text_hash in hashes.items() if head.get(locid) != text_hash]
+        deleted = [locid for locid in head.keys() - hashes.keys()]
+        if not changed and not deleted:
+            logging.info("No reference changes to record")
+            return None
+        created = datetime.datetime.now().isoformat(timespec="seconds")
+        cursor = conn.execute(
+            "INSERT INTO versions (label, language, created) VALUES (?, ?, ?)",
+            (label, locdata.language, created),
+        )
+        version = cursor.lastrowid
+        conn.executemany(
+            "INSERT OR IGNORE INTO blobs (hash, text) VALUES (?, ?)",
+            ((text_hash, locdata.entries[locid]) for locid, text_hash in changed),
+        )
+        conn.executemany(
+            "INSERT INTO changes (identifier, version, hash) VALUES (?, ?, ?)",
+            [(locid, version, text_hash) for locid, text_hash in changed]
+            + [(locid, version, None) for locid in deleted],
+        )
+        conn.executemany("INSERT OR REPLACE INTO head (identifier, hash) VALUES (?, ?)", changed)
+        conn.executemany("DELETE FROM head WHERE identifier = ?", ((locid,) for locid in deleted))
+    logging.info(f"Recorded reference version {version}: {len(changed)} added or changed, {len(deleted)} deleted")
+    return JournalVersion(version=version, label=label, language=locdata.language, created=created)
+
+
+def list_versions(journal_path: pathlib.Path) -> list[JournalVersion]:
+    with _open_journal(journal_path) as conn:
+        rows = conn.execute("SELECT version, label, language, created FROM versions ORDER BY version").fetchall()
+    return [JournalVersion(*row) for row in rows]
+
+
+def find_version(journal_path: pathlib.Path, version_or_label: str) -> JournalVersion:
+    """Find a version by its number or its label, the most recent version wins for duplicate labels"""
+    for version in reversed(list_versions(journal_path=journal_path)):
+        if version_or_label in (str(version.version), version.label):
+            return version
+    raise RuntimeError(f"No reference version {version_or_label!r} in journal {str(journal_path)!r}")
+
+
+def get_version_changes(journal_path: pathlib.Path, version: int) -> list[ReferenceChange]:
+    with _open_journal(journal_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT c.identifier, prev_blob.text, cur_blob.text
+            FROM changes c
+            LEFT JOIN blobs cur_blob ON cur_blob.hash = c.hash
+            LEFT JOIN blobs prev_blob ON prev_blob.hash = (
+                SELECT p.hash FROM changes p
+                WHERE p.identifier = c.identifier AND p.version < c.version
+                ORDER BY p.version DESC LIMIT 1
+            )
+            WHERE c.version = ?
+            ORDER BY c.identifier
+            """,
+            (version,),
+        ).fetchall()
+    return [ReferenceChange(identifier=identifier, previous=prev, current=cur) for identifier, prev, cur in rows]
+
+
+def get_identifier_history(journal_path: pathlib.Path, identifier: LocId) -> list[HistoryEntry]:
+    with _open_journal(journal_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT v.version, v.label, v.language, v.created, b.text
+            FROM changes c
+            JOIN versions v ON v.version = c.version
+            LEFT JOIN blobs b ON b.hash = c.hash
+            WHERE c.identifier = ?
+            ORDER BY c.version
+            """,
+            (identifier,),
+        ).fetchall()
+    return [HistoryEntry(version=JournalVersion(*row[:4]), text=row[4]) for row in rows]
+
+
+def get_references_at(journal_path: pathlib.Path, version: int) -> LocalisationData:
+    with _open_journal(journal_path) as conn:
+        language_row = conn.execute("SELECT language FROM versions WHERE version = ?", (version,)).fetchone()
+        if language_row is None:
+            raise RuntimeError(f"No reference version {version} in journal {str(journal_path)!r}")
+        # SQLite takes the bare columns from the row holding the maximum
+        rows = conn.execute(
+            """
+            SELECT c.identifier, b.text, MAX(c.version)
+            FROM changes c
+            LEFT JOIN blobs b ON b.hash = c.hash
+            WHERE c.version <= ?
+            GROUP BY c.identifier
+            """,
+            (version,),
+        )
+        entries = {identifier: text for identifier, text, _ in rows if text is not None}
+    return LocalisationData(language=language_row[0], entries=entries)
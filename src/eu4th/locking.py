@@ -0,0 +1,101 @@
+import contextlib
+import logging
+import os
+import pathlib
+import socket
+import time
+import typing as t
+
+_LOCK_POLL_INITIAL = 0.02
+_LOCK_POLL_MAX = 0.5
+
+
+@contextlib.contextmanager
+def file_lock(
+    target: pathlib.Path,
+    timeout: float = 60,
+    stale_after: float = 600,
+) -> t.Iterator[None]:
+    """Advisory lock on a file, shared with other processes and machines through a lock file next to it
+
+    The lock file is created exclusively, which also works on network drives.
+    A lock file older than `stale_after` seconds is assumed to be left behind by a crashed process, and is broken.
+    Hold the lock only for the short check-and-replace step, not while preparing or writing the file.
+    """
+    lock_path = target.with_name(target.name + ".lock")
+    deadline = time.monotonic() + timeout
+    poll = _LOCK_POLL_INITIAL
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _is_stale(lock_path=lock_path, stale_after=stale_after):
+                _break_stale_lock(lock_path=lock_path, stale_after=stale_after)
+                continue
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{_describe_holder(lock_path)} is still writing {target.name!r}, try again later")
+            time.sleep(poll)
+            poll = min(poll * 2, _LOCK_POLL_MAX)
+            continue
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(f"{socket.gethostname()} {os.getpid()}")
+        break
+    try:
+        yield
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+
+def _is_stale(lock_path: pathlib.Path, stale_after: float) -> bool:
+    try:
+        return time.time() - lock_path.stat().st_mtime > stale_after
+    except FileNotFoundError:
+        return False
+
+
+def _break_stale_lock(lock_path: pathlib.Path, stale_after: float):
+    """Move the lock file away before removing it, so of several processes breaking it at once only one can
+
+    Removing it by path could remove the fresh lock another process created after it was broken.
+    """
+    broken_path = lock_path.with_name(f"{lock_path.name}.{socket.gethostname()}.{os.getpid()}.broken")
+    try:
+        os.rename(lock_path, broken_path)
+    except FileNotFoundError:
+        return  # Broken by another process
+    if _is_stale(lock_path=broken_path, stale_after=stale_after):
+        logging.warning(f"Broke stale lock {str(lock_path)!r}")
+        broken_path.unlink(missing_ok=True)
+        return
+    # Another process broke the stale lock and took it just before it was moved away, give it back
+    try:
+        os.rename(broken_path, lock_path)
+    except OSError:
+        broken_path.unlink(missing_ok=True)
+
+
+def _describe_holder(lock_path: pathlib.Path) -> str:
+    try:
+        holder = lock_path.read_text(encoding="utf-8").strip()
+    except IOError:
+        holder = ""
+    return f"Another process ({holder})" if holder else "Another process"
+
+
+@contextlib.contextmanager
+def atomic_replace(target: pathlib.Path) -> t.Iterator[pathlib.Path]:
+    """Yield a temporary path to write to, which replaces the target only once writing succeeded
+
+    Readers never see a partially written file, and a failed write leaves the target untouched.
+    """
+    tmp_path = target.with_name(f".{target.name}.{socket.gethostname()}.{os.getpid()}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def staging_path(target: pathlib.Path) -> pathlib.Path:
+    """A path next to the target to prepare its replacement in, with the same suffix so the file format is kept"""
+    return target.with_name(f".{target.stem}.{socket.gethostname()}.{os.getpid()}.staged{target.suffix}")
@@ -0,0 +1,186 @@
+import concurrent.futures
+import contextlib
+import hashlib
+import json
+import logging
+import pathlib
+import re
+import sqlite3
+import typing as t
+import urllib.error
+import urllib.request
+
+from .models import LangId, Text, TranslationData, TranslationStatus
+from .tokens import PROTECTED_TOKEN_RE
+
+_PLACEHOLDER_RE = re.compile(r"⟦(\d+)⟧")
+
+# The language identifiers of the game, and their ISO 639-1 codes
+LANGUAGE_CODES = {
+    "english": "en",
+    "french": "fr",
+    "german": "de",
+    "spanish": "es",
+    "braz_por": "pt",
+    "polish": "pl",
+    "russian": "ru",
+    "simp_chinese": "zh",
+    "japanese": "ja",
+    "korean": "ko",
+}
+
+
+class TranslationBackend(t.Protocol):
+    def translate(self, texts: list[Text], source_language: LangId, target_language: LangId) -> list[Text]: ...
+
+
+class HttpTranslationBackend:
+    """Backend for a local translation server with a LibreTranslate-compatible API"""
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url
+        self.timeout = timeout
+
+    def translate(self, texts: list[Text], source_language: LangId, target_language: LangId) -> list[Text]:
+        payload = {
+            "q": texts,
+            "source": LANGUAGE_CODES.get(source_language, source_language),
+            "target": LANGUAGE_CODES.get(target_language, target_language),
+            "format": "text",
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content = json.load(response)
+        except urllib.error.HTTPError as e:
+            # Like a rate limit, the server explains the error in the body
+            raise RuntimeError(
+                f"Machine translation request to {self.url!r} failed: {e}"
+                f"{_describe_server_error(e.read().decode('utf-8', errors='replace'))}"
+            ) from e
+        except (urllib.error.URLError, json.JSONDecodeError) as e:
+            raise RuntimeError(f"Machine translation request to {self.url!r} failed: {e}") from e
+        translations = content.get("translatedText") if isinstance(content, dict) else None
+        if not isinstance(translations, list):
+            raise RuntimeError(
+                f"Machine translation request to {self.url!r} failed{_describe_server_error(json.dumps(content))}"
+            )
+        if len(translations) != len(texts):
+            raise RuntimeError(f"Machine translation returned {len(translations)} results for {len(texts)} texts")
+        return translations
+
+
+def _describe_server_error(body: str) -> str:
+    try:
+        content = json.loads(body)
+    except json.JSONDecodeError:
+        content = None
+    if isinstance(content, dict) and "error" in content:
+        return f": {content['error']}"
+    return f": {body.strip()[:200]}" if body.strip() else ""
+
+
+def mask_tokens(text: Text) -> tuple[Text, list[str]]:
+    tokens = []
+
+    def _replace(match: re.Match) -> str:
+        tokens.append(match.group(0))
+        return f"⟦{len(tokens) - 1}⟧"
+
+    return PROTECTED_TOKEN_RE.sub(_replace, text), tokens
+
+
+def unmask_tokens(text: Text, tokens: list[str]) -> Text | None:
+    """Restore the masked tokens, or return None if the translation lost or invented any"""
+    found = [int(raw) for raw in _PLACEHOLDER_RE.findall(text)]
+    if sorted(found) != list(range(len(tokens))):
+        return None
+    return _PLACEHOLDER_RE.sub(lambda match: tokens[int(match.group(1))], text)
+
+
+@contextlib.contextmanager
+def _open_cache(cache_path: pathlib.Path) -> t.Iterator[sqlite3.Connection]:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, translation TEXT NOT NULL)")
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _cache_key(text: Text, source_language: LangId, target_language: LangId) -> str:
+    return hashlib.sha1(f"{source_language}\0{target_language}\0{text}".encode("utf-8")).hexdigest()
+
+
+def prefill_translations(
+    translation_data: TranslationData,
+    backend: TranslationBackend,
+    cache_path: pathlib.Path,
+    batch_size: int = 32,
+    max_workers: int = 4,
+) -> int:
+    """Fill the missing translations with machine translations, marking them for review
+
+    Each distinct reference text is translated once, and results are cached across runs.
+    Returns the number of pre-filled rows.
+    """
+    source_language = translation_data.reference_language
+    target_language = translation_data.translation_language
+    rows_by_text: dict[Text, list[str]] = {}
+    for locid, entry in translation_data.entries.items():
+        if entry.status is TranslationStatus.MISSING and entry.reference and not entry.translation:
+            rows_by_text.setdefault(entry.reference, []).append(locid)
+    if not rows_by_text:
+        return 0
+    with _open_cache(cache_path) as conn:
+        # Look up cached results first
+        keys = {text: _cache_key(text, source_language, target_language) for text in rows_by_text}
+        results: dict[Text, Text] = {}
+        for text, key in keys.items():
+            row = conn.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                results[text] = row[0]
+        todo = [text for text in rows_by_text if text not in results]
+        logging.info(f"Machine translating {len(todo)} texts, {len(results)} found in cache")
+        # Translate the rest in concurrent batches, storing each batch as soon as it completes
+        masked = {text: mask_tokens(text) for text in todo}
+        batches = [todo[i : i + batch_size] for i in range(0, len(todo), batch_size)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    backend.translate,
+                    [masked[text][0] for text in batch],
+                    source_language,
+                    target_language,
+                ): batch
+                for batch in batches
+            }
+            for future in concurrent.futures.as_completed(futures):
+                batch = futures[future]
+                for text, raw_translation in zip(batch, future.result()):
+                    translation = unmask_tokens(raw_translation, masked[text][1])
+                    if translation is None:
+                        logging.warning(f"Discarding machine translation with damaged tokens: {raw_translation!r}")
+                        continue
+                    results[text] = translation
+                    conn.execute(
+                        "INSERT OR REPLACE INTO translations (key, translation) VALUES (?, ?)",
+                        (keys[text], translation),
+                    )
+                conn.commit()
+    prefilled = 0
+    for text, locids in rows_by_text.items():
+        if text not in results:
+            continue
+        for locid in locids:
+            entry = translation_data.entries[locid]
+            entry.translation = results[text]
+            entry.status = TranslationStatus.MACHINE
+            prefilled += 1
+    return prefilled
@@ -22,12 +22,18 @@ class LocFile:
     sourcefile: pathlib.Path
     language: LangId
     lines: list[LocLine]
+    problem: str | None = None  # Why the file could not be read, it is quarantined rather than parsed
 
 
 @dataclasses.dataclass
 class LocalisationData:
     language: LangId
     entries: dict[LocId, Text] = dataclasses.field(default_factory=dict)
+    # Source file of each used definition, and of the duplicate definitions that were ignored
+    sources: dict[LocId, pathlib.Path] = dataclasses.field(default_factory=dict)
+    overridden: dict[LocId, list[pathlib.Path]] = dataclasses.field(default_factory=dict)
+    # Files that could not be read, with the reason
+    quarantined: dict[pathlib.Path, str] = dataclasses.field(default_factory=dict)
 
 
 # Translation TSV
@@ -36,6 +42,7 @@ class LocalisationData:
 class TranslationStatus(enum.Enum):
     MISSING = "missing"
     OUTDATED = "outdated"
+    MACHINE = "machine"  # Pre-filled by machine translation, to be reviewed
     DONE = "done"
 
 
@@ -44,6 +51,8 @@ class TranslationEntry:
     reference: Text
     translation: Text
     status: TranslationStatus
+    source: str = ""  # Name of the reference file defining the entry
+    previous_reference: Text = ""  # Reference the translation was made for, only kept while it is outdated
 
 
 @dataclasses.dataclass
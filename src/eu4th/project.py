@@ -2,11 +2,24 @@ import dataclasses
 import json
 import logging
 import pathlib
+import re
 
-from .defines import EU4TH_DIR, EXCEL_FILENAME
+from .defines import EU4TH_DIR, TABLE_FILENAMES
+from .locking import atomic_replace, file_lock
 
 _CONFIG_FILENAME = "config.json"
+_RELOAD_CHECKPOINT_DIRNAME = ".reload_checkpoint"
+_REFERENCE_JOURNAL_FILENAME = "reference_journal.sqlite"
+_CONFLICT_REPORT_FILENAME = "conflict_report.tsv"
+_SUMMARY_FILENAME = "summary.json"
+_SEARCH_INDEX_FILENAME = "search_index.sqlite"
+_GLOSSARY_FILENAME = "glossary.tsv"
+_GLOSSARY_REPORT_FILENAME = "glossary_report.tsv"
+_CHUNK_DIRNAME = "split_tables"
+_EFFORT_CACHE_FILENAME = "effort_cache.json"
+_RUN_LOG_FILENAME = "run_log.jsonl"
 _KNOWN_PROJECTS_FILE = EU4TH_DIR / "known_projects.json"
+_UNSAFE_FILE_STEM_CHARS_RE = re.compile(r"[^\w-]+")
 
 
 @dataclasses.dataclass
@@ -20,7 +33,7 @@ def save_known_projects(projects: KnownProjects):
         "projects": [str(dirpath) for dirpath in projects.project_directories],
     }
     _KNOWN_PROJECTS_FILE.parent.mkdir(exist_ok=True, parents=True)
-    with open(_KNOWN_PROJECTS_FILE, "w", encoding="utf-8-sig") as fh:
+    with atomic_replace(_KNOWN_PROJECTS_FILE) as tmp_path, open(tmp_path, "w", encoding="utf-8-sig") as fh:
         json.dump(projects_dict, fh, indent=2)
 
 
@@ -50,23 +63,27 @@ def load_known_projects() -> KnownProjects:
 def add_known_project(project_directory: pathlib.Path):
     if not project_directory.exists():
         raise RuntimeError(f"Directory does not exist: {str(project_directory)!r}")
-    known_projects = load_known_projects()
-    if project_directory in known_projects.project_directories:
-        raise RuntimeError(f"Project is already known: {str(project_directory)!r}")
-    known_projects.project_directories.append(project_directory.resolve())
-    save_known_projects(projects=known_projects)
+    _KNOWN_PROJECTS_FILE.parent.mkdir(exist_ok=True, parents=True)
+    with file_lock(_KNOWN_PROJECTS_FILE):
+        known_projects = load_known_projects()
+        if project_directory in known_projects.project_directories:
+            raise RuntimeError(f"Project is already known: {str(project_directory)!r}")
+        known_projects.project_directories.append(project_directory.resolve())
+        save_known_projects(projects=known_projects)
 
 
 def remove_known_project(project_directory: pathlib.Path):
-    known_projects = load_known_projects()
-    try:
-        known_projects.project_directories.remove(project_directory.resolve())
-    except ValueError as e:
-        raise RuntimeError(
-            f"Project not known: {str(project_directory)!r}. "
-            f"Known projects: {', '.join(repr(str(p)) for p in known_projects.project_directories)}"
-        ) from e
-    save_known_projects(projects=known_projects)
+    _KNOWN_PROJECTS_FILE.parent.mkdir(exist_ok=True, parents=True)
+    with file_lock(_KNOWN_PROJECTS_FILE):
+        known_projects = load_known_projects()
+        try:
+            known_projects.project_directories.remove(project_directory.resolve())
+        except ValueError as e:
+            raise RuntimeError(
+                f"Project not known: {str(project_directory)!r}. "
+                f"Known projects: {', '.join(repr(str(p)) for p in known_projects.project_directories)}"
+            ) from e
+        save_known_projects(projects=known_projects)
 
 
 @dataclasses.dataclass
@@ -74,29 +91,83 @@ class Project:
     project_directory: pathlib.Path
     project_name: str = "<Unknown>"
     reference_language: str = "english"
-    reference_directory: pathlib.Path | None = None
+    reference_directories: list[pathlib.Path] = dataclasses.field(default_factory=list)  # Base layer first
     translation_language: str = ""
     translation_outfile: pathlib.Path | None = None
     exclude_references: list = dataclasses.field(default_factory=list)
+    table_format: str = "xlsx"
+    machine_translation_url: str | None = None
 
     @property
     def translations_table(self) -> pathlib.Path:
-        return self.project_directory / EXCEL_FILENAME
+        return self.project_directory / TABLE_FILENAMES[self.table_format]
+
+    @property
+    def reload_checkpoint_dir(self) -> pathlib.Path:
+        return self.project_directory / _RELOAD_CHECKPOINT_DIRNAME
+
+    @property
+    def reference_journal(self) -> pathlib.Path:
+        return self.project_directory / _REFERENCE_JOURNAL_FILENAME
+
+    @property
+    def conflict_report(self) -> pathlib.Path:
+        return self.project_directory / _CONFLICT_REPORT_FILENAME
+
+    @property
+    def summary_index(self) -> pathlib.Path:
+        return self.project_directory / _SUMMARY_FILENAME
+
+    @property
+    def search_index(self) -> pathlib.Path:
+        return self.project_directory / _SEARCH_INDEX_FILENAME
+
+    @property
+    def glossary(self) -> pathlib.Path:
+        return self.project_directory / _GLOSSARY_FILENAME
+
+    @property
+    def glossary_report(self) -> pathlib.Path:
+        return self.project_directory / _GLOSSARY_REPORT_FILENAME
+
+    @property
+    def chunk_directory(self) -> pathlib.Path:
+        return self.project_directory / _CHUNK_DIRNAME
+
+    @property
+    def effort_cache(self) -> pathlib.Path:
+        return self.project_directory / _EFFORT_CACHE_FILENAME
+
+    @property
+    def run_log(self) -> pathlib.Path:
+        return self.project_directory / _RUN_LOG_FILENAME
+
+    @property
+    def package_file_stem(self) -> str:
+        """Name of the locfiles in an exported package, without the language suffix"""
+        suffix = f"_l_{self.translation_language}.yml"
+        if self.translation_outfile is not None and self.translation_outfile.name.endswith(suffix):
+            return self.translation_outfile.name.removesuffix(suffix)
+        return _UNSAFE_FILE_STEM_CHARS_RE.sub("_", self.project_name).strip("_").lower() or "translation"
 
 
 def save_project(project: Project):
     logging.info(f"Saving project {project.project_name!r} to {str(project.project_directory)!r}")
     config_dict = {
         "project_name": project.project_name,
-        "reference_directory": str(project.reference_directory) if project.reference_directory else None,
+        "reference_directories": [str(dirpath) for dirpath in project.reference_directories],
         "reference_language": project.reference_language,
         "translation_filepath": str(project.translation_outfile) if project.translation_outfile else None,
         "translation_language": project.translation_language,
         "exclude_references": project.exclude_references,
+        "table_format": project.table_format,
+        "machine_translation_url": project.machine_translation_url,
     }
     project.project_directory.mkdir(exist_ok=True, parents=True)
-    with open(project.project_directory / _CONFIG_FILENAME, "w", encoding="utf-8-sig") as fh:
-        json.dump(config_dict, fh, indent=2)
+    config_path = project.project_directory / _CONFIG_FILENAME
+    with file_lock(config_path), atomic_replace(config_path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8-sig") as fh:
+            json.dump(config_dict, fh, indent=2)
 
 
 def load_project(project_directory: pathlib.Path) -> Project:
@@ -120,16 +191,33 @@ def load_project(project_directory: pathlib.Path) -> Project:
         return Project(
             project_name=config_dict["project_name"],
             project_directory=project_directory,
-            reference_directory=(
-                pathlib.Path(config_dict["reference_directory"]) if config_dict["reference_directory"] else None
-            ),
+            reference_directories=_get_reference_directories(config_dict),
             reference_language=config_dict["reference_language"],
             translation_outfile=(
                 pathlib.Path(config_dict["translation_filepath"]) if config_dict["translation_filepath"] else None
             ),
             translation_language=config_dict["translation_language"],
             exclude_references=config_dict.get("exclude_references", []),
+            table_format=_get_table_format(config_dict),
+            machine_translation_url=config_dict.get("machine_translation_url"),
         )
     except ValueError as e:
         logging.warning(f"Error loading config: {e}")
         return Project(project_directory=project_directory)
+
+
+def _get_table_format(config_dict: dict) -> str:
+    table_format = config_dict.get("table_format", "xlsx")
+    if table_format not in TABLE_FILENAMES:
+        logging.warning(f"Unknown table format {table_format!r} in config, falling back to 'xlsx'")
+        return "xlsx"
+    return table_format
+
+
+def _get_reference_directories(config_dict: dict) -> list[pathlib.Path]:
+    if "reference_directories" in config_dict:
+        return [pathlib.Path(raw) for raw in config_dict["reference_directories"]]
+    # Projects from before reference layers have a single reference directory
+    if config_dict.get("reference_directory"):
+        return [pathlib.Path(config_dict["reference_directory"])]
+    return []
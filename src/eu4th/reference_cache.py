@@ -0,0 +1,97 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+
+from .locking import atomic_replace
+from .models import LangId, LocalisationData
+
+_MAX_CACHED_LAYERS = 16
+
+
+def reference_layer_fingerprint(
+    layer_directory: pathlib.Path,
+    file_stats: dict[pathlib.Path, os.stat_result | None],
+    language: LangId,
+    exclude_patterns: list[str],
+) -> str:
+    """Fingerprint of a reference layer, based on the relative paths, sizes and modification times of its files
+
+    The directory itself is not part of the fingerprint, so projects referring to the same game version share it.
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps([language, exclude_patterns]).encode("utf-8"))
+    for filepath, stat in sorted(file_stats.items()):
+        if stat is None:
+            continue  # Removed since the scan, it is not read either
+        relpath = filepath.relative_to(layer_directory).as_posix()
+        digest.update(f"{relpath}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_cached_layer(
+    cache_dir: pathlib.Path,
+    fingerprint: str,
+    layer_directory: pathlib.Path,
+) -> LocalisationData | None:
+    cache_path = cache_dir / f"{fingerprint}.json"
+    try:
+        with open(cache_path, "r", encoding="utf-8") as fh:
+            content = json.load(fh)
+    except FileNotFoundError:
+        return None
+    except (IOError, json.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable reference cache {str(cache_path)!r}: {e}")
+        return None
+    logging.info(f"Using cached references for {str(layer_directory)!r}")
+    cache_path.touch()  # Keep recently used layers when pruning
+    sourcefiles = [layer_directory / relpath for relpath in content["files"]]
+    return LocalisationData(
+        language=content["language"],
+        entries=content["entries"],
+        sources={locid: sourcefiles[index] for locid, index in content["sources"].items()},
+        overridden={
+            locid: [sourcefiles[index] for index in indices] for locid, indices in content["overridden"].items()
+        },
+        quarantined={sourcefiles[int(index)]: problem for index, problem in content.get("quarantined", {}).items()},
+    )
+
+
+def save_cached_layer(
+    cache_dir: pathlib.Path,
+    fingerprint: str,
+    layer_directory: pathlib.Path,
+    locdata: LocalisationData,
+):
+    logging.info(f"Caching references for {str(layer_directory)!r}")
+    # Store source files once, and refer to them by index
+    file_indices: dict[pathlib.Path, int] = {}
+    for filepath in [
+        *locdata.sources.values(),
+        *(fp for fps in locdata.overridden.values() for fp in fps),
+        *locdata.quarantined,
+    ]:
+        file_indices.setdefault(filepath, len(file_indices))
+    content = {
+        "language": locdata.language,
+        "files": [filepath.relative_to(layer_directory).as_posix() for filepath in file_indices],
+        "entries": locdata.entries,
+        "sources": {locid: file_indices[filepath] for locid, filepath in locdata.sources.items()},
+        "overridden": {
+            locid: [file_indices[filepath] for filepath in filepaths] for locid, filepaths in locdata.overridden.items()
+        },
+        "quarantined": {file_indices[filepath]: problem for filepath, problem in locdata.quarantined.items()},
+    }
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = cache_dir / f"{fingerprint}.json"
+    with atomic_replace(cache_path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(content, fh, ensure_ascii=False)
+    _prune_cache(cache_dir=cache_dir)
+
+
+def _prune_cache(cache_dir: pathlib.Path):
+    cached = sorted(cache_dir.glob("*.json"), key=lambda fp: fp.stat().st_mtime, reverse=True)
+    for cache_path in cached[_MAX_CACHED_LAYERS:]:
+        logging.info(f"Removing least recently used reference cache {cache_path.name!r}")
+        cache_path.unlink(missing_ok=True)
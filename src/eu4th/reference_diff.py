@@ -0,0 +1,38 @@
+import difflib
+import functools
+
+from .models import Text
+
+# Opcode tag, and the words of the previous and of the current text it covers
+WordDiff = tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...]
+
+
+@functools.lru_cache(maxsize=4096)
+def word_diff(previous: Text, current: Text) -> WordDiff:
+    """Word-level diff of two texts, cached as the same outdated rows are looked at repeatedly"""
+    previous_words = previous.split()
+    current_words = current.split()
+    matcher = difflib.SequenceMatcher(a=previous_words, b=current_words, autojunk=False)
+    return tuple(
+        (tag, tuple(previous_words[i1:i2]), tuple(current_words[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+    )
+
+
+def count_changed_words(previous: Text, current: Text) -> int:
+    """Number of words of the current text that are new or replaced"""
+    return sum(len(current_words) for tag, _, current_words in word_diff(previous, current) if tag != "equal")
+
+
+def format_word_diff(previous: Text, current: Text) -> Text:
+    """The current text, with removed words marked as [-removed-] and added words as {+added+}"""
+    parts = []
+    for tag, previous_words, current_words in word_diff(previous, current):
+        if tag == "equal":
+            parts.append(" ".join(current_words))
+            continue
+        if previous_words:
+            parts.append(f"[-{' '.join(previous_words)}-]")
+        if current_words:
+            parts.append(f"{{+{' '.join(current_words)}+}}")
+    return " ".join(parts)
@@ -0,0 +1,148 @@
+import contextlib
+import dataclasses
+import datetime
+import json
+import logging
+import os
+import pathlib
+import statistics
+import time
+import typing as t
+
+from .locking import file_lock
+from .summary import StatusCounts
+
+_SLOWER_THRESHOLD_PERCENT = 25
+_SLOWER_THRESHOLD_SECONDS = 0.5  # Short stages vary too much between runs to compare
+
+
+class StageTimer:
+    """Measures a run and each of its stages"""
+
+    def __init__(self):
+        self.started = datetime.datetime.now().isoformat(timespec="seconds")
+        self.timings: dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> t.Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+
+@dataclasses.dataclass
+class RunRecord:
+    operation: str
+    started: str
+    duration: float  # Seconds
+    stage_timings: dict[str, float]
+    counts: dict[str, int]  # What the run processed, like reference files or written translations
+    table_rows: int
+    table_bytes: int
+    status_counts: StatusCounts
+
+
+def make_run_record(
+    operation: str,
+    timer: StageTimer,
+    counts: dict[str, int],
+    translation_table: pathlib.Path,
+    table_rows: int,
+    status_counts: StatusCounts,
+) -> RunRecord:
+    return RunRecord(
+        operation=operation,
+        started=timer.started,
+        duration=round(timer.elapsed, 3),
+        stage_timings={stage: round(elapsed, 3) for stage, elapsed in timer.timings.items()},
+        counts=counts,
+        table_rows=table_rows,
+        table_bytes=translation_table.stat().st_size if translation_table.exists() else 0,
+        status_counts=status_counts,
+    )
+
+
+def append_run_record(log_path: pathlib.Path, record: RunRecord):
+    """Append the record as a line of JSON, the log is only ever appended to"""
+    logging.info(f"Appending {record.operation!r} run to {str(log_path)!r}")
+    line = json.dumps(dataclasses.asdict(record), sort_keys=True) + "\n"
+    with file_lock(log_path), open(log_path, "ab+") as fh:
+        # Start on a new line after the partial record of an interrupted run
+        if fh.seek(0, os.SEEK_END) > 0:
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) != b"\n":
+                line = "\n" + line
+        fh.write(line.encode("utf-8"))
+
+
+def load_run_records(log_path: pathlib.Path) -> list[RunRecord]:
+    records = []
+    try:
+        with open(log_path, "r", encoding="utf-8") as fh:
+            for line_nr, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    content = json.loads(line)
+                    content["status_counts"] = StatusCounts(**content["status_counts"])
+                    records.append(RunRecord(**content))
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    # A run interrupted while appending leaves a partial line
+                    logging.warning(f"Skipping invalid run record on line {line_nr} of {str(log_path)!r}: {e}")
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def describe_trends(records: list[RunRecord], last: int = 10) -> str:
+    """Describe the progress of the translations and the durations of the runs, per operation"""
+    if not records:
+        return "No runs recorded yet"
+    lines = []
+    first, latest = records[0], records[-1]
+    lines.append(
+        f"{len(records)} runs since {first.started}: {first.status_counts.done} to {latest.status_counts.done} "
+        f"of {latest.status_counts.total} rows done, "
+        f"{first.status_counts.words_remaining} to {latest.status_counts.words_remaining} words remaining"
+    )
+    for operation in sorted({record.operation for record in records}):
+        operation_records = [record for record in records if record.operation == operation]
+        lines.append("")
+        lines.append(f"Last {operation} runs:")
+        lines.append(f"  {'Started':<20} {'Seconds':>8} {'Rows':>8} {'Done':>8} {'Missing':>8} {'Outdated':>8}")
+        for record in operation_records[-last:]:
+            lines.append(
+                f"  {record.started:<20} {record.duration:>8.2f} {record.table_rows:>8} "
+                f"{record.status_counts.done:>8} {record.status_counts.missing:>8} {record.status_counts.outdated:>8}"
+            )
+        lines.extend(_describe_slower_stages(records=operation_records))
+    return "\n".join(lines)
+
+
+def _describe_slower_stages(records: list[RunRecord]) -> list[str]:
+    """Compare the stages of the latest run to the median of the earlier runs"""
+    *earlier, latest = records
+    if not earlier:
+        return []
+    lines = []
+    for stage, elapsed in latest.stage_timings.items():
+        earlier_timings = [record.stage_timings[stage] for record in earlier if stage in record.stage_timings]
+        if not earlier_timings:
+            continue
+        median = statistics.median(earlier_timings)
+        slower = elapsed - median
+        # Timings are rounded, so a stage that took next to nothing is recorded as 0
+        slower_percent = slower / max(median, _SLOWER_THRESHOLD_SECONDS) * 100
+        if slower > _SLOWER_THRESHOLD_SECONDS and slower_percent > _SLOWER_THRESHOLD_PERCENT:
+            lines.append(
+                f"  Stage {stage!r} took {elapsed:.2f}s in the latest run, "
+                f"compared to a median of {median:.2f}s over {len(earlier_timings)} earlier runs"
+            )
+    return lines
@@ -0,0 +1,209 @@
+import logging
+import pathlib
+import sqlite3
+
+from .checkpoint import file_stat_key
+from .file_utils import parse_translation_table
+from .models import LocId, Text, TranslationData, TranslationEntry, TranslationStatus
+
+# Rows are inserted in identifier order, so the rowid order is the table order.
+# The trigram FTS index serves substring search, the triggers keep it in sync with edits.
+_SCHEMA = """
+CREATE TABLE rows (
+    rowid INTEGER PRIMARY KEY,
+    identifier TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    reference TEXT NOT NULL,
+    source TEXT NOT NULL,
+    previous_reference TEXT NOT NULL
+);
+CREATE INDEX rows_by_status ON rows (status);
+CREATE VIRTUAL TABLE rows_fts USING fts5(
+    identifier, translation, reference, content='rows', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER rows_update AFTER UPDATE ON rows BEGIN
+    INSERT INTO rows_fts (rows_fts, rowid, identifier, translation, reference)
+        VALUES ('delete', old.rowid, old.identifier, old.translation, old.reference);
+    INSERT INTO rows_fts (rowid, identifier, translation, reference)
+        VALUES (new.rowid, new.identifier, new.translation, new.reference);
+END;
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+_EDITS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS edits (
+    identifier TEXT PRIMARY KEY,
+    translation TEXT NOT NULL
+);
+"""
+_MIN_TRIGRAM_LENGTH = 3
+_SCHEMA_VERSION = "2"
+
+
+class SearchIndex:
+    """Search index over a translation table, with the edits made through it until they are saved to the table"""
+
+    def __init__(self, index_path: pathlib.Path):
+        self.index_path = index_path
+        self._conn = sqlite3.connect(index_path)
+        self._conn.executescript(_EDITS_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    @property
+    def table_stat(self) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'table_stat'").fetchone()
+        return row[0] if row else None
+
+    @property
+    def schema_version(self) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        return row[0] if row else None
+
+    def set_table_stat(self, table_stat: str):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('table_stat', ?)", (table_stat,))
+
+    def search(self, text: str = "", statuses: list[TranslationStatus] | None = None) -> list[int]:
+        """Row ids of the rows containing the text (case-insensitive) in any column, in table order"""
+        conditions = []
+        params = []
+        if text and len(text) >= _MIN_TRIGRAM_LENGTH:
+            conditions.append("rowid IN (SELECT rowid FROM rows_fts WHERE rows_fts MATCH ?)")
+            params.append('"' + text.replace('"', '""') + '"')
+        elif text:
+            # Too short for trigrams, scan instead
+            conditions.append(
+                "(instr(lower(identifier), ?) OR instr(lower(translation), ?) OR instr(lower(reference), ?))"
+            )
+            params += [text.lower()] * 3
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params += [status.value for status in statuses]
+        query = "SELECT rowid FROM rows"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY rowid"
+        return [rowid for rowid, in self._conn.execute(query, params)]
+
+    def fetch(self, rowids: list[int]) -> list[tuple[LocId, TranslationEntry]]:
+        """Materialise only the requested rows, in the requested order"""
+        if not rowids:
+            return []
+        rows = self._conn.execute(
+            f"SELECT rowid, identifier, status, translation, reference, source, previous_reference FROM rows "
+            f"WHERE rowid IN ({', '.join('?' for _ in rowids)})",
+            rowids,
+        )
+        by_rowid = {
+            rowid: (
+                identifier,
+                TranslationEntry(reference, translation, TranslationStatus(status), source, previous_reference),
+            )
+            for rowid, identifier, status, translation, reference, source, previous_reference in rows
+        }
+        return [by_rowid[rowid] for rowid in rowids if rowid in by_rowid]
+
+    def edit_translation(self, identifier: LocId, translation: Text):
+        """Record an edited translation, which also marks the row as reviewed"""
+        status = TranslationStatus.DONE if translation else TranslationStatus.MISSING
+        with self._conn:
+            self._conn.execute(
+                "UPDATE rows SET translation = ?, status = ?, previous_reference = '' WHERE identifier = ?",
+                (translation, status.value, identifier),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO edits (identifier, translation) VALUES (?, ?)",
+                (identifier, translation),
+            )
+
+    def pending_edits(self) -> dict[LocId, Text]:
+        return dict(self._conn.execute("SELECT identifier, translation FROM edits"))
+
+    def clear_edits(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM edits")
+
+
+def apply_edits(translation_data: TranslationData, edits: dict[LocId, Text]) -> int:
+    applied = 0
+    for identifier, translation in edits.items():
+        entry = translation_data.entries.get(identifier)
+        if entry is None:
+            logging.warning(f"Dropping edit of {identifier!r}, which is no longer in the table")
+            continue
+        entry.translation = translation
+        entry.status = TranslationStatus.DONE if translation else TranslationStatus.MISSING
+        entry.previous_reference = ""
+        applied += 1
+    return applied
+
+
+def build_search_index(
+    index_path: pathlib.Path,
+    translation_data: TranslationData,
+    table_stat: str,
+):
+    logging.info(f"Building search index {str(index_path)!r}")
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(_SCHEMA + _EDITS_SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT INTO rows (identifier, status, translation, reference, source, previous_reference) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        locid,
+                        entry.status.value,
+                        entry.translation,
+                        entry.reference,
+                        entry.source,
+                        entry.previous_reference,
+                    )
+                    for locid, entry in sorted(translation_data.entries.items())
+                ),
+            )
+            conn.execute("INSERT INTO rows_fts (rows_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO meta (key, value) VALUES ('table_stat', ?)", (table_stat,))
+            conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (_SCHEMA_VERSION,))
+    finally:
+        conn.close()
+    tmp_path.replace(index_path)
+
+
+def open_search_index(
+    index_path: pathlib.Path,
+    translation_table: pathlib.Path,
+) -> SearchIndex:
+    """Open the search index of a table, rebuilding it only if the table changed since it was built
+
+    Pending edits survive a rebuild, they are re-applied to the fresh rows.
+    """
+    if not translation_table.exists():
+        raise RuntimeError(
+            f"The translation table does not yet exist, load localisation first (path {str(translation_table)!r})"
+        )
+    table_stat = str(file_stat_key(translation_table))
+    pending_edits = {}
+    if index_path.exists():
+        index = SearchIndex(index_path=index_path)
+        try:
+            if index.table_stat == table_stat and index.schema_version == _SCHEMA_VERSION:
+                return index
+            pending_edits = index.pending_edits()
+        except sqlite3.DatabaseError as e:
+            logging.warning(f"Rebuilding unreadable search index: {e}")
+        index.close()
+    translation_data = parse_translation_table(filepath=translation_table)
+    build_search_index(index_path=index_path, translation_data=translation_data, table_stat=table_stat)
+    index = SearchIndex(index_path=index_path)
+    for identifier, translation in pending_edits.items():
+        index.edit_translation(identifier=identifier, translation=translation)
+    return index
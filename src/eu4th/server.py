@@ -0,0 +1,231 @@
+import asyncio
+import concurrent.futures
+import dataclasses
+import functools
+import http
+import json
+import logging
+import pathlib
+import typing as t
+import urllib.parse
+
+from .checkpoint import file_stat_key
+from .commands import flush_to_localisation, reload_localisation_to_tsv
+from .defines import REFERENCE_CACHE_DIR
+from .file_utils import parse_translation_table
+from .models import TranslationData
+from .project import Project, load_known_projects, load_project
+from .summary import compute_summary
+
+DEFAULT_PORT = 8740
+_MAX_BODY_SIZE = 1024 * 1024
+
+
+class RequestError(Exception):
+    def __init__(self, status: http.HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ProjectService:
+    """Runs project operations for HTTP requests
+
+    Operations run in a worker pool, one at a time per project. The parsed translation table of each project stays
+    in memory until the table changes, so repeated flushes and lookups do not parse it again.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._locks: dict[pathlib.Path, asyncio.Lock] = {}
+        self._warm: dict[pathlib.Path, tuple[list[int] | None, TranslationData]] = {}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    async def handle(self, method: str, path: str, body: dict) -> t.Any:
+        parts = [urllib.parse.unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["projects"] and method == "GET":
+            return [self._describe_project(project) for project in _known_projects()]
+        if len(parts) < 2 or parts[0] != "projects":
+            raise RequestError(http.HTTPStatus.NOT_FOUND, f"Unknown path {path!r}")
+        project = _find_project(project_name=parts[1])
+        match method, parts[2:]:
+            case "GET", []:
+                return await self._run(project, self._status, project)
+            case "GET", ["rows", identifier]:
+                return await self._run(project, self._lookup_row, project, identifier)
+            case "POST", ["reload"]:
+                return await self._run(project, self._reload, project, body.get("version_label"))
+            case "POST", ["flush"]:
+                return await self._run(project, self._flush, project)
+        raise RequestError(http.HTTPStatus.NOT_FOUND, f"Unknown operation {method} {path!r}")
+
+    async def _run(self, project: Project, func: t.Callable, *args) -> t.Any:
+        lock = self._locks.setdefault(project.project_directory, asyncio.Lock())
+        async with lock:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+
+    def _translation_data(self, project: Project) -> TranslationData:
+        table = project.translations_table
+        if not table.exists():
+            raise RuntimeError("The translation table does not yet exist, load localisation first")
+        table_stat = file_stat_key(table)
+        warm = self._warm.get(project.project_directory)
+        if warm is not None and warm[0] == table_stat:
+            return warm[1]
+        translation_data = parse_translation_table(filepath=table)
+        self._warm[project.project_directory] = (table_stat, translation_data)
+        return translation_data
+
+    @staticmethod
+    def _describe_project(project: Project) -> dict:
+        return {
+            "project_name": project.project_name,
+            "project_directory": str(project.project_directory),
+            "reference_language": project.reference_language,
+            "translation_language": project.translation_language,
+        }
+
+    def _status(self, project: Project) -> dict:
+        status = self._describe_project(project)
+        if project.translations_table.exists():
+            summary = compute_summary(translation_data=self._translation_data(project))
+            status["summary"] = dataclasses.asdict(summary)
+            status["description"] = summary.describe()
+        return status
+
+    def _lookup_row(self, project: Project, identifier: str) -> dict:
+        entry = self._translation_data(project).entries.get(identifier)
+        if entry is None:
+            raise RequestError(http.HTTPStatus.NOT_FOUND, f"Unknown identifier {identifier!r}")
+        return {
+            "identifier": identifier,
+            "status": entry.status.value,
+            "translation": entry.translation,
+            "reference": entry.reference,
+            "source": entry.source,
+            "previous_reference": entry.previous_reference,
+        }
+
+    def _reload(self, project: Project, version_label: str | None) -> dict:
+        info = reload_localisation_to_tsv(
+            ref_dirs=project.reference_directories,
+            reference_language=project.reference_language,
+            translation_language=project.translation_language,
+            reference_exclude_patterns=project.exclude_references,
+            translation_table=project.translations_table,
+            checkpoint_dir=project.reload_checkpoint_dir,
+            journal_path=project.reference_journal,
+            conflict_report_path=project.conflict_report,
+            layer_cache_dir=REFERENCE_CACHE_DIR,
+            version_label=version_label,
+            summary_path=project.summary_index,
+            glossary_path=project.glossary,
+            glossary_report_path=project.glossary_report,
+            run_log_path=project.run_log,
+        )
+        self._warm.pop(project.project_directory, None)  # Parse the new table when it is needed
+        return {"info": info}
+
+    def _flush(self, project: Project) -> dict:
+        if project.translation_outfile is None:
+            raise RuntimeError("The project has no translation output file configured")
+        info = flush_to_localisation(
+            translation_table=project.translations_table,
+            translation_outfile=project.translation_outfile,
+            summary_path=project.summary_index,
+            glossary_path=project.glossary,
+            glossary_report_path=project.glossary_report,
+            chunk_dir=project.chunk_directory,
+            translation_data=self._translation_data(project),
+            run_log_path=project.run_log,
+        )
+        return {"info": info}
+
+
+def _known_projects() -> list[Project]:
+    return [load_project(project_directory=dirpath) for dirpath in load_known_projects().project_directories]
+
+
+def _find_project(project_name: str) -> Project:
+    matches = [project for project in _known_projects() if project.project_name == project_name]
+    if not matches:
+        raise RequestError(http.HTTPStatus.NOT_FOUND, f"Unknown project {project_name!r}")
+    if len(matches) > 1:
+        raise RequestError(http.HTTPStatus.CONFLICT, f"Several known projects are named {project_name!r}")
+    return matches[0]
+
+
+async def _handle_connection(service: ProjectService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        try:
+            method, path, body = await _read_request(reader)
+            status, payload = http.HTTPStatus.OK, await service.handle(method=method, path=path, body=body)
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except RuntimeError as e:
+            status, payload = http.HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            logging.exception(e)
+            status, payload = http.HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+        content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        header = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(content)}\r\n"
+            f"Connection: close\r\n\r\n"
+        )
+        writer.write(header.encode("latin-1") + content)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict]:
+    try:
+        request_line = (await reader.readline()).decode("latin-1")
+        method, target, _ = request_line.split(" ", 2)
+        headers = {}
+        while (line := (await reader.readline()).decode("latin-1").strip()) != "":
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        content_length = int(headers.get("content-length", 0))
+    except ValueError as e:
+        raise RequestError(http.HTTPStatus.BAD_REQUEST, "Malformed request") from e
+    if content_length > _MAX_BODY_SIZE:
+        raise RequestError(http.HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = {}
+    if content_length > 0:
+        try:
+            body = json.loads(await reader.readexactly(content_length))
+        except (asyncio.IncompleteReadError, json.JSONDecodeError) as e:
+            raise RequestError(http.HTTPStatus.BAD_REQUEST, "Request body must be a JSON object") from e
+        if not isinstance(body, dict):
+            raise RequestError(http.HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+    return method.upper(), urllib.parse.urlsplit(target).path, body
+
+
+async def _serve(host: str, port: int, max_workers: int):
+    service = ProjectService(max_workers=max_workers)
+    server = await asyncio.start_server(functools.partial(_handle_connection, service), host=host, port=port)
+    logging.warning(f"Serving known projects on http://{host}:{port}/projects")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, max_workers: int = 4):
+    """Serve project operations over HTTP/JSON until interrupted
+
+    GET /projects lists the known projects, and for a project by name:
+    GET /projects/<name> returns its status, GET /projects/<name>/rows/<identifier> a row of its table,
+    POST /projects/<name>/reload (optionally with {"version_label": ...}) and POST /projects/<name>/flush run them.
+    """
+    try:
+        asyncio.run(_serve(host=host, port=port, max_workers=max_workers))
+    except KeyboardInterrupt:
+        logging.warning("Stopped serving")
@@ -0,0 +1,90 @@
+import dataclasses
+import datetime
+import json
+import logging
+import pathlib
+
+from .locking import atomic_replace
+from .models import Text, TranslationData, TranslationStatus
+from .tokens import strip_tokens
+
+
+@dataclasses.dataclass
+class StatusCounts:
+    missing: int = 0
+    outdated: int = 0
+    machine: int = 0
+    done: int = 0
+    words_remaining: int = 0  # Reference words of the rows that are not done
+
+    @property
+    def total(self) -> int:
+        return self.missing + self.outdated + self.machine + self.done
+
+    def add(self, status: TranslationStatus, words: int):
+        setattr(self, status.value, getattr(self, status.value) + 1)
+        if status is not TranslationStatus.DONE:
+            self.words_remaining += words
+
+
+@dataclasses.dataclass
+class TranslationSummary:
+    updated: str
+    overall: StatusCounts
+    by_source: dict[str, StatusCounts] = dataclasses.field(default_factory=dict)
+
+    def describe(self) -> str:
+        if self.overall.total == 0:
+            return "No translations yet"
+        return (
+            f"{self.overall.done} of {self.overall.total} done ({100 * self.overall.done // self.overall.total}%), "
+            f"{self.overall.outdated} outdated, {self.overall.machine} to review, {self.overall.missing} missing "
+            f"- {self.overall.words_remaining} words remaining"
+        )
+
+
+def count_words(text: Text) -> int:
+    return len(strip_tokens(text).split())
+
+
+def compute_summary(translation_data: TranslationData) -> TranslationSummary:
+    summary = TranslationSummary(
+        updated=datetime.datetime.now().isoformat(timespec="seconds"),
+        overall=StatusCounts(),
+    )
+    for entry in translation_data.entries.values():
+        if not entry.reference:
+            continue  # No longer in the references, nothing to translate
+        words = count_words(entry.reference) if entry.status is not TranslationStatus.DONE else 0
+        summary.overall.add(status=entry.status, words=words)
+        source_counts = summary.by_source.get(entry.source)
+        if source_counts is None:
+            source_counts = summary.by_source[entry.source] = StatusCounts()
+        source_counts.add(status=entry.status, words=words)
+    return summary
+
+
+def save_summary(summary_path: pathlib.Path, summary: TranslationSummary):
+    logging.info(f"Saving translation summary to {str(summary_path)!r}")
+    with atomic_replace(summary_path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(dataclasses.asdict(summary), fh, indent=2, sort_keys=True)
+
+
+def load_summary(summary_path: pathlib.Path) -> TranslationSummary | None:
+    try:
+        with open(summary_path, "r", encoding="utf-8") as fh:
+            content = json.load(fh)
+    except FileNotFoundError:
+        return None
+    except (IOError, json.JSONDecodeError) as e:
+        logging.warning(f"Error loading translation summary: {e}")
+        return None
+    try:
+        return TranslationSummary(
+            updated=content["updated"],
+            overall=StatusCounts(**content["overall"]),
+            by_source={source: StatusCounts(**counts) for source, counts in content["by_source"].items()},
+        )
+    except (KeyError, TypeError) as e:
+        logging.warning(f"Error loading translation summary: {e}")
+        return None
@@ -0,0 +1,12 @@
+import re
+
+from .models import Text
+
+# Tokens the game interprets, which are not translated:
+# $VARIABLE$, [Scope.GetName], §Y colour codes §!, £icon£ and escaped newlines
+PROTECTED_TOKEN_RE = re.compile(r"\$[^$\s]+\$|\[[^\[\]]+\]|§.|£[^£\s]+£?|\\n")
+
+
+def strip_tokens(text: Text) -> Text:
+    """The text without game tokens and formatting codes, separated by spaces where they were"""
+    return PROTECTED_TOKEN_RE.sub(" ", text)
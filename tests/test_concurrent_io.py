@@ -0,0 +1,28 @@
+import os
+import pathlib
+
+import pytest
+
+from eu4th.concurrent_io import scan_files
+
+
+def test_scan_files_recurses_into_subdirectories(tmp_path: pathlib.Path):
+    (tmp_path / "sub" / "deeper").mkdir(parents=True)
+    for filepath in (tmp_path / "a_l_english.yml", tmp_path / "sub" / "deeper" / "b_l_english.yml"):
+        filepath.touch()
+    (tmp_path / "sub" / "notes.txt").touch()
+    assert sorted(scan_files(directory=tmp_path, suffix=".yml")) == [
+        tmp_path / "a_l_english.yml",
+        tmp_path / "sub" / "deeper" / "b_l_english.yml",
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="Symlinks are not supported")
+def test_scan_files_does_not_follow_directory_symlinks(tmp_path: pathlib.Path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a_l_english.yml").touch()
+    try:
+        (tmp_path / "sub" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    except OSError:
+        pytest.skip("Not allowed to create symlinks")
+    assert scan_files(directory=tmp_path, suffix=".yml") == [tmp_path / "sub" / "a_l_english.yml"]
@@ -0,0 +1,93 @@
+import pathlib
+import zipfile
+
+import pytest
+
+from eu4th.file_utils import (
+    get_localisation_from_translations,
+    parse_translation_table,
+    write_localisation_package,
+    write_localisation_to_locfile,
+    write_translation_table,
+)
+from eu4th.models import TranslationData, TranslationEntry, TranslationStatus
+
+GOLDEN_DIR = pathlib.Path(__file__).parent / "fixtures" / "golden"
+
+
+def golden_translation_data() -> TranslationData:
+    return TranslationData(
+        reference_language="english",
+        translation_language="german",
+        entries={
+            "B_QUOTES": TranslationEntry(
+                reference='Say "hi"',
+                translation='Sag "hallo"',
+                status=TranslationStatus.DONE,
+                source="b_l_english.yml",
+            ),
+            "A_TOKENS": TranslationEntry(
+                reference="§Y$NAME$§! [Root.GetName]",
+                translation="§Y$NAME$§! [Root.GetName] ÄÖÜ",
+                status=TranslationStatus.MACHINE,
+                source="a_l_english.yml",
+            ),
+            "C_OUTDATED": TranslationEntry(
+                reference="New, with\ttab",
+                translation="Alt; mit, Komma",
+                status=TranslationStatus.OUTDATED,
+                source="a_l_english.yml",
+                previous_reference="Old",
+            ),
+            "D_MISSING": TranslationEntry(
+                reference="Not yet: translated",
+                translation="",
+                status=TranslationStatus.MISSING,
+                source="b_l_english.yml",
+            ),
+        },
+    )
+
+
+def test_locfile(tmp_path: pathlib.Path):
+    outfile = tmp_path / "golden_l_german.yml"
+    write_localisation_to_locfile(
+        outfile=outfile,
+        locdata=get_localisation_from_translations(translation_data=golden_translation_data()),
+    )
+    assert outfile.read_bytes() == (GOLDEN_DIR / "golden_l_german.yml").read_bytes()
+
+
+@pytest.mark.parametrize("table_format", ["tsv", "csv"])
+def test_delimited_table(tmp_path: pathlib.Path, table_format: str):
+    outpath = tmp_path / f"golden.{table_format}"
+    write_translation_table(outpath=outpath, translation_data=golden_translation_data())
+    assert outpath.read_bytes() == (GOLDEN_DIR / f"golden.{table_format}").read_bytes()
+    assert parse_translation_table(filepath=outpath) == golden_translation_data()
+
+
+def test_xlsx_table(tmp_path: pathlib.Path):
+    # Workbooks hold their creation time, so only compare what reads back
+    outpath = tmp_path / "golden.xlsx"
+    write_translation_table(outpath=outpath, translation_data=golden_translation_data())
+    assert parse_translation_table(filepath=outpath) == golden_translation_data()
+
+
+def test_mod_package(tmp_path: pathlib.Path):
+    # Split at 64 bytes per file, A_TOKENS overrides the base game
+    outpath = tmp_path / "golden.zip"
+    write_localisation_package(
+        outpath=outpath,
+        translation_data=golden_translation_data(),
+        file_stem="golden",
+        replace_identifiers={"A_TOKENS"},
+        max_file_size=64,
+    )
+    package_dir = GOLDEN_DIR / "package"
+    expected = {
+        filepath.relative_to(package_dir).as_posix(): filepath.read_bytes()
+        for filepath in package_dir.rglob("*")
+        if filepath.is_file()
+    }
+    with zipfile.ZipFile(outpath) as zip_file:
+        assert {name: zip_file.read(name) for name in zip_file.namelist()} == expected
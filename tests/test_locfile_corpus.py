@@ -0,0 +1,28 @@
+import json
+import pathlib
+
+import pytest
+
+from eu4th.file_utils import iter_locfiles
+
+CORPUS_DIR = pathlib.Path(__file__).parent / "fixtures" / "locfile_corpus"
+with open(CORPUS_DIR / "expected.json", "r", encoding="utf-8") as fh:
+    EXPECTED = json.load(fh)
+
+
+@pytest.mark.parametrize("name", list(EXPECTED))
+def test_locfile_parses_as_expected(name: str):
+    expected = EXPECTED[name]
+    [(_, locfile)] = iter_locfiles(filepaths=[CORPUS_DIR / f"{name}_l_english.yml"], language="english")
+    if expected["skipped"]:
+        assert locfile is None
+        return
+    assert locfile is not None
+    assert (locfile.problem is not None) == expected["quarantined"]
+    if not expected["quarantined"]:
+        assert [(line.identifier, line.text) for line in locfile.lines] == list(expected["lines"].items())
+
+
+def test_corpus_has_expectation_for_each_file():
+    names = {filepath.name.removesuffix("_l_english.yml") for filepath in CORPUS_DIR.glob("*.yml")}
+    assert names == EXPECTED.keys()
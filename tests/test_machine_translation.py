@@ -0,0 +1,57 @@
+import http.server
+import json
+import threading
+import typing as t
+
+import pytest
+
+from eu4th.machine_translation import HttpTranslationBackend
+
+
+def _serve(status: int, response: dict) -> t.Iterator[str]:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps(response).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/translate"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def server_url(request: pytest.FixtureRequest) -> t.Iterator[str]:
+    yield from _serve(*request.param)
+
+
+@pytest.mark.parametrize("server_url", [(200, {"translatedText": ["Hallo", "Welt"]})], indirect=True)
+def test_translate(server_url: str):
+    backend = HttpTranslationBackend(url=server_url)
+    assert backend.translate(["Hello", "World"], source_language="english", target_language="german") == [
+        "Hallo",
+        "Welt",
+    ]
+
+
+@pytest.mark.parametrize(
+    "server_url",
+    [(429, {"error": "Slowdown: 10 per 1 minute"}), (200, {"error": "Slowdown: 10 per 1 minute"})],
+    indirect=True,
+)
+def test_server_error_is_reported(server_url: str):
+    backend = HttpTranslationBackend(url=server_url)
+    with pytest.raises(RuntimeError, match="Slowdown: 10 per 1 minute"):
+        backend.translate(["Hello"], source_language="english", target_language="german")
@@ -0,0 +1,150 @@
+"""Performance budget of the parsers and writers, only run with `pytest -m perf`
+
+The timings are compared to a baseline of the same machine, which must be recorded first:
+`EU4TH_SAVE_PERF_BASELINE=1 pytest -m perf`. The baseline is kept in the pytest cache of the checkout,
+or in the JSON file that EU4TH_PERF_BASELINE points to, e.g. to share it between checkouts.
+"""
+
+import json
+import os
+import pathlib
+import platform
+import random
+import time
+import typing as t
+
+import pytest
+
+from eu4th.file_utils import (
+    get_localisation_from_translations,
+    parse_localisation_from_locfiles,
+    parse_translation_table,
+    write_localisation_package,
+    write_localisation_to_locfile,
+    write_translation_table,
+)
+from eu4th.models import TranslationData, TranslationEntry, TranslationStatus
+
+pytestmark = pytest.mark.perf
+
+BUDGET_PERCENT = 25
+_BASELINE_CACHE_KEY = "eu4th/perf_baseline"
+_REPEATS = 3
+_STAGES = [
+    "write locfile",
+    "parse locfile",
+    "write tsv table",
+    "parse tsv table",
+    "write xlsx table (10k rows)",
+    "parse xlsx table (10k rows)",
+    "write mod package",
+]
+
+
+def _benchmark_translation_data(nr_entries: int) -> TranslationData:
+    rng = random.Random(0)
+    words = ["the", "army", "of", "$COUNTRY$", "[Root.GetName]", "§Ygold§!", "marches", "to", "war", "peace"]
+    return TranslationData(
+        reference_language="english",
+        translation_language="german",
+        entries={
+            f"BENCH_{i:06d}": TranslationEntry(
+                reference=" ".join(rng.choices(words, k=12)),
+                translation=" ".join(rng.choices(words, k=12)) if i % 4 else "",
+                status=TranslationStatus.DONE if i % 4 else TranslationStatus.MISSING,
+                source=f"bench_{i % 20}_l_english.yml",
+            )
+            for i in range(nr_entries)
+        },
+    )
+
+
+def _measure_stages(tmp_path: pathlib.Path) -> dict[str, float]:
+    translation_data = _benchmark_translation_data(nr_entries=100_000)
+    small_data = TranslationData(
+        reference_language="english",
+        translation_language="german",
+        entries=dict(list(translation_data.entries.items())[:10_000]),
+    )
+    locdata = get_localisation_from_translations(translation_data=translation_data)
+    locfile = tmp_path / "bench_l_german.yml"
+    stages: dict[str, t.Callable[[], t.Any]] = {
+        "write locfile": lambda: write_localisation_to_locfile(outfile=locfile, locdata=locdata),
+        "parse locfile": lambda: parse_localisation_from_locfiles(filepaths=[locfile], language="german"),
+        "write tsv table": lambda: write_translation_table(
+            outpath=tmp_path / "bench.tsv",
+            translation_data=translation_data,
+        ),
+        "parse tsv table": lambda: parse_translation_table(filepath=tmp_path / "bench.tsv"),
+        "write xlsx table (10k rows)": lambda: write_translation_table(
+            outpath=tmp_path / "bench.xlsx",
+            translation_data=small_data,
+        ),
+        "parse xlsx table (10k rows)": lambda: parse_translation_table(filepath=tmp_path / "bench.xlsx"),
+        "write mod package": lambda: write_localisation_package(
+            outpath=tmp_path / "bench.zip",
+            translation_data=translation_data,
+            file_stem="bench",
+            replace_identifiers=set(),
+        ),
+    }
+    timings = {}
+    for stage in _STAGES:
+        # Best of several runs, as the least disturbed by other work on the machine
+        best = None
+        for _ in range(_REPEATS):
+            start = time.perf_counter()
+            stages[stage]()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[stage] = best
+    return timings
+
+
+@pytest.fixture(scope="module")
+def timings(tmp_path_factory: pytest.TempPathFactory) -> dict[str, float]:
+    return _measure_stages(tmp_path=tmp_path_factory.mktemp("perf"))
+
+
+@pytest.fixture(scope="module")
+def baseline(request: pytest.FixtureRequest) -> dict[str, float] | None:
+    """The baseline timings of this machine, None when there is none or when this run was saved as the baseline"""
+    baseline_path = os.environ.get("EU4TH_PERF_BASELINE")
+    if not baseline_path and getattr(request.config, "cache", None) is None:
+        pytest.skip("The pytest cache is disabled, set EU4TH_PERF_BASELINE to keep the baseline in a file")
+    if os.environ.get("EU4TH_SAVE_PERF_BASELINE"):
+        saved = {"machine": platform.node(), "timings": request.getfixturevalue("timings")}
+        if baseline_path:
+            with open(baseline_path, "w", encoding="utf-8") as fh:
+                json.dump(saved, fh, indent=2)
+        else:
+            request.config.cache.set(_BASELINE_CACHE_KEY, saved)
+        return None
+    if baseline_path:
+        try:
+            with open(baseline_path, "r", encoding="utf-8") as fh:
+                saved = json.load(fh)
+        except FileNotFoundError:
+            saved = None
+    else:
+        saved = request.config.cache.get(_BASELINE_CACHE_KEY, None)
+    if saved is None or saved["machine"] != platform.node():
+        return None
+    return saved["timings"]
+
+
+@pytest.mark.parametrize("stage", _STAGES)
+def test_stage_within_budget(request: pytest.FixtureRequest, baseline: dict[str, float] | None, stage: str):
+    if os.environ.get("EU4TH_SAVE_PERF_BASELINE"):
+        pytest.skip("Saved the timings as the baseline")
+    if baseline is None:
+        pytest.skip("No baseline of this machine, record one with EU4TH_SAVE_PERF_BASELINE=1")
+    if stage not in baseline:
+        pytest.skip(f"No baseline for {stage!r}")
+    # Only measured with a baseline to compare with
+    timings = request.getfixturevalue("timings")
+    change = (timings[stage] / baseline[stage] - 1) * 100
+    assert change <= BUDGET_PERCENT, (
+        f"{timings[stage]:.3f}s is {change:+.0f}% compared to the baseline of {baseline[stage]:.3f}s, "
+        f"more than the budget of {BUDGET_PERCENT}%"
+    )
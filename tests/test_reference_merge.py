@@ -0,0 +1,94 @@
+import codecs
+import pathlib
+
+import pytest
+
+from eu4th.commands import reload_localisation_to_tsv, rollback_references
+from eu4th.file_utils import (
+    merge_latest_references_into_translations,
+    parse_translation_table,
+    write_translation_table,
+)
+from eu4th.models import LocalisationData, TranslationData, TranslationEntry, TranslationStatus
+from eu4th.run_log import load_run_records
+from eu4th.summary import load_summary
+
+
+def _reload(entry: TranslationEntry, latest_reference: str) -> TranslationEntry:
+    translation_data = TranslationData(
+        reference_language="english", translation_language="german", entries={"A": entry}
+    )
+    updated, _ = merge_latest_references_into_translations(
+        known_translations=translation_data,
+        latest_locdata=LocalisationData(language="english", entries={"A": latest_reference}),
+    )
+    return updated.entries["A"]
+
+
+@pytest.mark.parametrize("status", list(TranslationStatus))
+def test_unchanged_reference_keeps_status(status: TranslationStatus):
+    entry = _reload(TranslationEntry(reference="Old", translation="Alt", status=status), latest_reference="Old")
+    assert entry.status is status
+
+
+def test_changed_reference_outdates_done_translation():
+    entry = _reload(
+        TranslationEntry(reference="Old", translation="Alt", status=TranslationStatus.DONE),
+        latest_reference="New",
+    )
+    assert (entry.status, entry.previous_reference) == (TranslationStatus.OUTDATED, "Old")
+
+
+def test_changed_reference_keeps_machine_translation_to_review():
+    entry = _reload(
+        TranslationEntry(reference="Old", translation="Alt", status=TranslationStatus.MACHINE),
+        latest_reference="New",
+    )
+    assert (entry.status, entry.previous_reference) == (TranslationStatus.MACHINE, "")
+
+
+def test_changed_back_reference_restores_outdated_translation():
+    entry = _reload(
+        TranslationEntry(
+            reference="New", translation="Alt", status=TranslationStatus.OUTDATED, previous_reference="Old"
+        ),
+        latest_reference="Old",
+    )
+    assert (entry.status, entry.previous_reference) == (TranslationStatus.DONE, "")
+
+
+def test_rollback_restores_translations_and_records_run(tmp_path: pathlib.Path):
+    (tmp_path / "ref").mkdir()
+    locfile = tmp_path / "ref" / "a_l_english.yml"
+    reload_args = dict(
+        ref_dirs=[tmp_path / "ref"],
+        reference_language="english",
+        translation_language="german",
+        reference_exclude_patterns=[],
+        translation_table=tmp_path / "translation_table.tsv",
+        journal_path=tmp_path / "reference_journal.sqlite",
+    )
+    locfile.write_bytes(codecs.BOM_UTF8 + b'l_english:\n A:0 "Old"\n')
+    reload_localisation_to_tsv(version_label="before", **reload_args)
+    translation_data = parse_translation_table(filepath=reload_args["translation_table"])
+    translation_data.entries["A"].translation = "Alt"
+    translation_data.entries["A"].status = TranslationStatus.DONE
+    write_translation_table(outpath=reload_args["translation_table"], translation_data=translation_data)
+    locfile.write_bytes(codecs.BOM_UTF8 + b'l_english:\n A:0 "New"\n')
+    reload_localisation_to_tsv(version_label="after", **reload_args)
+    entry = parse_translation_table(filepath=reload_args["translation_table"]).entries["A"]
+    assert entry.status is TranslationStatus.OUTDATED
+
+    info = rollback_references(
+        translation_table=reload_args["translation_table"],
+        journal_path=reload_args["journal_path"],
+        version_or_label="before",
+        summary_path=tmp_path / "summary.json",
+        run_log_path=tmp_path / "run_log.jsonl",
+    )
+    assert "1 outdated translations match their reference again" in info
+    entry = parse_translation_table(filepath=reload_args["translation_table"]).entries["A"]
+    assert (entry.reference, entry.status, entry.previous_reference) == ("Old", TranslationStatus.DONE, "")
+    assert load_summary(summary_path=tmp_path / "summary.json").overall.done == 1
+    [record] = load_run_records(log_path=tmp_path / "run_log.jsonl")
+    assert record.operation == "rollback"
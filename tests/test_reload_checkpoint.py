@@ -0,0 +1,60 @@
+import codecs
+import pathlib
+
+import pytest
+
+from eu4th import commands
+from eu4th.file_utils import parse_translation_table
+
+
+def _write_locfile(filepath: pathlib.Path, entries: dict[str, str]):
+    lines = "".join(f' {identifier}:0 "{text}"\n' for identifier, text in entries.items())
+    filepath.write_bytes(codecs.BOM_UTF8 + f"l_english:\n{lines}".encode("utf-8"))
+
+
+def _fail_write(**kwargs):
+    raise RuntimeError("The table is open in another application")
+
+
+@pytest.fixture
+def reload_args(tmp_path: pathlib.Path) -> dict:
+    (tmp_path / "ref").mkdir()
+    _write_locfile(tmp_path / "ref" / "a_l_english.yml", {"A": "Alpha", "B": "Beta"})
+    return dict(
+        ref_dirs=[tmp_path / "ref"],
+        reference_language="english",
+        translation_language="german",
+        reference_exclude_patterns=[],
+        translation_table=tmp_path / "translation_table.tsv",
+        checkpoint_dir=tmp_path / "checkpoint",
+    )
+
+
+def _interrupted_reload(monkeypatch: pytest.MonkeyPatch, reload_args: dict):
+    with monkeypatch.context() as patch:
+        patch.setattr(commands, "_write_translation_table_safely", _fail_write)
+        with pytest.raises(RuntimeError):
+            commands.reload_localisation_to_tsv(**reload_args)
+
+
+def test_resume_with_unchanged_references(monkeypatch: pytest.MonkeyPatch, reload_args: dict):
+    _interrupted_reload(monkeypatch=monkeypatch, reload_args=reload_args)
+    info = commands.reload_localisation_to_tsv(**reload_args)
+    assert "Resumed the interrupted reload" in info
+    entries = parse_translation_table(filepath=reload_args["translation_table"]).entries
+    assert {locid: entry.reference for locid, entry in entries.items()} == {"A": "Alpha", "B": "Beta"}
+
+
+def test_resume_after_references_changed(monkeypatch: pytest.MonkeyPatch, reload_args: dict):
+    _interrupted_reload(monkeypatch=monkeypatch, reload_args=reload_args)
+    [ref_dir] = reload_args["ref_dirs"]
+    _write_locfile(ref_dir / "a_l_english.yml", {"A": "Alpha, patched", "B": "Beta"})
+    _write_locfile(ref_dir / "c_l_english.yml", {"C": "Gamma"})
+    info = commands.reload_localisation_to_tsv(**reload_args)
+    assert "Resumed the interrupted reload" not in info
+    entries = parse_translation_table(filepath=reload_args["translation_table"]).entries
+    assert {locid: entry.reference for locid, entry in entries.items()} == {
+        "A": "Alpha, patched",
+        "B": "Beta",
+        "C": "Gamma",
+    }
@@ -0,0 +1,82 @@
+import pathlib
+import random
+
+import pytest
+
+from eu4th.file_utils import (
+    parse_localisation_from_locfiles,
+    parse_translation_table,
+    write_localisation_to_locfile,
+    write_translation_table,
+)
+from eu4th.models import LocalisationData, LocId, Text, TranslationData, TranslationEntry, TranslationStatus
+
+# Texts mix quotes, backslashes, colons, game tokens and non-latin text, a failing seed repeats the failing data
+_TEXT_ALPHABET = 'abcXYZ019 ,.:;#"\\$[]§!£äöüßéÆ日本—\t'
+_IDENTIFIER_ALPHABET = "abcdefXYZ0123456789_.-"
+
+
+def _random_text(rng: random.Random, max_length: int, extra: str = "") -> Text:
+    return "".join(rng.choice(_TEXT_ALPHABET + extra) for _ in range(rng.randint(0, max_length)))
+
+
+def _random_identifiers(rng: random.Random, count: int) -> list[LocId]:
+    identifiers = set()
+    while len(identifiers) < count:
+        suffix = "".join(rng.choice(_IDENTIFIER_ALPHABET) for _ in range(rng.randint(0, 20)))
+        identifiers.add(rng.choice("ABCXYZ") + suffix)
+    return sorted(identifiers)
+
+
+def _random_translation_data(rng: random.Random, nr_entries: int) -> TranslationData:
+    entries = {}
+    for locid in _random_identifiers(rng=rng, count=nr_entries):
+        status = rng.choice(list(TranslationStatus))
+        translation = ""
+        if status is not TranslationStatus.MISSING:
+            translation = rng.choice("ABC") + _random_text(rng=rng, max_length=30, extra="\n=")
+        entries[locid] = TranslationEntry(
+            reference=_random_text(rng=rng, max_length=30, extra="\n="),
+            translation=translation,
+            status=status,
+            source=f"{rng.choice('abc')}_l_english.yml",
+            previous_reference=_random_text(rng=rng, max_length=30) if status is TranslationStatus.OUTDATED else "",
+        )
+    return TranslationData(reference_language="english", translation_language="german", entries=entries)
+
+
+def _is_writable_to_locfile(text: Text) -> bool:
+    """Texts that read back from a locfile, the writer must refuse the others"""
+    # Any carriage return breaks the line for some readers, a trailing backslash escapes the closing quote
+    return "\n" not in text and "\r" not in text and (len(text) - len(text.rstrip("\\"))) % 2 == 0
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_locfile_text(tmp_path: pathlib.Path, seed: int):
+    text = _random_text(rng=random.Random(seed), max_length=40, extra="\n\r\\\\  ")
+    outfile = tmp_path / "round_trip_l_english.yml"
+    locdata = LocalisationData(language="english", entries={"KEY": text})
+    if not _is_writable_to_locfile(text):
+        with pytest.raises(RuntimeError):
+            write_localisation_to_locfile(outfile=outfile, locdata=locdata)
+        return
+    write_localisation_to_locfile(outfile=outfile, locdata=locdata)
+    read_back = parse_localisation_from_locfiles(filepaths=[outfile], language="english").entries
+    assert read_back == ({"KEY": text.strip()} if text else {})  # Empty texts are not written
+
+
+@pytest.mark.parametrize("seed", range(50))
+@pytest.mark.parametrize("table_format", ["tsv", "csv"])
+def test_delimited_table(tmp_path: pathlib.Path, table_format: str, seed: int):
+    translation_data = _random_translation_data(rng=random.Random(seed), nr_entries=8)
+    outpath = tmp_path / f"round_trip.{table_format}"
+    write_translation_table(outpath=outpath, translation_data=translation_data)
+    assert parse_translation_table(filepath=outpath) == translation_data
+
+
+@pytest.mark.parametrize("seed", range(5))  # Workbooks are slow to write
+def test_xlsx_table(tmp_path: pathlib.Path, seed: int):
+    translation_data = _random_translation_data(rng=random.Random(seed), nr_entries=8)
+    outpath = tmp_path / "round_trip.xlsx"
+    write_translation_table(outpath=outpath, translation_data=translation_data)
+    assert parse_translation_table(filepath=outpath) == translation_data
@@ -0,0 +1,131 @@
+import pathlib
+
+import pytest
+
+from eu4th.chunking import (
+    ChunkStrategy,
+    has_chunk_tables,
+    read_chunk_tables,
+    split_translation_data,
+    write_chunk_tables,
+)
+from eu4th.commands import flush_to_localisation, reassemble_translation_table, split_translation_table
+from eu4th.file_utils import parse_translation_table, write_translation_table
+from eu4th.models import TranslationData, TranslationEntry, TranslationStatus
+
+
+@pytest.fixture
+def split_table(tmp_path: pathlib.Path) -> pathlib.Path:
+    translation_table = tmp_path / "translation_table.tsv"
+    write_translation_table(
+        outpath=translation_table,
+        translation_data=TranslationData(
+            reference_language="english",
+            translation_language="german",
+            entries={
+                "A_1": TranslationEntry(reference="One", translation="", status=TranslationStatus.MISSING),
+                "B_1": TranslationEntry(reference="Two", translation="", status=TranslationStatus.MISSING),
+            },
+        ),
+    )
+    split_translation_table(
+        translation_table=translation_table,
+        chunk_dir=tmp_path / "split_tables",
+        strategy=ChunkStrategy.PREFIX,
+    )
+    chunk_table = tmp_path / "split_tables" / "a.tsv"
+    chunk_data = parse_translation_table(filepath=chunk_table)
+    chunk_data.entries["A_1"].translation = "Eins"
+    write_translation_table(outpath=chunk_table, translation_data=chunk_data)
+    return translation_table
+
+
+def test_flush_keeps_split_tables(tmp_path: pathlib.Path, split_table: pathlib.Path):
+    outfile = tmp_path / "out_l_german.yml"
+    flush_to_localisation(
+        translation_table=split_table, translation_outfile=outfile, chunk_dir=tmp_path / "split_tables"
+    )
+    assert 'A_1:0 "Eins"' in outfile.read_text(encoding="utf-8-sig")
+    assert has_chunk_tables(chunk_dir=tmp_path / "split_tables")
+    assert parse_translation_table(filepath=split_table).entries["A_1"].translation == ""
+
+
+def test_reassemble_removes_split_tables(tmp_path: pathlib.Path, split_table: pathlib.Path):
+    reassemble_translation_table(translation_table=split_table, chunk_dir=tmp_path / "split_tables")
+    assert parse_translation_table(filepath=split_table).entries["A_1"].translation == "Eins"
+    assert not (tmp_path / "split_tables").exists()
+
+
+def test_reassemble_keeps_split_tables_that_can_not_be_removed(
+    tmp_path: pathlib.Path, split_table: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    unlink = pathlib.Path.unlink
+
+    def unlink_unless_open(path: pathlib.Path, missing_ok: bool = False):
+        # Like a table open in another application on Windows
+        if path.name == "b.tsv":
+            raise PermissionError(f"{path.name} is open in another application")
+        unlink(path, missing_ok=missing_ok)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(pathlib.Path, "unlink", unlink_unless_open)
+        with pytest.raises(RuntimeError, match="b.tsv"):
+            reassemble_translation_table(translation_table=split_table, chunk_dir=tmp_path / "split_tables")
+    assert not (tmp_path / "split_tables" / "a.tsv").exists()
+    assert has_chunk_tables(chunk_dir=tmp_path / "split_tables")
+    reassemble_translation_table(translation_table=split_table, chunk_dir=tmp_path / "split_tables")
+    assert parse_translation_table(filepath=split_table).entries["A_1"].translation == "Eins"
+    assert not (tmp_path / "split_tables").exists()
+
+
+def _translation_data(sources: dict[str, str]) -> TranslationData:
+    return TranslationData(
+        reference_language="english",
+        translation_language="german",
+        entries={
+            locid: TranslationEntry(reference=locid, translation="", status=TranslationStatus.MISSING, source=source)
+            for locid, source in sources.items()
+        },
+    )
+
+
+def test_split_parts_do_not_collide_with_group_names():
+    translation_data = _translation_data({"foo_1": "a.yml", "foo_2": "a.yml", "foo-1_x": "a.yml"})
+    chunks = split_translation_data(translation_data=translation_data, strategy=ChunkStrategy.PREFIX, rows_per_chunk=1)
+    assert sorted(locid for locids in chunks.values() for locid in locids) == sorted(translation_data.entries)
+
+
+def test_split_names_are_unique_ignoring_case():
+    translation_data = _translation_data({"A": "Foo.yml", "B": "foo.yml", "C": ".base.yml"})
+    chunks = split_translation_data(translation_data=translation_data, strategy=ChunkStrategy.SOURCE, rows_per_chunk=10)
+    assert len({name.casefold() for name in chunks}) == 3
+    assert all(not name.startswith(".") for name in chunks)
+
+
+def test_write_refuses_chunks_without_every_identifier(tmp_path: pathlib.Path):
+    translation_data = _translation_data({"A_1": "a.yml", "B_1": "b.yml"})
+    for chunks in ({"a": ["A_1"]}, {"a": ["A_1", "B_1"], "b": ["B_1"]}):
+        with pytest.raises(RuntimeError, match="exactly once"):
+            write_chunk_tables(chunk_dir=tmp_path, translation_data=translation_data, chunks=chunks, table_format="tsv")
+        assert not has_chunk_tables(chunk_dir=tmp_path)
+
+
+@pytest.mark.parametrize(
+    "edit, problem",
+    [
+        (lambda a, b: a.entries.pop("A_1"), "'A_1' is missing"),
+        (lambda a, b: b.entries.update(A_1=a.entries["A_1"]), "'A_1' is in both"),
+        (lambda a, b: b.entries.update(C_1=a.entries["A_1"]), "'C_1' in 'b.tsv' is not a known identifier"),
+    ],
+)
+def test_read_refuses_lost_duplicated_or_unknown_rows(tmp_path: pathlib.Path, edit, problem: str):
+    translation_data = _translation_data({"A_1": "a.yml", "B_1": "b.yml"})
+    chunks = split_translation_data(translation_data=translation_data, strategy=ChunkStrategy.PREFIX, rows_per_chunk=10)
+    write_chunk_tables(chunk_dir=tmp_path, translation_data=translation_data, chunks=chunks, table_format="tsv")
+    chunk_a = parse_translation_table(filepath=tmp_path / "a.tsv")
+    chunk_b = parse_translation_table(filepath=tmp_path / "b.tsv")
+    edit(chunk_a, chunk_b)
+    write_translation_table(outpath=tmp_path / "a.tsv", translation_data=chunk_a)
+    write_translation_table(outpath=tmp_path / "b.tsv", translation_data=chunk_b)
+    with pytest.raises(RuntimeError, match=problem):
+        read_chunk_tables(chunk_dir=tmp_path, max_workers=1)
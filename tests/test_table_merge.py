@@ -0,0 +1,54 @@
+from eu4th.file_utils import merge_concurrent_edits
+from eu4th.models import TranslationData, TranslationEntry, TranslationStatus
+
+DONE, MISSING, OUTDATED = TranslationStatus.DONE, TranslationStatus.MISSING, TranslationStatus.OUTDATED
+
+
+def _table(**entries: TranslationEntry) -> TranslationData:
+    return TranslationData(reference_language="english", translation_language="german", entries=entries)
+
+
+def _entry(reference: str, translation: str = "", status: TranslationStatus = MISSING, **kwargs) -> TranslationEntry:
+    return TranslationEntry(reference=reference, translation=translation, status=status, **kwargs)
+
+
+def test_takes_over_their_edits():
+    base = _table(A=_entry("One"), B=_entry("Two"))
+    ours = _table(A=_entry("One", "Eins", DONE), B=_entry("Two"))
+    theirs = _table(A=_entry("One"), B=_entry("Two", "Zwei", DONE))
+    merged, conflicts = merge_concurrent_edits(base=base, ours=ours, theirs=theirs)
+    assert merged == _table(A=_entry("One", "Eins", DONE), B=_entry("Two", "Zwei", DONE))
+    assert conflicts == []
+
+
+def test_keeps_ours_for_conflicting_edits():
+    base = _table(A=_entry("One"))
+    ours = _table(A=_entry("One", "Eins", DONE))
+    theirs = _table(A=_entry("One", "Ein", DONE))
+    merged, conflicts = merge_concurrent_edits(base=base, ours=ours, theirs=theirs)
+    assert merged == ours
+    assert conflicts == ["A"]
+
+
+def test_same_edit_on_both_sides_is_no_conflict():
+    base = _table(A=_entry("One"))
+    ours = _table(A=_entry("One", "Eins", DONE))
+    merged, conflicts = merge_concurrent_edits(base=base, ours=ours, theirs=_table(A=_entry("One", "Eins", DONE)))
+    assert merged == ours
+    assert conflicts == []
+
+
+def test_their_translation_of_a_reference_we_changed_becomes_outdated():
+    base = _table(A=_entry("One"))
+    ours = _table(A=_entry("One, changed"))
+    theirs = _table(A=_entry("One", "Eins", DONE))
+    merged, _ = merge_concurrent_edits(base=base, ours=ours, theirs=theirs)
+    assert merged == _table(A=_entry("One, changed", "Eins", OUTDATED, previous_reference="One"))
+
+
+def test_rows_added_by_them_are_kept_and_rows_we_deleted_stay_deleted():
+    base = _table(A=_entry("One"), B=_entry("Two"))
+    ours = _table(A=_entry("One"))
+    theirs = _table(A=_entry("One"), B=_entry("Two", "Zwei", DONE), C=_entry("Three"))
+    merged, _ = merge_concurrent_edits(base=base, ours=ours, theirs=theirs)
+    assert merged == _table(A=_entry("One"), C=_entry("Three"))